@@ -0,0 +1,122 @@
+"""
+@author: 54Coconi
+@date: 2026-10-16
+@version: 1.0.0
+@path: benchmarks/bench_image_commands.py
+@software: PyCharm 2023.1.2
+@officialWebsite: https://github.com/54Coconi
+@description:
+    图片指令端到端基准测试（回放截图来源）
+
+    把截图服务的截图来源替换为图片序列或录屏视频，逐帧执行 <图片匹配> 指令（可选 <文字识别> 指令），
+    统计命中率、指令平均耗时和截图耗时。不需要显示器，结果可复现，可在 CI 中运行。
+    任务文件中没有可用的模板图片时，从第一帧中随机裁剪纹理丰富的区域作为模板。
+
+    用法:
+        python benchmarks/bench_image_commands.py --source Temp/frames
+        python benchmarks/bench_image_commands.py --source Temp/record.mp4 --frames 20 --ocr-text 确定
+        python benchmarks/bench_image_commands.py --source Temp/frames --ocr-text 确定 --cache-layout
+"""
+import io
+import sys
+import time
+import argparse
+import contextlib
+
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bench_match_modes import collect_templates, sample_crops, CENTER_TOLERANCE  # noqa: E402
+from core.commands.base_command import STATUS_COMPLETED  # noqa: E402
+from core.commands.image_commands import ImageMatchCmd, ImageOcrCmd  # noqa: E402
+from utils.capture_service import capture_service  # noqa: E402
+from utils.screen_source import create_screen_source  # noqa: E402
+
+
+def run_silently(command):
+    """执行指令并屏蔽其日志输出，返回耗时（秒）"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        command.execute()
+    return time.perf_counter() - start
+
+
+def bench_match(templates: list[tuple[str, tuple]], frames: int, repeat: int) -> dict:
+    """逐帧执行图片匹配指令"""
+    hits, costs = 0, []
+    for _ in range(frames):
+        for path, expected in templates:
+            for _ in range(repeat):
+                cmd = ImageMatchCmd(template_img=path)
+                costs.append(run_silently(cmd))
+                capture_service.invalidate()  # 每次都重新截图，与逐条执行的指令一致
+            center = cmd.template_img_center if cmd.status == STATUS_COMPLETED else None
+            if center and (expected is None or (abs(center[0] - expected[0]) <= CENTER_TOLERANCE
+                                                 and abs(center[1] - expected[1]) <= CENTER_TOLERANCE)):
+                hits += 1
+        capture_service.source.advance()
+    total = frames * len(templates)
+    return {"hit_rate": hits / total if total else 0.0, "mean_ms": float(np.mean(costs)) * 1000 if costs else 0.0}
+
+
+def bench_ocr(text: str, frames: int, cache_layout: bool = False) -> dict:
+    """逐帧执行文字识别指令，cache_layout 为 True 时复用文本框只识别"""
+    from utils.ocr_tools import OCRTool, DET_MODEL_DIR, REC_MODEL_DIR, CLS_MODEL_DIR
+    ocr = OCRTool(det_model_dir=DET_MODEL_DIR, rec_model_dir=REC_MODEL_DIR, cls_model_dir=CLS_MODEL_DIR,
+                  use_angle_cls=False)
+    found, costs = 0, []
+    for _ in range(frames):
+        cmd = ImageOcrCmd(ocr, text=text, cache_layout=cache_layout)
+        costs.append(run_silently(cmd))
+        found += cmd.status == STATUS_COMPLETED
+        capture_service.invalidate()
+        capture_service.source.advance()
+    return {"found_rate": found / frames if frames else 0.0, "mean_ms": float(np.mean(costs)) * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="图片指令端到端基准测试")
+    parser.add_argument("--source", required=True, help="图片目录、通配符、图片路径或视频路径")
+    parser.add_argument("--tasks", default="work/work_tasks", help="任务文件目录")
+    parser.add_argument("--frames", type=int, default=0, help="回放的帧数，默认回放全部帧")
+    parser.add_argument("--repeat", type=int, default=3, help="每帧每个模板的重复执行次数")
+    parser.add_argument("--crops", type=int, default=10, help="没有可用模板时随机裁剪的模板数量")
+    parser.add_argument("--ocr-text", default=None, help="同时测试文字识别指令时要查找的文字")
+    parser.add_argument("--cache-layout", action="store_true", help="文字识别指令缓存文本框，布局不变时只识别")
+    args = parser.parse_args()
+
+    source = create_screen_source(args.source)
+    if not hasattr(source, "advance"):
+        parser.error("--source 需要是图片或视频文件，不能是实时桌面")
+    capture_service.set_source(source)
+    frames = min(args.frames, source.frame_count) if args.frames > 0 else source.frame_count
+
+    template_paths = collect_templates(args.tasks)
+    if template_paths:
+        templates = [(path, None) for path in template_paths]  # 没有期望位置，匹配成功即视为命中
+        print(f"使用任务中的 {len(templates)} 个模板图片")
+    else:
+        templates = sample_crops(capture_service.grab().image, args.crops)
+        print(f"任务目录中没有可用的模板图片，使用第一帧随机裁剪的 {len(templates)} 个模板")
+
+    width, height = source.monitors[0]["width"], source.monitors[0]["height"]
+    print(f"截图来源: {source.name} ‘{args.source}’, 尺寸 {width}x{height}, 回放 {frames} 帧\n")
+    if templates:
+        row = bench_match(templates, frames, args.repeat)
+        print(f"<图片匹配> 命中率 {row['hit_rate']:.0%}, 平均耗时 {row['mean_ms']:.1f} ms")
+    if args.ocr_text:
+        source.advance(-frames)
+        row = bench_ocr(args.ocr_text, frames, args.cache_layout)
+        label = "<文字识别（缓存文本框）>" if args.cache_layout else "<文字识别>"
+        print(f"{label} 识别成功率 {row['found_rate']:.0%}, 平均耗时 {row['mean_ms']:.1f} ms")
+    print(f"\n截图统计: {capture_service.stats()}")
+    if args.ocr_text and args.cache_layout:
+        from utils.ocr_tools import ocr_layout_cache
+        print(f"文本框缓存统计: {ocr_layout_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+@author: 54Coconi
+@date: 2026-10-16
+@version: 1.0.0
+@path: benchmarks/bench_match_modes.py
+@software: PyCharm 2023.1.2
+@officialWebsite: https://github.com/54Coconi
+@description:
+    图片匹配模式基准测试（彩色 / 灰度 / 边缘图）
+
+    从任务文件中收集 <图片匹配> 等指令引用的模板图片，在同一帧截图上分别用三种匹配模式匹配，
+    统计命中率、平均匹配度和平均耗时；同时对截图做一次 “配色偏移” 来模拟主题颜色变化。
+    任务文件中没有可用的模板图片时，从截图中随机裁剪纹理丰富的区域作为模板。
+
+    用法:
+        python benchmarks/bench_match_modes.py
+        python benchmarks/bench_match_modes.py --screenshot Temp/screen.png --repeat 10
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import contextlib
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.opencv_funcs import MATCH_MODES, centerPosition, template_cache  # noqa: E402
+
+# 匹配中心与期望中心的最大允许偏差（像素）
+CENTER_TOLERANCE = 3
+
+
+def collect_templates(tasks_dir: str) -> list[str]:
+    """递归收集任务文件中引用且存在的模板图片路径"""
+    found = []
+
+    def walk(node):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key == "template_img" and isinstance(value, str):
+                    found.append(value)
+                elif key == "template_imgs" and isinstance(value, list):
+                    found.extend(v for v in value if isinstance(v, str))
+                else:
+                    walk(value)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+
+    for path in Path(tasks_dir).rglob("*.json"):
+        try:
+            walk(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            continue
+    return sorted({os.path.normpath(p) for p in found if p and os.path.exists(p)})
+
+
+def load_frame(screenshot: str | None) -> np.ndarray:
+    """读取截图文件，或截取当前全屏，统一返回与 mss 相同的 BGRA 图像"""
+    if screenshot:
+        image = cv2.imread(screenshot)
+        if image is None:
+            raise FileNotFoundError(f"无法读取截图 ‘{screenshot}’")
+        return cv2.cvtColor(image, cv2.COLOR_BGR2BGRA)
+    from utils.capture_service import capture_service
+    return capture_service.grab().image.copy()
+
+
+def sample_crops(frame: np.ndarray, count: int, size=(48, 96), seed=0) -> list[tuple[str, tuple]]:
+    """从截图中随机裁剪纹理丰富的区域作为模板，返回 [(模板路径, 期望中心)]"""
+    rng = np.random.default_rng(seed)
+    out_dir = tempfile.mkdtemp(prefix="bench_match_")
+    h, w = frame.shape[:2]
+    crops = []
+    for _ in range(count * 50):
+        if len(crops) >= count:
+            break
+        th, tw = size
+        y, x = int(rng.integers(0, h - th)), int(rng.integers(0, w - tw))
+        crop = frame[y:y + th, x:x + tw, :3]
+        if crop.std() < 30:  # 跳过纯色区域
+            continue
+        path = os.path.join(out_dir, f"crop_{len(crops)}.png")
+        cv2.imwrite(path, crop)
+        crops.append((path, (x + tw / 2, y + th / 2)))
+    return crops
+
+
+def shift_colors(frame: np.ndarray) -> np.ndarray:
+    """模拟主题配色变化：色相旋转 + 亮度提升"""
+    hsv = cv2.cvtColor(frame[:, :, :3], cv2.COLOR_BGR2HSV)
+    hsv[:, :, 0] = (hsv[:, :, 0].astype(np.int32) + 30) % 180
+    hsv[:, :, 2] = cv2.add(hsv[:, :, 2], 25)
+    return cv2.cvtColor(cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR), cv2.COLOR_BGR2BGRA)
+
+
+def bench(frames: dict, templates: list[tuple[str, tuple]], repeat: int) -> list[dict]:
+    """逐个模式、逐帧测试，返回统计结果"""
+    rows = []
+    for variant, frame in frames.items():
+        for mode in MATCH_MODES:
+            hits, scores, costs = 0, [], []
+            for path, expected in templates:
+                try:
+                    with contextlib.redirect_stdout(io.StringIO()):  # 屏蔽匹配成功时的日志输出
+                        centerPosition(frame, path, -1.0, mode=mode)  # 预热，生成模板缓存
+                        start = time.perf_counter()
+                        for _ in range(repeat):
+                            center, score = centerPosition(frame, path, -1.0, mode=mode)
+                        costs.append((time.perf_counter() - start) / repeat)
+                except ValueError as e:  # 如模板没有边缘
+                    print(f"[WARN] {mode} 跳过 {path}: {e}")
+                    continue
+                scores.append(score)
+                if abs(center[0] - expected[0]) <= CENTER_TOLERANCE and abs(center[1] - expected[1]) <= CENTER_TOLERANCE:
+                    hits += 1
+            rows.append({
+                "variant": variant,
+                "mode": mode,
+                "hit_rate": hits / len(templates) if templates else 0.0,
+                "mean_score": float(np.mean(scores)) if scores else 0.0,
+                "mean_ms": float(np.mean(costs)) * 1000 if costs else 0.0,
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="图片匹配模式基准测试")
+    parser.add_argument("--tasks", default="work/work_tasks", help="任务文件目录")
+    parser.add_argument("--screenshot", default=None, help="截图文件，默认截取当前全屏")
+    parser.add_argument("--repeat", type=int, default=5, help="每个模板的重复匹配次数")
+    parser.add_argument("--crops", type=int, default=10, help="没有可用模板时随机裁剪的模板数量")
+    args = parser.parse_args()
+
+    frame = load_frame(args.screenshot)
+    template_paths = collect_templates(args.tasks)
+    if template_paths:
+        # 以彩色模式在原始截图上的匹配结果作为期望位置，只保留能可靠匹配的模板
+        templates = []
+        for path in template_paths:
+            with contextlib.redirect_stdout(io.StringIO()):
+                center, score = centerPosition(frame, path, 0.8)
+            if center is not None:
+                templates.append((path, center))
+        print(f"任务模板 {len(template_paths)} 个，其中 {len(templates)} 个在截图中可见")
+    else:
+        templates = sample_crops(frame, args.crops)
+        print(f"任务目录中没有可用的模板图片，使用截图随机裁剪的 {len(templates)} 个模板")
+    if not templates:
+        print("没有可测试的模板")
+        return
+
+    frames = {"原始": frame, "配色偏移": shift_colors(frame)}
+    print(f"截图尺寸: {frame.shape[1]}x{frame.shape[0]}，每个模板重复 {args.repeat} 次\n")
+    print(f"{'截图':<8}{'模式':<8}{'命中率':>8}{'平均匹配度':>12}{'平均耗时(ms)':>14}")
+    for row in bench(frames, templates, args.repeat):
+        print(f"{row['variant']:<8}{row['mode']:<8}{row['hit_rate']:>8.0%}"
+              f"{row['mean_score']:>12.3f}{row['mean_ms']:>14.1f}")
+    print(f"\n模板缓存统计: {template_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
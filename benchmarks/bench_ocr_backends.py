@@ -0,0 +1,114 @@
+"""
+@author: 54Coconi
+@date: 2026-10-16
+@version: 1.0.0
+@path: benchmarks/bench_ocr_backends.py
+@software: PyCharm 2023.1.2
+@officialWebsite: https://github.com/54Coconi
+@description:
+    OCR 后端对比基准测试（回放截图来源）
+
+    在同一组截图上依次运行各个 OCR 后端（参见 ocr_tools.OCR_BACKENDS），统计平均识别耗时、识别到的文本行数，
+    以及与第一个后端识别文本的一致率；指定 --text 时同时统计能否找到该文字。不使用识别结果缓存。
+
+    用法:
+        python benchmarks/bench_ocr_backends.py --source Temp/frames
+        python benchmarks/bench_ocr_backends.py --source Temp/record.mp4 --frames 20 --backends PaddleOCR Tesseract --text 确定
+"""
+import io
+import sys
+import time
+import argparse
+import contextlib
+
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.capture_service import capture_service  # noqa: E402
+from utils.ocr_tools import (OCRTool, OCR_BACKENDS, DET_MODEL_DIR, REC_MODEL_DIR, CLS_MODEL_DIR,  # noqa: E402
+                             find_matching_texts)
+from utils.screen_source import create_screen_source  # noqa: E402
+
+
+def collect_frames(source, frames: int) -> list[np.ndarray]:
+    """取出回放来源的前 frames 帧（RGB），所有后端使用同一组截图"""
+    images = []
+    for _ in range(frames):
+        images.append(capture_service.grab().rgb())
+        source.advance()
+    return images
+
+
+def texts_of(result) -> set[str]:
+    """OCR 识别结果中的文本集合（去除空白）"""
+    return {"".join(text.split()) for line in result or [] if line for _, (text, _) in line if text.strip()}
+
+
+def bench_backend(ocr: OCRTool, images: list[np.ndarray], repeat: int, text: str = None) -> tuple[dict, list]:
+    """在所有截图上运行一个后端，返回统计和每帧的识别文本"""
+    costs, lines, found, frame_texts = [], 0, 0, []
+    for image in images:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = ocr.perform_ocr(image, use_cache=False)
+            costs.append(time.perf_counter() - start)
+        frame_texts.append(texts_of(result))
+        lines += sum(len(line) for line in result or [] if line)
+        if text:
+            found += bool(find_matching_texts(result, text))
+    row = {"mean_ms": float(np.mean(costs)) * 1000 if costs else 0.0,
+           "lines": lines / len(images) if images else 0.0,
+           "found_rate": found / len(images) if images and text else None}
+    return row, frame_texts
+
+
+def agreement(texts: list[set], reference: list[set]) -> float:
+    """与参考后端识别文本的一致率（逐帧 Jaccard 相似度的平均值）"""
+    scores = [len(a & b) / len(a | b) if a | b else 1.0 for a, b in zip(texts, reference)]
+    return float(np.mean(scores)) if scores else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR 后端对比基准测试")
+    parser.add_argument("--source", required=True, help="图片目录、通配符、图片路径或视频路径")
+    parser.add_argument("--frames", type=int, default=0, help="使用的帧数，默认使用全部帧")
+    parser.add_argument("--backends", nargs="+", default=list(OCR_BACKENDS), choices=OCR_BACKENDS,
+                        help="要对比的 OCR 后端，第一个作为一致率的参考")
+    parser.add_argument("--repeat", type=int, default=1, help="每帧的重复识别次数")
+    parser.add_argument("--text", default=None, help="同时统计能否找到的文字")
+    args = parser.parse_args()
+
+    source = create_screen_source(args.source)
+    if not hasattr(source, "advance"):
+        parser.error("--source 需要是图片或视频文件，不能是实时桌面")
+    capture_service.set_source(source)
+    frames = min(args.frames, source.frame_count) if args.frames > 0 else source.frame_count
+    images = collect_frames(source, frames)
+    width, height = source.monitors[0]["width"], source.monitors[0]["height"]
+    print(f"截图来源: {source.name} ‘{args.source}’, 尺寸 {width}x{height}, 使用 {frames} 帧\n")
+
+    reference = None
+    for name in args.backends:
+        start = time.perf_counter()
+        try:
+            ocr = OCRTool(det_model_dir=DET_MODEL_DIR, rec_model_dir=REC_MODEL_DIR, cls_model_dir=CLS_MODEL_DIR,
+                          use_angle_cls=False, backend=name)
+        except (ImportError, OSError) as e:
+            print(f"{name:<10} 加载失败: {e}")
+            continue
+        load_ms = (time.perf_counter() - start) * 1000
+        row, texts = bench_backend(ocr, images, args.repeat, args.text)
+        reference = texts if reference is None else reference
+        line = (f"{name:<10} 加载 {load_ms:.0f} ms, 平均识别耗时 {row['mean_ms']:.1f} ms, "
+                f"平均文本行数 {row['lines']:.1f}, 一致率 {agreement(texts, reference):.0%}")
+        if row["found_rate"] is not None:
+            line += f", 找到 ‘{args.text}’ {row['found_rate']:.0%}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,10 +13,12 @@ from PyQt5.QtWidgets import QTreeWidget, QTreeWidgetItem, QTreeWidgetItemIterato
 
 from ui.widgets.CocoSettingWidget import config_manager
 from utils.ocr_tools import OCRTool
-from .command_map import COMMAND_MAP
+from utils.capture_service import capture_service
+from .command_map import COMMAND_MAP, INPUT_COMMANDS
 from .commands.base_command import BaseCommand
 from .commands.flow_commands import LoopCommand, IfCommand
-from .commands.image_commands import ImageMatchCmd, ImageOcrCmd, ImageOcrClickCmd
+from .commands.image_commands import ImageMatchCmd, MultiImageMatchCmd, ImageOcrCmd, ImageOcrClickCmd, \
+    link_shared_ocr_passes, contains_ocr_commands, wait_ocr_model
 from .commands.keyboard_commands import *
 from .commands.subtask_command import SubtaskCommand
 
@@ -267,6 +269,14 @@ class CommandExecutor(QThread):
             top_item = self.tree_widget.topLevelItem(i)
             extract_node_commands(top_item)
 
+        shared_groups = link_shared_ocr_passes(self.all_tasks_cmd)
+        if shared_groups:
+            self._log(LogLevel.INFO, f"♻ {shared_groups} 组相邻的文字识别指令将共用同一帧的识别结果")
+        if self._ocr is None and contains_ocr_commands(self.all_tasks_cmd):
+            try:
+                self._ocr = wait_ocr_model(lambda: self._log(LogLevel.INFO, "⏳ 等待 OCR 模型加载完成..."))
+            except Exception as e:
+                self._log(LogLevel.ERROR, f"❌ OCR 模型加载失败, 文字识别指令将无法执行: {e}")
         self._log(LogLevel.INFO, f"所有任务加载完毕，准备开始执行")
         self.log_message.emit("\n")
         print("加载的全部指令对象：\n", self.all_tasks_cmd) if _DEBUG else None
@@ -349,6 +359,8 @@ class CommandExecutor(QThread):
                     self._log(LogLevel.INFO, f"🖼模板图片中心坐标为{command.template_img_center}")
                 else:
                     self._log(LogLevel.WARN, f"⚠模板图片中心坐标未找到")
+            elif isinstance(command, MultiImageMatchCmd):
+                self._log(LogLevel.INFO, f"🖼多图匹配度为{command.scores}, 中心坐标为{command.centers}")
             # 如果OCR识别结果存在，则输出
             elif type(command) is ImageOcrCmd:
                 if command.matching_boxes:
@@ -413,6 +425,8 @@ class CommandExecutor(QThread):
                         self._log(LogLevel.INFO, f"🖼 模板图片中心坐标为{command.template_img_center}")
                     else:
                         self._log(LogLevel.WARN, f"⚠ 模板图片中心坐标未找到！")
+                elif isinstance(command, MultiImageMatchCmd):
+                    self._log(LogLevel.INFO, f"🖼 多图匹配度为{command.scores}, 中心坐标为{command.centers}")
                 # 如果OCR识别结果存在，输出
                 elif type(command) is ImageOcrCmd:
                     if command.matching_boxes:
@@ -428,7 +442,8 @@ class CommandExecutor(QThread):
                     else:
                         self._log(LogLevel.WARN, f"⚠ 未找到文字识别匹配区域！")
 
-                self._log(LogLevel.INFO, f"执行耗时🕓: {time.time() - start_time:.3f} 秒")
+                shared_note = "（复用共用识别结果）" if isinstance(command, ImageOcrCmd) and command.ocr_shared else ""
+                self._log(LogLevel.INFO, f"执行耗时🕓: {time.time() - start_time:.3f} 秒{shared_note}")
                 self._log(LogLevel.INFO, "-" * 60)
                 self.current_index += 1  # 更新当前索引
 
@@ -483,7 +498,13 @@ class CommandExecutor(QThread):
             else:
                 # TODO:解析绑定属性
                 # command.resolve_bound_properties()
-                command.execute()
+                try:
+                    command.execute()
+                finally:
+                    if isinstance(command, INPUT_COMMANDS):
+                        capture_service.invalidate()  # 鼠标、键盘操作或脚本执行后屏幕可能变化
+                    if isinstance(command, ImageOcrCmd) and command.shared_pass:
+                        self._log_shared_ocr(command)
                 self.results_list.append(command.model_dump())
                 print(f"[INFO] - 当前指令 <{command.name}> 执行结果: {self.results_list[-1]}")
         except CommandRunningException as cre:
@@ -491,6 +512,12 @@ class CommandExecutor(QThread):
         except Exception as e:
             self._log(LogLevel.ERROR, f"❌(未知错误) 执行指令 &lt;{command.name}&gt; 失败: {e}")
 
+    def _log_shared_ocr(self, command: ImageOcrCmd) -> None:
+        """输出共用识别分组中的文字识别指令是否复用了识别结果"""
+        shared = command.shared_pass
+        action = "复用同一帧的识别结果, 只做文字筛选" if command.ocr_shared else "画面已变化或首次识别, 执行识别"
+        self._log(LogLevel.INFO, f"♻ (共用识别) {action}, 本组累计识别 {shared.runs} 次, 复用 {shared.reuses} 次")
+
     def _execute_if_command(self, command: IfCommand, current_idx: int) -> None:
         """执行 If 命令"""
         if self.stop_flag:
@@ -532,8 +559,11 @@ class CommandExecutor(QThread):
         if command.is_active is False:
             self._log(LogLevel.WARN, f"⚠ 指令: &lt;{command.name}&gt; 未激活, 跳过执行")
             return
-        for subcommand in command.subtask_steps:
-            self.execute_one_command(subcommand, current_idx)
+        try:
+            for subcommand in command.subtask_steps:
+                self.execute_one_command(subcommand, current_idx)
+        finally:
+            capture_service.invalidate()  # 子任务可以执行任意操作，执行后屏幕可能变化
 
     def evaluate_condition(self, condition: str) -> bool:
         """
@@ -548,16 +578,24 @@ class CommandExecutor(QThread):
                     return result
             return None
 
-        def safe_get_field(_cmd_result, _field_name):
-            """安全地获取指令结果中的字段值"""
-            if not _cmd_result:
-                return None
-            return _cmd_result.get(_field_name)
+        def safe_get_field(_cmd_result, _field_path):
+            """安全地获取指令结果中的字段值，支持继续按下标访问列表，如 ['scores', '0']"""
+            value = _cmd_result
+            for _key in _field_path:
+                if isinstance(value, dict):
+                    value = value.get(_key)
+                elif isinstance(value, (list, tuple)) and _key.lstrip("-").isdigit() \
+                        and -len(value) <= int(_key) < len(value):
+                    value = value[int(_key)]
+                else:
+                    return None
+            return value
 
         try:
             # 从条件字符串解析出指令 id 和字段
             # 条件格式为: results_list['<id>']['<field>'] <operator> <value>
             # eg: "results_list['12345678']['status'] == 2"
+            # 列表字段可以继续按下标访问，eg: "results_list['12345678']['scores'][0] > 0.9"
             parts = condition.split(" ")
             if len(parts) != 3:
                 self._log(LogLevel.ERROR, "❌ 条件表达式格式错误")
@@ -566,16 +604,16 @@ class CommandExecutor(QThread):
             # 提取 id、字段、操作符和值
             left_expr, operator_symbol, right_value = parts
             cmd_id = left_expr.split("[")[1].strip("'").strip("']")
-            field_name = left_expr.split("]")[1].strip("['").strip("']")
+            field_path = [_key.strip("[").strip("'\"") for _key in left_expr.split("]")[1:] if _key]
 
             # 根据 id 获取指令结果
             cmd_result = get_command_by_id(cmd_id)
-            field_value = safe_get_field(cmd_result, field_name)
+            field_value = safe_get_field(cmd_result, field_path)
 
             # 将右值转换为合适的类型
             if right_value in {"True", "False"}:  # 布尔值
                 right_value = right_value == "True"
-            elif right_value.isdigit():  # 整数
+            elif right_value.lstrip("-").isdigit():  # 整数
                 right_value = int(right_value)
             elif "." in right_value:  # 浮点数
                 try:
@@ -36,6 +36,11 @@ COMMAND_MAP = {
     "image": {
         "imageMatch": ImageMatchCmd,
         "imageClick": ImageClickCmd,
+        "imageMultiMatch": MultiImageMatchCmd,
+        "imageFindAll": ImageFindAllCmd,
+        "imageWait": ImageWaitCmd,
+        "pixelColor": PixelColorCmd,
+        "waitPixelColor": WaitPixelColorCmd,
         "imageOcr": ImageOcrCmd,  # 文字识别类，需要提前加载模型
         "imageOcrClick": ImageOcrClickCmd  # 文字识别类，需要提前加载模型
     },
@@ -52,3 +57,14 @@ COMMAND_MAP = {
         "runSubtask": SubtaskCommand
     }
 }
+
+# 可能改变屏幕内容的指令（鼠标、键盘操作，以及可以执行任意操作的脚本），执行器执行后需要使截图帧缓存失效
+# 图片点击、文字识别点击在每次点击后还会自行使缓存失效，重复执行时下一次匹配不会复用点击前的截图
+# 子任务不经过该判断，由执行器的 _execute_subtask_command 在执行完子任务后使缓存失效
+INPUT_COMMANDS = (
+    *COMMAND_MAP["mouse"].values(),
+    *COMMAND_MAP["keyboard"].values(),
+    ImageClickCmd,
+    ImageOcrClickCmd,
+    *COMMAND_MAP["script"].values(),
+)
@@ -11,6 +11,11 @@
     包括:
         - 图片匹配指令
         - 图片点击指令
+        - 多图匹配指令
+        - 查找全部图片指令
+        - 等待图片出现指令
+        - 像素颜色检测指令
+        - 等待像素颜色指令
         - 文字识别指令
         - 文字识别点击指令
 """
@@ -18,24 +23,33 @@ import os
 import time
 import pyautogui
 
-from typing import Tuple
+from typing import Callable, Tuple, Optional
 from pydantic import Field
 from pynput.mouse import Controller
 
 from ui.widgets.CocoSettingWidget import config_manager
 from utils.debug import print_func_time
-from utils.opencv_funcs import centerPosition
-from utils.ocr_tools import OCRTool, find_matching_texts
-from utils.screenshot_tool import ScreenshotTool
+from utils.opencv_funcs import centerPosition, matchTemplates, findAllPositions, frameDigest, getMatchBackend, \
+    template_cache
+from utils.ocr_tools import OCRTool, OcrResultCache, find_matching_texts, FUZZY_MAX_DISTANCE
+from utils.ocr_model_manager import ocr_model_manager, MODEL_LOAD_TIMEOUT
+from utils.hit_history import hit_history
+from utils.screenshot_tool import pad_region, intersect_region, union_region
+from utils.capture_service import capture_service, FRAME_CACHE_TTL, MONITOR_CURSOR, MONITOR_LAST_HIT
+from utils.background_capture import background_capture
 
 from .base_command import RetryCmd, CommandRunningException
+from .flow_commands import IfCommand, LoopCommand
+from .subtask_command import SubtaskCommand
 from .mouse_commands import move_with_duration_pynput, click_pynput, TweenFuncs
 
 _DEBUG = False
 
-DET_MODEL_DIR = '../../models/det/ch/ch_PP-OCRv4_det_infer'
-REC_MODEL_DIR = '../../models/rec/ch/ch_PP-OCRv4_rec_infer'
-CLS_MODEL_DIR = '../../models/cls/ch/ch_PP-OCRv4_cls_infer'
+
+# 颜色采样时，包含所有采样点的外接矩形不超过该面积则一次截取，否则逐点截取 1x1 像素
+PIXEL_BOX_MAX_AREA = 128 * 128
+# 连续文字识别指令共用识别结果时，共用识别区域的面积不超过各指令识别区域面积之和的该倍数，否则各自识别
+SHARED_OCR_MAX_GROWTH = 2.0
 
 
 def get_threshold():
@@ -47,6 +61,23 @@ def get_threshold():
     return threshold
 
 
+def get_debug_dump():
+    """
+    获取是否转储图片匹配的截图（调试用）
+    :return: debug_dump - (bool): 是否在后台保存截图
+    """
+    return bool(config_manager.config.get('ImageMatch', {}).get('DebugDump', False))
+
+
+def get_frame_cache_ttl():
+    """
+    获取截图帧缓存的有效期，连续执行的只读图片指令在有效期内共用同一帧截图
+    :return: ttl - (float): 有效期（秒），为 0 时不使用缓存
+    """
+    ttl = config_manager.config.get('Capture', {}).get('FrameCacheTTL', FRAME_CACHE_TTL)
+    return max(0.0, float(ttl) / 1000)
+
+
 def get_ocr_threshold():
     """
     获取 OCR 文字识别阈值
@@ -56,12 +87,48 @@ def get_ocr_threshold():
     return threshold
 
 
+def get_ocr_shared_pass():
+    """
+    获取是否让连续的文字识别指令共用同一帧的识别结果
+    :return: shared_pass - (bool)
+    """
+    return config_manager.config.get('ImageOcr', {}).get('SharedPass', True)
+
+
+def get_capture_region(search_region: list[int], monitor: str = "all",
+                       template_img: Optional[str] = None) -> Optional[Tuple[int, int, int, int]]:
+    """
+    获取指令的截图区域：搜索区域与目标显示器的交集
+    :param search_region: 搜索区域 [left, top, width, height]，为空时不限制
+    :param monitor: 目标显示器 ('all', 'cursor', 'last_hit', '1', '2', ...)
+    :param template_img: 模板图片路径，'last_hit' 时优先使用该模板的上次命中位置
+    :return: (left, top, width, height)，为 None 时截取所有显示器
+    :raises ValueError: 搜索区域不在目标显示器内
+    """
+    base = tuple(search_region) if len(search_region) == 4 else None
+    monitor = str(monitor).strip().lower()
+    point = None
+    if monitor == MONITOR_CURSOR:
+        point = pyautogui.position()
+    elif monitor == MONITOR_LAST_HIT:
+        box = (hit_history.get(template_img) if template_img else None) or hit_history.last
+        point = (box[0] + box[2] // 2, box[1] + box[3] // 2) if box else None  # 尚无命中记录时搜索所有显示器
+    screen = capture_service.monitor_region(monitor, point)
+    if screen is None or base is None:
+        return base or screen
+    region = intersect_region(base, screen)
+    if region is None:
+        raise ValueError(f"搜索区域 {base} 不在显示器 {screen} 范围内")
+    return region
+
+
 def _click_with_pynput(target_pos: Tuple[int, int], button, duration, interval, clicks):
     mouse = Controller()
     current_position = mouse.position  # 获取当前鼠标位置
     if current_position != target_pos and duration > 0:
         move_with_duration_pynput(duration, target_pos, mouse)  # 移动到目标位置
     click_pynput(clicks, button, interval, mouse, target_pos)  # 点击
+    capture_service.invalidate()  # 点击后屏幕可能变化，重复执行时不能复用点击前的截图
 
 
 def _click_with_pyautogui(target_pos: Tuple[int, int], button, duration, interval, clicks):
@@ -76,6 +143,7 @@ def _click_with_pyautogui(target_pos: Tuple[int, int], button, duration, interva
         duration=duration,
         tween=TweenFuncs[0]
     )
+    capture_service.invalidate()  # 点击后屏幕可能变化，重复执行时不能复用点击前的截图
 
 
 class ImageMatchCmd(RetryCmd):
@@ -91,6 +159,18 @@ class ImageMatchCmd(RetryCmd):
         error_retries_time:(float | int): 指令执行出错时的重试间隔时间
         template_img:(str): 模板图片路径
         threshold:(float): 匹配度阈值
+        image_mode:(str): 匹配模式，"color" 彩色、"gray" 灰度（更快）、"edge" 边缘图（对主题配色变化不敏感）
+        use_pyramid:(bool): 是否使用金字塔(由粗到精)匹配，速度更快，但细节很少的小模板可能漏检
+        pyramid_scale:(float): 金字塔匹配的缩小比例
+        search_region:(list[int]): 搜索区域 [left, top, width, height]（全局屏幕坐标），为空时搜索全屏
+        monitor:(str): 目标显示器，"all" 所有显示器、"cursor" 鼠标所在的显示器、"last_hit" 上次命中所在的显示器，
+            或显示器序号 "1"、"2"...；与搜索区域同时设置时取两者的交集，多显示器时只截取和匹配一个显示器
+        adaptive_search:(bool): 是否优先在该模板上次命中位置附近搜索，未命中时再搜索整个搜索区域
+        adaptive_padding:(int): 自适应搜索时在上次命中位置四周扩展的像素数
+        multi_scale:(bool): 是否使用多尺度匹配（模板与屏幕的 DPI 缩放不一致时使用），
+            优先尝试检测到的 DPI 缩放比例，命中的比例按模板和显示器缓存（全屏搜索时按主显示器记录）
+        backend:(str): 匹配后端，"template" 模板匹配，"orb"、"akaze" 特征点匹配（适用于被部分遮挡或重新渲染的图片，
+            不使用 threshold，也不支持 image_mode、金字塔和多尺度参数）
     """
 
     name: str = Field("图片匹配", description="图片匹配指令名称")
@@ -101,32 +181,83 @@ class ImageMatchCmd(RetryCmd):
 
     template_img: str = Field(None, description="模板图片路径")
     threshold: float = Field(default_factory=get_threshold, description="匹配度阈值")
+    image_mode: str = Field("color", description="匹配模式 ('color', 'gray', 'edge')")
+    use_pyramid: bool = Field(False, description="是否使用金字塔(由粗到精)匹配")
+    pyramid_scale: float = Field(0.5, description="金字塔匹配的缩小比例")
+    search_region: list[int] = Field([], description="搜索区域 [left, top, width, height]，为空时搜索全屏")
+    monitor: str = Field("all", description="目标显示器 ('all', 'cursor', 'last_hit', '1', '2', ...)")
+    adaptive_search: bool = Field(False, description="是否优先在上次命中位置附近搜索")
+    adaptive_padding: int = Field(100, description="自适应搜索时在上次命中位置四周扩展的像素数")
+    multi_scale: bool = Field(False, description="是否使用多尺度匹配")
+    backend: str = Field("template", description="匹配后端 ('template', 'orb', 'akaze')")
 
     _template_img_center: Tuple[int, int] = None  # 存储模板图片的中心坐标
 
+    def _search_regions(self) -> list[Optional[Tuple[int, int, int, int]]]:
+        """
+        获取依次搜索的区域列表（全局屏幕坐标），None 表示全屏
+        自适应搜索时先搜索上次命中位置附近，再搜索整个搜索区域
+        """
+        base = get_capture_region(self.search_region, self.monitor, self.template_img)
+        regions = []
+        if self.adaptive_search:
+            last_hit = hit_history.get(self.template_img)
+            if last_hit is not None:
+                nearby = pad_region(last_hit, self.adaptive_padding)
+                if base is not None:
+                    nearby = intersect_region(nearby, base)
+                if nearby is not None:
+                    regions.append(nearby)
+        regions.append(base)
+        return regions
+
     @print_func_time(debug=_DEBUG)
     def run_command(self, **kwargs):
-        # 获取屏幕截图
-        tool = ScreenshotTool()
         try:
             if not os.path.exists(self.template_img):
                 raise FileNotFoundError(f"模板图片 ‘{self.template_img}’ 不存在")
-            tool.full_screen()  # 获取全屏截图
-            img_array = tool.get_image_as_numpy_array()  # 获取截图的 numpy 数组
 
-            center, threshold = centerPosition(img_array, self.template_img, self.threshold)
-            if center is None:
-                _error = f"未找到图片中心坐标, 匹配度 {threshold:.2f} 小于阈值 {self.threshold}"
+            result = None
+            regions = self._search_regions()
+            backend = getMatchBackend(self.backend)
+            for index, region in enumerate(regions):
+                try:
+                    shot = capture_service.grab(region, max_age=get_frame_cache_ttl())  # 截取搜索区域（BGRA 视图，零拷贝）
+                    monitor_key = capture_service.monitor_key(capture_service.monitor_of(region)) \
+                        if self.multi_scale else None
+                    result = backend.match(shot.image, self.template_img, self.threshold,
+                                           mode=self.image_mode,
+                                           pyramid=self.use_pyramid,
+                                           pyramidScale=self.pyramid_scale,
+                                           multiScale=self.multi_scale,
+                                           preferredScale=capture_service.dpi_scale,
+                                           monitorKey=monitor_key,
+                                           debugDump=get_debug_dump())
+                except ValueError as e:
+                    if index == len(regions) - 1:
+                        raise
+                    # 上次命中位置附近的区域无效（如已移出屏幕），直接搜索整个搜索区域
+                    print(f"[WARN] - (ImageMatchCmd) 跳过区域 {region}: {e}")
+                    continue
+                if result.matched:
+                    break
+                print(f"[INFO] - (ImageMatchCmd) 区域 {region or '全屏'} 未命中, 匹配度 {result.score:.2f}")
+            if result is None or not result.matched:
+                _score = result.score if result else 0.0
+                _error = f"未找到图片中心坐标, 匹配度 {_score:.2f} 小于阈值 {self.threshold}"
                 raise CommandRunningException(_error)
 
-            self._template_img_center = (int(center[0]), int(center[1]))
+            # 将截图内坐标转换为全局屏幕坐标
+            self._template_img_center = (int(result.center[0] + shot.left), int(result.center[1] + shot.top))
+            # 记录命中区域，供下次自适应搜索使用
+            left, top, width, height = result.box
+            hit_history.record(self.template_img, (left + shot.left, top + shot.top, width, height))
+            print(f"[DEBUG] - (ImageMatchCmd) 模板缓存统计: {template_cache.stats()}") if _DEBUG else None
             return  # self._template_img_center
         except KeyboardInterrupt:
             raise
         except Exception as e:
             raise CommandRunningException(e)
-        finally:
-            tool.close()
 
     @property
     def template_img_center(self):
@@ -151,6 +282,15 @@ class ImageClickCmd(ImageMatchCmd):
         error_retries_time:(float|int): 指令执行出错时的重试间隔时间
         template_img:(str): 模板图片路径
         threshold:(float): 匹配度阈值
+        image_mode:(str): 匹配模式 ('color', 'gray', 'edge')
+        use_pyramid:(bool): 是否使用金字塔(由粗到精)匹配
+        pyramid_scale:(float): 金字塔匹配的缩小比例
+        search_region:(list[int]): 搜索区域 [left, top, width, height]，为空时搜索全屏
+        monitor:(str): 目标显示器 ('all', 'cursor', 'last_hit', '1', '2', ...)
+        adaptive_search:(bool): 是否优先在上次命中位置附近搜索
+        adaptive_padding:(int): 自适应搜索时在上次命中位置四周扩展的像素数
+        multi_scale:(bool): 是否使用多尺度匹配（模板与屏幕的 DPI 缩放不一致时使用）
+        backend:(str): 匹配后端 ('template', 'orb', 'akaze')
     """
 
     name: str = Field("图片点击", description="指令名称")
@@ -160,6 +300,15 @@ class ImageClickCmd(ImageMatchCmd):
     is_active: bool = Field(True, description="指令是否启用")
     template_img: str = Field(None, description="模板图片路径")
     threshold: float = Field(default_factory=get_threshold, description="匹配度阈值")
+    image_mode: str = Field("color", description="匹配模式 ('color', 'gray', 'edge')")
+    use_pyramid: bool = Field(False, description="是否使用金字塔(由粗到精)匹配")
+    pyramid_scale: float = Field(0.5, description="金字塔匹配的缩小比例")
+    search_region: list[int] = Field([], description="搜索区域 [left, top, width, height]，为空时搜索全屏")
+    monitor: str = Field("all", description="目标显示器 ('all', 'cursor', 'last_hit', '1', '2', ...)")
+    adaptive_search: bool = Field(False, description="是否优先在上次命中位置附近搜索")
+    adaptive_padding: int = Field(100, description="自适应搜索时在上次命中位置四周扩展的像素数")
+    multi_scale: bool = Field(False, description="是否使用多尺度匹配")
+    backend: str = Field("template", description="匹配后端 ('template', 'orb', 'akaze')")
 
     clicks: int = Field(1, description="点击次数")
     interval: float | int = Field(0.2, description="点击间隔")
@@ -188,6 +337,579 @@ class ImageClickCmd(ImageMatchCmd):
                                       self.duration, self.interval, self.clicks)
 
 
+class MultiImageMatchCmd(RetryCmd):
+    """
+    <多图匹配> 指令
+    只截取一次屏幕，在同一帧截图中并发匹配多个模板图片，用于 “当前显示的是哪个窗口” 之类的判断
+
+    执行结果可在 If 判断中引用，eg: "results_list['<id>']['best_index'] == 1"、
+    "results_list['<id>']['scores'][0] > 0.9"
+
+    Attributes:
+        name:(str): 指令名称
+        retries:(int): 指令重复执行次数
+        error_retries:(int): 指令执行出错时的重试次数
+        is_active:(bool): 指令是否启用
+        error_retries_time:(float | int): 指令执行出错时的重试间隔时间
+        template_imgs:(list[str]): 模板图片路径列表
+        threshold:(float): 匹配度阈值
+        image_mode:(str): 匹配模式 ('color', 'gray', 'edge')
+        use_pyramid:(bool): 是否使用金字塔(由粗到精)匹配
+        pyramid_scale:(float): 金字塔匹配的缩小比例
+        search_region:(list[int]): 搜索区域 [left, top, width, height]，为空时搜索全屏
+        monitor:(str): 目标显示器 ('all', 'cursor', 'last_hit', '1', '2', ...)
+        require_all:(bool): 是否要求所有模板都匹配成功，否则只要有一个匹配成功即视为执行成功
+        backend:(str): 匹配后端 ('template', 'orb', 'akaze')，与 <图片匹配> 指令相同；
+            模板匹配时截图只预处理一次、各模板并发匹配，特征点匹配时在同一帧截图中逐个匹配
+
+        scores:(list[float]): 执行结果，各模板的最大匹配度
+        centers:(list[list[int] | None]): 执行结果，各模板的中心坐标（全局屏幕坐标），未匹配成功时为 None
+        matched:(list[bool]): 执行结果，各模板是否匹配成功
+        matched_count:(int): 执行结果，匹配成功的模板数量
+        best_index:(int): 执行结果，匹配成功的模板中匹配度最高的下标，全部未匹配成功时为 -1
+    """
+
+    name: str = Field("多图匹配", description="指令名称")
+    retries: int = Field(0, description="指令重复执行次数")
+    error_retries: int = Field(0, description="指令执行出错时的重试次数")
+    is_active: bool = Field(True, description="指令是否启用")
+    error_retries_time: float | int = Field(0, description="指令执行出错时的重试间隔时间")
+
+    template_imgs: list[str] = Field([], description="模板图片路径列表")
+    threshold: float = Field(default_factory=get_threshold, description="匹配度阈值")
+    image_mode: str = Field("color", description="匹配模式 ('color', 'gray', 'edge')")
+    use_pyramid: bool = Field(False, description="是否使用金字塔(由粗到精)匹配")
+    pyramid_scale: float = Field(0.5, description="金字塔匹配的缩小比例")
+    search_region: list[int] = Field([], description="搜索区域 [left, top, width, height]，为空时搜索全屏")
+    monitor: str = Field("all", description="目标显示器 ('all', 'cursor', 'last_hit', '1', '2', ...)")
+    require_all: bool = Field(False, description="是否要求所有模板都匹配成功")
+    backend: str = Field("template", description="匹配后端 ('template', 'orb', 'akaze')")
+
+    scores: list[float] = Field([], description="各模板的最大匹配度（执行结果）")
+    centers: list[Optional[list[int]]] = Field([], description="各模板的中心坐标（执行结果）")
+    matched: list[bool] = Field([], description="各模板是否匹配成功（执行结果）")
+    matched_count: int = Field(0, description="匹配成功的模板数量（执行结果）")
+    best_index: int = Field(-1, description="匹配度最高的已匹配模板下标（执行结果）")
+
+    @print_func_time(debug=_DEBUG)
+    def run_command(self, **kwargs):
+        self.scores, self.centers, self.matched, self.matched_count, self.best_index = [], [], [], 0, -1
+        if not self.template_imgs:
+            raise CommandRunningException("模板图片列表为空")
+        for template_img in self.template_imgs:
+            if not os.path.exists(template_img):
+                raise CommandRunningException(f"模板图片 ‘{template_img}’ 不存在")
+
+        try:
+            region = get_capture_region(self.search_region, self.monitor)
+            backend = getMatchBackend(self.backend)
+            shot = capture_service.grab(region, max_age=get_frame_cache_ttl())  # 所有模板共用同一帧截图
+            if backend.name == "template":
+                results = matchTemplates(shot.image, self.template_imgs, self.threshold,
+                                         debugDump=get_debug_dump(),
+                                         pyramid=self.use_pyramid,
+                                         pyramidScale=self.pyramid_scale,
+                                         mode=self.image_mode)
+            else:
+                results = [(result.center, result.score) for result in
+                           (backend.match(shot.image, template_img, self.threshold, debugDump=get_debug_dump())
+                            for template_img in self.template_imgs)]
+        except Exception as e:
+            raise CommandRunningException(e)
+
+        # 将截图内坐标转换为全局屏幕坐标
+        self.centers = [[int(center[0] + shot.left), int(center[1] + shot.top)] if center else None
+                        for center, _ in results]
+        self.scores = [round(float(score), 4) for _, score in results]
+        self.matched = [center is not None for center in self.centers]
+        self.matched_count = sum(self.matched)
+        matched_scores = [(score, i) for i, score in enumerate(self.scores) if self.matched[i]]
+        self.best_index = max(matched_scores)[1] if matched_scores else -1
+        if self.best_index >= 0:
+            hit_history.mark((*self.centers[self.best_index], 0, 0))
+        print(f"[INFO] - (MultiImageMatchCmd) 匹配度: {self.scores}, 中心坐标: {self.centers}")
+
+        if self.matched_count == 0:
+            raise CommandRunningException(f"所有模板均未匹配成功, 最高匹配度 {max(self.scores):.2f} 小于阈值 {self.threshold}")
+        if self.require_all and self.matched_count < len(self.template_imgs):
+            unmatched = [path for path, ok in zip(self.template_imgs, self.matched) if not ok]
+            raise CommandRunningException(f"以下模板未匹配成功: {unmatched}")
+
+
+class ImageFindAllCmd(RetryCmd):
+    """
+    <查找全部图片> 指令
+    查找模板图片在屏幕中的所有匹配位置（如一排相同的图标、列表项），重叠的重复匹配会被非极大值抑制去除
+
+    Attributes:
+        name:(str): 指令名称
+        retries:(int): 指令重复执行次数
+        error_retries:(int): 指令执行出错时的重试次数
+        is_active:(bool): 指令是否启用
+        error_retries_time:(float | int): 指令执行出错时的重试间隔时间
+        template_img:(str): 模板图片路径
+        threshold:(float): 匹配度阈值
+        search_region:(list[int]): 搜索区域 [left, top, width, height]，为空时搜索全屏
+        monitor:(str): 目标显示器 ('all', 'cursor', 'last_hit', '1', '2', ...)
+        max_results:(int): 最多返回的匹配数量
+        sort_by:(str): 排序方式，"score" 按匹配度从高到低，"position" 按从上到下、从左到右
+        overlap_threshold:(float): 两个匹配框的交并比超过该值时视为同一目标
+
+        centers:(list[list[int]]): 执行结果，所有匹配位置的中心坐标（全局屏幕坐标）
+        scores:(list[float]): 执行结果，所有匹配位置的匹配度
+        match_count:(int): 执行结果，匹配数量
+    """
+
+    name: str = Field("查找全部图片", description="指令名称")
+    retries: int = Field(0, description="指令重复执行次数")
+    error_retries: int = Field(0, description="指令执行出错时的重试次数")
+    is_active: bool = Field(True, description="指令是否启用")
+    error_retries_time: float | int = Field(0, description="指令执行出错时的重试间隔时间")
+
+    template_img: str = Field(None, description="模板图片路径")
+    threshold: float = Field(default_factory=get_threshold, description="匹配度阈值")
+    search_region: list[int] = Field([], description="搜索区域 [left, top, width, height]，为空时搜索全屏")
+    monitor: str = Field("all", description="目标显示器 ('all', 'cursor', 'last_hit', '1', '2', ...)")
+    max_results: int = Field(20, description="最多返回的匹配数量")
+    sort_by: str = Field("score", description="排序方式 ('score', 'position')")
+    overlap_threshold: float = Field(0.3, description="非极大值抑制的交并比阈值")
+
+    centers: list[list[int]] = Field([], description="所有匹配位置的中心坐标（执行结果）")
+    scores: list[float] = Field([], description="所有匹配位置的匹配度（执行结果）")
+    match_count: int = Field(0, description="匹配数量（执行结果）")
+
+    @print_func_time(debug=_DEBUG)
+    def run_command(self, **kwargs):
+        self.centers, self.scores, self.match_count = [], [], 0
+        if not self.template_img or not os.path.exists(self.template_img):
+            raise CommandRunningException(f"模板图片 ‘{self.template_img}’ 不存在")
+
+        try:
+            region = get_capture_region(self.search_region, self.monitor, self.template_img)
+            shot = capture_service.grab(region, max_age=get_frame_cache_ttl())
+            matches = findAllPositions(shot.image, self.template_img, self.threshold,
+                                       maxResults=self.max_results,
+                                       sortBy=self.sort_by,
+                                       overlap=self.overlap_threshold,
+                                       debugDump=get_debug_dump())
+        except Exception as e:
+            raise CommandRunningException(e)
+
+        # 将截图内坐标转换为全局屏幕坐标
+        self.centers = [[int(center[0] + shot.left), int(center[1] + shot.top)] for center, _ in matches]
+        self.scores = [round(score, 4) for _, score in matches]
+        self.match_count = len(matches)
+        print(f"[INFO] - (ImageFindAllCmd) 共找到 {self.match_count} 个匹配位置: {self.centers}")
+        if not matches:
+            raise CommandRunningException(f"未找到匹配度不小于 {self.threshold} 的位置")
+
+
+class ImageWaitCmd(RetryCmd):
+    """
+    <等待图片出现> 指令
+    按轮询间隔截取搜索区域，直到模板图片出现或超时；
+    画面与上一帧相比没有变化时跳过匹配，降低等待期间的 CPU 占用。
+    后台截图已开启且覆盖搜索区域时，直接使用后台截图的最新帧和分块变化标记
+
+    Attributes:
+        name:(str): 指令名称
+        retries:(int): 指令重复执行次数
+        error_retries:(int): 指令执行出错时的重试次数
+        is_active:(bool): 指令是否启用
+        error_retries_time:(float | int): 指令执行出错时的重试间隔时间
+        template_img:(str): 模板图片路径
+        threshold:(float): 匹配度阈值
+        use_pyramid:(bool): 是否使用金字塔(由粗到精)匹配
+        pyramid_scale:(float): 金字塔匹配的缩小比例
+        search_region:(list[int]): 搜索区域 [left, top, width, height]，为空时搜索全屏
+        monitor:(str): 目标显示器 ('all', 'cursor', 'last_hit', '1', '2', ...)
+        timeout:(float | int): 超时时间，单位为秒
+        poll_interval:(float | int): 轮询间隔，单位为秒
+
+        found:(bool): 执行结果，是否在超时前找到图片
+        center:(list[int]): 执行结果，图片中心坐标（全局屏幕坐标）
+        waited_time:(float): 执行结果，实际等待时间
+        checked_frames:(int): 执行结果，实际做了匹配的帧数
+        skipped_frames:(int): 执行结果，因画面未变化而跳过匹配的帧数
+    """
+
+    name: str = Field("等待图片出现", description="指令名称")
+    retries: int = Field(0, description="指令重复执行次数")
+    error_retries: int = Field(0, description="指令执行出错时的重试次数")
+    is_active: bool = Field(True, description="指令是否启用")
+    error_retries_time: float | int = Field(0, description="指令执行出错时的重试间隔时间")
+
+    template_img: str = Field(None, description="模板图片路径")
+    threshold: float = Field(default_factory=get_threshold, description="匹配度阈值")
+    use_pyramid: bool = Field(False, description="是否使用金字塔(由粗到精)匹配")
+    pyramid_scale: float = Field(0.5, description="金字塔匹配的缩小比例")
+    search_region: list[int] = Field([], description="搜索区域 [left, top, width, height]，为空时搜索全屏")
+    monitor: str = Field("all", description="目标显示器 ('all', 'cursor', 'last_hit', '1', '2', ...)")
+    timeout: float | int = Field(10.0, description="超时时间")
+    poll_interval: float | int = Field(0.2, description="轮询间隔")
+
+    found: bool = Field(False, description="是否在超时前找到图片（执行结果）")
+    center: list[int] = Field([], description="图片中心坐标（执行结果）")
+    waited_time: float = Field(0.0, description="实际等待时间（执行结果）")
+    checked_frames: int = Field(0, description="实际做了匹配的帧数（执行结果）")
+    skipped_frames: int = Field(0, description="因画面未变化而跳过匹配的帧数（执行结果）")
+
+    @print_func_time(debug=_DEBUG)
+    def run_command(self, **kwargs):
+        self.found, self.center, self.waited_time = False, [], 0.0
+        self.checked_frames, self.skipped_frames = 0, 0
+        if not self.template_img or not os.path.exists(self.template_img):
+            raise CommandRunningException(f"模板图片 ‘{self.template_img}’ 不存在")
+
+        start_time = time.perf_counter()
+        deadline = start_time + self.timeout
+        last_digest, last_checked, best_score = None, None, 0.0
+        try:
+            region = get_capture_region(self.search_region, self.monitor, self.template_img)
+            while True:
+                frame_time = time.perf_counter()
+                latest, watched = background_capture.latest(), background_capture.covers(region)
+                if latest is not None and watched is not None:
+                    # 后台截图覆盖了搜索区域：直接取最新帧，按分块变化标记判断画面是否变化，不阻塞截图
+                    shot = latest.crop(watched)
+                    unchanged = last_checked is not None and (
+                            shot.timestamp <= last_checked or not background_capture.changed_since(watched, last_checked))
+                else:
+                    shot = capture_service.grab(region)
+                    digest = frameDigest(shot.image)
+                    unchanged = digest == last_digest
+                    last_digest = digest
+                if unchanged:  # 画面没有变化，上一帧的匹配结果仍然有效
+                    self.skipped_frames += 1
+                else:
+                    last_checked = shot.timestamp
+                    self.checked_frames += 1
+                    center, score = centerPosition(shot.image, self.template_img, self.threshold,
+                                                   debugDump=get_debug_dump(),
+                                                   pyramid=self.use_pyramid,
+                                                   pyramidScale=self.pyramid_scale)
+                    best_score = max(best_score, score)
+                    if center is not None:
+                        self.center = [int(center[0] + shot.left), int(center[1] + shot.top)]
+                        self.found = True
+                        hit_history.mark((self.center[0], self.center[1], 0, 0))
+                        break
+
+                now = time.perf_counter()
+                if now >= deadline:
+                    break
+                # 扣除本帧截图和匹配的耗时，且不超过剩余的等待时间
+                time.sleep(max(0.0, min(self.poll_interval - (now - frame_time), deadline - now)))
+        except KeyboardInterrupt:
+            raise
+        except Exception as e:
+            raise CommandRunningException(e)
+        finally:
+            self.waited_time = round(time.perf_counter() - start_time, 3)
+
+        print(f"[INFO] - (ImageWaitCmd) 等待 {self.waited_time} 秒, 匹配 {self.checked_frames} 帧, "
+              f"跳过 {self.skipped_frames} 帧")
+        if not self.found:
+            raise CommandRunningException(f"等待 {self.timeout} 秒后仍未找到图片, "
+                                          f"最高匹配度 {best_score:.2f} 小于阈值 {self.threshold}")
+
+
+def _sample_colors(points: list, region: list, max_age: float = 0.0) -> list[list[int]]:
+    """
+    读取采样点的颜色和采样区域的平均颜色，只截取很小的区域
+    :param points: 采样点 [[x, y], ...]（全局屏幕坐标）
+    :param region: 采样区域 [left, top, width, height]，为空时不采样
+    :param max_age: 可接受的缓存帧最大时长（秒）
+    :return: [[r, g, b], ...]，采样点在前，区域平均颜色在最后
+    """
+    colors = []
+    if points:
+        xs, ys = [int(p[0]) for p in points], [int(p[1]) for p in points]
+        box = (min(xs), min(ys), max(xs) - min(xs) + 1, max(ys) - min(ys) + 1)
+        frame = capture_service.grab(box, max_age) if box[2] * box[3] <= PIXEL_BOX_MAX_AREA else None
+        if frame is not None and frame.region == box:
+            # 采样点集中时一次截取包含所有采样点的小区域
+            for x, y in zip(xs, ys):
+                b, g, r = frame.image[y - frame.top, x - frame.left, :3]
+                colors.append([int(r), int(g), int(b)])
+        else:
+            colors.extend(list(capture_service.pixel((x, y), max_age)) for x, y in zip(xs, ys))
+    if len(region) == 4:
+        colors.append(list(capture_service.region_color(tuple(region), max_age)))
+    return colors
+
+
+class PixelColorCmd(RetryCmd):
+    """
+    <像素颜色检测> 指令
+    读取若干采样点的颜色（或小区域的平均颜色），与目标颜色比较，
+    只截取包含采样点的很小区域，用于代替 “某个位置是否为绿色” 之类的图片匹配
+
+    Attributes:
+        name:(str): 指令名称
+        retries:(int): 指令重复执行次数
+        error_retries:(int): 指令执行出错时的重试次数
+        is_active:(bool): 指令是否启用
+        error_retries_time:(float | int): 指令执行出错时的重试间隔时间
+        points:(list[list[int]]): 采样点 [[x, y], ...]（全局屏幕坐标）
+        region:(list[int]): 采样区域 [left, top, width, height]，比较其平均颜色，为空时不使用
+        target_color:(list[int]): 目标颜色 [r, g, b]
+        tolerance:(int): 容差，各通道与目标颜色的差值都不超过该值时视为匹配
+        require_all:(bool): 是否要求全部采样都匹配，否则任一采样匹配即可
+
+        matched:(bool): 执行结果，颜色是否匹配
+        color:(list[int]): 执行结果，第一个采样的颜色 [r, g, b]
+        colors:(list[list[int]]): 执行结果，所有采样的颜色，采样点在前，区域平均颜色在最后
+        max_diff:(int): 执行结果，各采样与目标颜色的最大通道差值
+    """
+
+    name: str = Field("像素颜色检测", description="指令名称")
+    retries: int = Field(0, description="指令重复执行次数")
+    error_retries: int = Field(0, description="指令执行出错时的重试次数")
+    is_active: bool = Field(True, description="指令是否启用")
+    error_retries_time: float | int = Field(0, description="指令执行出错时的重试间隔时间")
+
+    points: list[list[int]] = Field([], description="采样点 [[x, y], ...]")
+    region: list[int] = Field([], description="采样区域 [left, top, width, height]，比较其平均颜色")
+    target_color: list[int] = Field([0, 0, 0], description="目标颜色 [r, g, b]")
+    tolerance: int = Field(10, description="各通道允许的颜色差值")
+    require_all: bool = Field(True, description="是否要求全部采样都匹配")
+
+    matched: bool = Field(False, description="颜色是否匹配（执行结果）")
+    color: list[int] = Field([], description="第一个采样的颜色（执行结果）")
+    colors: list[list[int]] = Field([], description="所有采样的颜色（执行结果）")
+    max_diff: int = Field(0, description="各采样与目标颜色的最大通道差值（执行结果）")
+
+    def _check(self, max_age: float = 0.0) -> bool:
+        """采样并与目标颜色比较，更新执行结果"""
+        if not self.points and len(self.region) != 4:
+            raise CommandRunningException("采样点和采样区域不能同时为空")
+        if len(self.target_color) != 3:
+            raise CommandRunningException(f"目标颜色 {self.target_color} 格式错误，应为 [r, g, b]")
+        self.colors = _sample_colors(self.points, self.region, max_age)
+        self.color = self.colors[0]
+        diffs = [max(abs(c - t) for c, t in zip(color, self.target_color)) for color in self.colors]
+        self.max_diff = max(diffs)
+        hits = [diff <= self.tolerance for diff in diffs]
+        self.matched = all(hits) if self.require_all else any(hits)
+        return self.matched
+
+    @print_func_time(debug=_DEBUG)
+    def run_command(self, **kwargs):
+        self.matched, self.color, self.colors, self.max_diff = False, [], [], 0
+        try:
+            matched = self._check(get_frame_cache_ttl())
+        except CommandRunningException:
+            raise
+        except Exception as e:
+            raise CommandRunningException(e)
+        print(f"[INFO] - (PixelColorCmd) 采样颜色 {self.colors}, 目标颜色 {self.target_color}, "
+              f"最大差值 {self.max_diff}")
+        if not matched:
+            raise CommandRunningException(f"颜色不匹配, 最大差值 {self.max_diff} 大于容差 {self.tolerance}")
+
+
+class WaitPixelColorCmd(PixelColorCmd):
+    """
+    <等待像素颜色> 指令
+    按轮询间隔读取采样点的颜色，直到与目标颜色匹配或超时
+
+    Attributes:
+        name:(str): 指令名称
+        retries:(int): 指令重复执行次数
+        error_retries:(int): 指令执行出错时的重试次数
+        is_active:(bool): 指令是否启用
+        error_retries_time:(float | int): 指令执行出错时的重试间隔时间
+        points:(list[list[int]]): 采样点 [[x, y], ...]（全局屏幕坐标）
+        region:(list[int]): 采样区域 [left, top, width, height]，比较其平均颜色，为空时不使用
+        target_color:(list[int]): 目标颜色 [r, g, b]
+        tolerance:(int): 容差，各通道与目标颜色的差值都不超过该值时视为匹配
+        require_all:(bool): 是否要求全部采样都匹配，否则任一采样匹配即可
+        timeout:(float | int): 超时时间，单位为秒
+        poll_interval:(float | int): 轮询间隔，单位为秒
+
+        matched:(bool): 执行结果，最后一次采样的颜色是否匹配
+        color:(list[int]): 执行结果，最后一次采样中第一个采样的颜色 [r, g, b]
+        colors:(list[list[int]]): 执行结果，最后一次采样的所有颜色
+        max_diff:(int): 执行结果，最后一次采样与目标颜色的最大通道差值
+        found:(bool): 执行结果，是否在超时前等到目标颜色
+        waited_time:(float): 执行结果，实际等待时间
+    """
+
+    name: str = Field("等待像素颜色", description="指令名称")
+    retries: int = Field(0, description="指令重复执行次数")
+    error_retries: int = Field(0, description="指令执行出错时的重试次数")
+    is_active: bool = Field(True, description="指令是否启用")
+    error_retries_time: float | int = Field(0, description="指令执行出错时的重试间隔时间")
+
+    points: list[list[int]] = Field([], description="采样点 [[x, y], ...]")
+    region: list[int] = Field([], description="采样区域 [left, top, width, height]，比较其平均颜色")
+    target_color: list[int] = Field([0, 0, 0], description="目标颜色 [r, g, b]")
+    tolerance: int = Field(10, description="各通道允许的颜色差值")
+    require_all: bool = Field(True, description="是否要求全部采样都匹配")
+    timeout: float | int = Field(10.0, description="超时时间")
+    poll_interval: float | int = Field(0.1, description="轮询间隔")
+
+    found: bool = Field(False, description="是否在超时前等到目标颜色（执行结果）")
+    waited_time: float = Field(0.0, description="实际等待时间（执行结果）")
+
+    @print_func_time(debug=_DEBUG)
+    def run_command(self, **kwargs):
+        self.matched, self.color, self.colors, self.max_diff = False, [], [], 0
+        self.found, self.waited_time = False, 0.0
+        start_time = time.perf_counter()
+        deadline = start_time + self.timeout
+        try:
+            while True:
+                poll_time = time.perf_counter()
+                if self._check():  # 每次都重新截取采样点，不使用帧缓存
+                    self.found = True
+                    break
+                now = time.perf_counter()
+                if now >= deadline:
+                    break
+                time.sleep(max(0.0, min(self.poll_interval - (now - poll_time), deadline - now)))
+        except KeyboardInterrupt:
+            raise
+        except CommandRunningException:
+            raise
+        except Exception as e:
+            raise CommandRunningException(e)
+        finally:
+            self.waited_time = round(time.perf_counter() - start_time, 3)
+
+        print(f"[INFO] - (WaitPixelColorCmd) 等待 {self.waited_time} 秒, 采样颜色 {self.colors}")
+        if not self.found:
+            raise CommandRunningException(f"等待 {self.timeout} 秒后颜色仍不匹配, "
+                                          f"最大差值 {self.max_diff} 大于容差 {self.tolerance}")
+
+
+class SharedOcrPass:
+    """
+    连续文字识别指令共用的识别结果
+
+    执行器把相邻的文字识别指令编为一组（参见 link_shared_ocr_passes）：组内指令识别所有成员识别区域的外接矩形，
+    画面与上次识别时完全相同（截图摘要一致）时直接复用上次的识别结果，各指令只按自己的匹配条件和识别区域筛选文字；
+    画面变化时（如点击后弹出新内容）重新识别并更新共用结果。
+    成员的识别区域相距较远、外接矩形过大时不共用，各指令仍只识别自己的区域
+
+    Attributes:
+        commands: (list[ImageOcrCmd]) 组内的文字识别指令
+        runs: (int) 实际识别的次数
+        reuses: (int) 复用识别结果的次数
+    """
+
+    def __init__(self, commands: list):
+        self.commands = commands
+        self.runs = 0
+        self.reuses = 0
+        self._planned = False  # 是否已计算共用识别区域
+        self._enabled = True
+        self._region: Optional[Tuple[int, int, int, int]] = None  # 共用识别区域，None 表示所有显示器
+        self._digest: Optional[bytes] = None  # 上次识别的截图摘要
+        self._result = None  # 上次识别的结果
+        self._ocr = None  # 上次识别使用的 OCRTool
+
+    def _plan(self) -> None:
+        """计算共用识别区域（组内第一条指令执行时），外接矩形面积增长过多时不共用"""
+        self._planned = True
+        monitor = capture_service.monitors[0]
+        bounds = (monitor["left"], monitor["top"], monitor["width"], monitor["height"])
+        union, total_area = None, 0
+        for command in self.commands:
+            try:
+                region = command._ocr_region() or bounds
+            except ValueError:  # 锚点尚无命中记录等，由该指令执行时自行报错
+                continue
+            union = region if union is None else union_region(union, region)
+            total_area += region[2] * region[3]
+        if union is None or union[2] * union[3] > total_area * SHARED_OCR_MAX_GROWTH:
+            self._enabled = False
+            return
+        self._region = None if union == bounds else union
+
+    def recognize(self, ocr, region: Optional[Tuple[int, int, int, int]]):
+        """
+        获取共用的识别结果
+        :param ocr: OCRTool
+        :param region: 指令自己的识别区域（全局屏幕坐标），None 表示所有显示器
+        :return: (截图 Frame, 识别结果, 是否复用了上次的结果)；不能共用时返回 None，由指令自行识别
+        """
+        if not self._planned:
+            self._plan()
+        if not self._enabled or (self._region is not None and
+                                 (region is None or intersect_region(self._region, region) != region)):
+            return None  # 不在共用识别区域内（如锚点已移动）
+        shot = capture_service.grab(self._region, max_age=get_frame_cache_ttl())
+        digest = OcrResultCache.digest(shot.image)
+        if digest == self._digest and ocr is self._ocr:
+            self.reuses += 1
+            return shot, self._result, True
+        result = ocr.perform_ocr(shot.rgb())
+        self._digest, self._result, self._ocr = digest, result, ocr
+        self.runs += 1
+        return shot, result, False
+
+
+def _command_blocks(command) -> list[list]:
+    """If、Loop、子任务指令包含的代码块（指令列表），其他指令返回空列表"""
+    if isinstance(command, IfCommand):
+        return [command.then_commands, command.else_commands]
+    if isinstance(command, LoopCommand):
+        return [command.loop_commands]
+    if isinstance(command, SubtaskCommand):
+        return [command.subtask_steps]
+    return []
+
+
+def link_shared_ocr_passes(commands: list) -> int:
+    """
+    把指令列表中相邻的文字识别指令编为一组，共用同一帧的识别结果（递归处理 If、Loop、子任务的代码块）
+    未启用的指令不会执行，不会打断分组
+    :param commands: 指令列表
+    :return: 编组数量
+    """
+    if not get_ocr_shared_pass():
+        return 0
+    groups, run = 0, []
+    for command in [*commands, None]:
+        for block in _command_blocks(command):
+            groups += link_shared_ocr_passes(block)
+        if isinstance(command, ImageOcrCmd):
+            if command.is_active:
+                run.append(command)
+            continue
+        if command is not None and command.is_active is False:
+            continue
+        if len(run) > 1:
+            shared = SharedOcrPass(run)
+            for member in run:
+                member.shared_pass = shared
+            groups += 1
+        run = []
+    return groups
+
+
+def contains_ocr_commands(commands: list) -> bool:
+    """指令列表中是否包含文字识别指令（递归检查 If、Loop、子任务的代码块）"""
+    return any(isinstance(command, ImageOcrCmd) or any(contains_ocr_commands(block)
+                                                       for block in _command_blocks(command))
+               for command in commands)
+
+
+def wait_ocr_model(on_wait: Optional[Callable[[], None]] = None) -> OCRTool:
+    """
+    等待模型管理器加载 OCR 模型，执行器在运行包含文字识别指令的任务前调用，避免第一条文字识别指令的耗时包含模型加载
+    :param on_wait: 模型尚未加载完成、需要等待时调用，如输出日志
+    :return: OCRTool
+    :raises Exception: 等待超时或模型加载失败
+    """
+    future = ocr_model_manager.load_async()
+    if not future.done() and on_wait is not None:
+        on_wait()
+    return future.result(MODEL_LOAD_TIMEOUT)
+
+
 class ImageOcrCmd(RetryCmd):
     """
     <文字识别> 指令
@@ -200,7 +922,22 @@ class ImageOcrCmd(RetryCmd):
         error_retries_time:(float|int): 指令执行出错时的重试间隔时间
         is_active:(bool): 指令是否启用
 
+        text:(str): 待识别的文本
+        match_mode:(str): 文字匹配模式 ('完全匹配', '部分匹配', '模糊匹配')
+        is_ignore_case:(bool): 对于字母是否忽略大小写
+        use_regex:(bool): 是否使用正则表达式匹配
         threshold:(float): 匹配度阈值
+        fuzzy_distance:(float): 模糊匹配允许的归一化编辑距离（0~1），比较前会归一化 OCR 易混淆字符（如 O 与 0）
+        monitor:(str): 目标显示器 ('all', 'cursor', 'last_hit', '1', '2', ...)，只截取和识别该显示器
+        ocr_region:(list[int]): 识别区域 [left, top, width, height]，为空时识别整个目标显示器；
+            识别耗时与像素数量成正比，只识别需要的区域可显著加快识别
+        region_anchor:(str): 识别区域的锚点，为空时 ocr_region 为全局屏幕坐标；
+            为模板图片路径时 ocr_region 相对于该模板上次匹配成功区域的左上角，为 'last_hit' 时相对于最近一次命中的区域，
+            可只识别先前 <图片匹配> 找到的锚点旁边的文字
+        cache_layout:(bool): 缓存识别区域的文本框，之后布局未变化时只对这些文本框执行识别模型，
+            适合轮询读取位置固定、内容变化的文字（计数器、状态文字）；不与相邻指令共用识别结果
+
+    由执行器编入 SharedOcrPass 时，与相邻的文字识别指令共用同一帧的识别结果
     """
 
     name: str = Field("文字识别", description="指令名称")
@@ -214,47 +951,77 @@ class ImageOcrCmd(RetryCmd):
     is_ignore_case: bool = Field(False, description="对于字母是否忽略大小写")
     use_regex: bool = Field(False, description="是否使用正则表达式匹配")
     threshold: float = Field(default_factory=get_ocr_threshold, description="匹配度阈值")
+    fuzzy_distance: float = Field(FUZZY_MAX_DISTANCE, description="模糊匹配允许的归一化编辑距离（0~1）")
+    monitor: str = Field("all", description="目标显示器 ('all', 'cursor', 'last_hit', '1', '2', ...)")
+    ocr_region: list[int] = Field([], description="识别区域 [left, top, width, height]，为空时识别整个目标显示器")
+    region_anchor: str = Field("", description="识别区域的锚点（模板图片路径或 'last_hit'），为空时为全局屏幕坐标")
+    cache_layout: bool = Field(False, description="缓存文本框，布局不变时只重新识别文字")
 
     _matching_boxes: list[tuple[str,tuple[int,int,int,int]]] = []  # 存储所有匹配成功的文本区域框
+    _shared_pass: Optional[SharedOcrPass] = None  # 所在的共用识别分组
+    _ocr_shared: bool = False  # 本次执行是否复用了共用识别结果
 
     def __init__(self, ocr, **kwargs):
         super(ImageOcrCmd, self).__init__(**kwargs)
         self._ocr = ocr
 
+    def _ocr_region(self) -> Optional[Tuple[int, int, int, int]]:
+        """
+        获取识别区域（全局屏幕坐标）：按锚点平移后的 ocr_region 与目标显示器的交集，None 表示所有显示器
+        :raises ValueError: 锚点尚无命中记录，或识别区域不在目标显示器内
+        """
+        region = list(self.ocr_region)
+        if len(region) == 4 and self.region_anchor:
+            anchor = hit_history.last if self.region_anchor == MONITOR_LAST_HIT else hit_history.get(self.region_anchor)
+            if anchor is None:
+                raise ValueError(f"识别区域锚点 ‘{self.region_anchor}’ 尚无命中记录")
+            region = [anchor[0] + region[0], anchor[1] + region[1], region[2], region[3]]
+        return get_capture_region(region, self.monitor)
+
     @print_func_time(debug=_DEBUG)
     def run_command(self, **kwargs):
-        tool = ScreenshotTool()  # 创建 ScreenshotTool 对象
+        self._ocr_shared = False
         try:
-            tool.full_screen()  # 获取全屏截图
-            img_array = tool.get_image_as_numpy_array()  # 获取截图的 numpy 数组
-            # 创建 OCRTool 对象, 同时加载模型
+            region = self._ocr_region()
+            # 未传入 OCRTool 时使用模型管理器中的模型，尚未加载完成时等待
             start_load_model_time = time.time()
-            if self._ocr:  # 如果已经提前加载模型，直接使用
-                ocr = self._ocr
+            ocr = self._ocr or ocr_model_manager.get()
+            print(f"等待模型耗时: {time.time() - start_load_model_time:.5f} 秒") if _DEBUG else None
+
+            shared = self._shared_pass.recognize(ocr, region) \
+                if self._shared_pass and not self.cache_layout else None
+            if shared is not None:
+                shot, result, self._ocr_shared = shared
             else:
-                ocr = OCRTool(
-                    det_model_dir=DET_MODEL_DIR,
-                    rec_model_dir=REC_MODEL_DIR,
-                    cls_model_dir=CLS_MODEL_DIR,
-                    use_angle_cls=False)
-            print(f"加载模型耗时: {time.time() - start_load_model_time:.5f} 秒") if _DEBUG else None
-
-            result = ocr.perform_ocr(img_array)
+                shot = capture_service.grab(region, max_age=get_frame_cache_ttl())
+                if self.cache_layout:  # 复用该区域的文本框，只执行识别模型
+                    result = ocr.perform_ocr_layout(shot.rgb(), region_key=shot.region)
+                else:
+                    result = ocr.perform_ocr(shot.rgb())  # 只转换识别区域，获取其 RGB 数组
             if not result:
                 raise CommandRunningException("识别失败")
             matching_boxes = find_matching_texts(result, text=self.text,
                                                  match_mode=self.match_mode,
                                                  ignore_case=self.is_ignore_case,
                                                  use_regex=self.use_regex,
-                                                 confidence_threshold=self.threshold)
+                                                 confidence_threshold=self.threshold,
+                                                 max_distance=self.fuzzy_distance)
+            # 将截图内坐标转换为全局屏幕坐标
+            matching_boxes = [(text, (x1 + shot.left, y1 + shot.top, x2 + shot.left, y2 + shot.top))
+                              for text, (x1, y1, x2, y2) in matching_boxes]
+            if shared is not None and region is not None:
+                # 共用识别区域大于本指令的识别区域，只保留中心点位于本指令识别区域内的文字
+                matching_boxes = [(text, box) for text, box in matching_boxes
+                                  if region[0] <= (box[0] + box[2]) / 2 < region[0] + region[2]
+                                  and region[1] <= (box[1] + box[3]) / 2 < region[1] + region[3]]
             if not matching_boxes:
                 raise CommandRunningException("文字匹配结果为空")
 
             self._matching_boxes = matching_boxes
+            x1, y1, x2, y2 = self._matching_boxes[0][1]
+            hit_history.mark((x1, y1, x2 - x1, y2 - y1))
         except Exception as e:
             raise CommandRunningException(e)
-        finally:
-            tool.close()
 
     @property
     def matching_boxes(self) -> list[tuple[str, tuple[int, int, int, int]]]:
@@ -267,6 +1034,20 @@ class ImageOcrCmd(RetryCmd):
     def matching_boxes(self, value: list[tuple[str, tuple[int, int, int, int]]]):
         self._matching_boxes = value
 
+    @property
+    def shared_pass(self) -> Optional[SharedOcrPass]:
+        """所在的共用识别分组，None 表示单独识别"""
+        return self._shared_pass
+
+    @shared_pass.setter
+    def shared_pass(self, value: Optional[SharedOcrPass]):
+        self._shared_pass = value
+
+    @property
+    def ocr_shared(self) -> bool:
+        """本次执行是否复用了相邻文字识别指令在同一帧上的识别结果"""
+        return self._ocr_shared
+
 
 class ImageOcrClickCmd(ImageOcrCmd):
     """
@@ -281,9 +1062,14 @@ class ImageOcrClickCmd(ImageOcrCmd):
         is_active:(bool): 指令是否启用
 
         text:(str): 待识别的文本
-        match_mode:(str): 文字匹配模式
+        match_mode:(str): 文字匹配模式 ('完全匹配', '部分匹配', '模糊匹配')
         is_ignore_case:(bool): 对于字母是否忽略大小写
         threshold:(float): 匹配度阈值
+        fuzzy_distance:(float): 模糊匹配允许的归一化编辑距离（0~1）
+        monitor:(str): 目标显示器 ('all', 'cursor', 'last_hit', '1', '2', ...)
+        ocr_region:(list[int]): 识别区域 [left, top, width, height]，为空时识别整个目标显示器
+        region_anchor:(str): 识别区域的锚点（模板图片路径或 'last_hit'），为空时 ocr_region 为全局屏幕坐标
+        cache_layout:(bool): 缓存文本框，布局未变化时只重新识别文字
 
         clicks:(int): 点击次数
         interval:(float|int): 点击间隔
@@ -303,6 +1089,11 @@ class ImageOcrClickCmd(ImageOcrCmd):
     is_ignore_case: bool = Field(False, description="对于字母是否忽略大小写")
     use_regex: bool = Field(False, description="是否使用正则表达式匹配")
     threshold: float = Field(default_factory=get_ocr_threshold, description="匹配度阈值")
+    fuzzy_distance: float = Field(FUZZY_MAX_DISTANCE, description="模糊匹配允许的归一化编辑距离（0~1）")
+    monitor: str = Field("all", description="目标显示器 ('all', 'cursor', 'last_hit', '1', '2', ...)")
+    ocr_region: list[int] = Field([], description="识别区域 [left, top, width, height]，为空时识别整个目标显示器")
+    region_anchor: str = Field("", description="识别区域的锚点（模板图片路径或 'last_hit'），为空时为全局屏幕坐标")
+    cache_layout: bool = Field(False, description="缓存文本框，布局不变时只重新识别文字")
 
     clicks: int = Field(1, description="点击次数")
     interval: float | int = Field(0.2, description="点击间隔")
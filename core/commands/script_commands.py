@@ -16,7 +16,10 @@ from pydantic import Field
 from typing import Optional, Any, Dict
 
 from utils.debug import print_func_time, print_command
-from utils.opencv_funcs import drawRectangle
+from utils.opencv_funcs import drawRectangle, findAllPositions, template_cache
+from utils.capture_service import capture_service
+from utils.ocr_tools import ocr_result_cache, ocr_layout_cache
+from utils.ocr_service import ocr_service
 
 from .base_command import BaseCommand, CommandRunningException, STATUS_COMPLETED, STATUS_FAILED
 from .mouse_commands import *
@@ -169,63 +172,8 @@ class ExecutePyCmd(BaseCommand):
 
     def __init__(self, **data):
         super().__init__(**data)
-        # 注册自动化指令类
-        self._register_command_classes()
-        # 注册自定义类
-        self._register_custom_classes()
-        # 注册函数
-        self._register_functions()
-
-    @staticmethod
-    def _register_command_classes():
-        """ 注册所有可用的自动化指令类 """
-        command_classes = {
-            # 鼠标操作
-            "MouseClickCmd": MouseClickCmd,
-            "MouseMoveToCmd": MouseMoveToCmd,
-            "MouseMoveRelCmd": MouseMoveRelCmd,
-            "MouseDragToCmd": MouseDragToCmd,
-            "MouseDragRelCmd": MouseDragRelCmd,
-            "MouseScrollCmd": MouseScrollCmd,
-            "MouseScrollHCmd": MouseScrollHCmd,
-            # 键盘操作
-            "KeyPressCmd": KeyPressCmd,
-            "KeyReleaseCmd": KeyReleaseCmd,
-            "KeyTapCmd": KeyTapCmd,
-            "HotKeyCmd": HotKeyCmd,
-            "KeyTypeTextCmd": KeyTypeTextCmd,
-            # 图像操作
-            "ImageMatchCmd": ImageMatchCmd,
-            "ImageClickCmd": ImageClickCmd,
-            "ImageOcrCmd": ImageOcrCmd,
-            "ImageOcrClickCmd": ImageOcrClickCmd,
-            # 执行Dos命令
-            "ExecuteDosCmd": ExecuteDosCmd,
-        }
-        for name, cmd_class in command_classes.items():
-            safe_globals_manager.register_command(name, cmd_class)
-
-    @staticmethod
-    def _register_custom_classes():
-        """ 注册自定义类 """
-        custom_classes = {
-            # 图片识别工具类
-            "OCRTool": OCRTool
-        }
-        for name, custom_class in custom_classes.items():
-            safe_globals_manager.register_custom_class(name, custom_class)
-
-    @staticmethod
-    def _register_functions():
-        """ 注册函数 """
-        custom_functions = {
-            # debug 函数
-            "print_func_time": print_func_time,
-            "print_command": print_command,
-            "drawRectangle": drawRectangle
-        }
-        for name, func in custom_functions.items():
-            safe_globals_manager.register_custom_function(name, func)
+        # 注册沙箱中可用的指令类、自定义类和函数
+        register_sandbox_globals()
 
     @print_func_time(debug=_DEBUG)
     def execute(self, **kwargs) -> Dict[str, Any]:
@@ -261,3 +209,72 @@ class ExecutePyCmd(BaseCommand):
             print(f"[ERROR] - (ExecutePyCmd) {error_message}")
             self.set_status(STATUS_FAILED)
             raise CommandRunningException(error_message)
+
+
+def register_sandbox_globals():
+    """
+    注册 Python 代码沙箱中可用的自动化指令类、自定义类和函数
+    <执行 Python 代码> 指令和代码编辑器共用这一份列表
+    """
+    command_classes = {
+        # 鼠标操作
+        "MousePressReleaseCmd": MousePressReleaseCmd,
+        "MouseClickCmd": MouseClickCmd,
+        "MouseMoveToCmd": MouseMoveToCmd,
+        "MouseMoveRelCmd": MouseMoveRelCmd,
+        "MouseDragToCmd": MouseDragToCmd,
+        "MouseDragRelCmd": MouseDragRelCmd,
+        "MouseScrollCmd": MouseScrollCmd,
+        "MouseScrollHCmd": MouseScrollHCmd,
+        # 键盘操作
+        "KeyPressCmd": KeyPressCmd,
+        "KeyReleaseCmd": KeyReleaseCmd,
+        "KeyTapCmd": KeyTapCmd,
+        "HotKeyCmd": HotKeyCmd,
+        "KeyTypeTextCmd": KeyTypeTextCmd,
+        # 图像操作
+        "ImageMatchCmd": ImageMatchCmd,
+        "ImageClickCmd": ImageClickCmd,
+        "MultiImageMatchCmd": MultiImageMatchCmd,
+        "ImageFindAllCmd": ImageFindAllCmd,
+        "ImageWaitCmd": ImageWaitCmd,
+        "PixelColorCmd": PixelColorCmd,
+        "WaitPixelColorCmd": WaitPixelColorCmd,
+        "ImageOcrCmd": ImageOcrCmd,
+        "ImageOcrClickCmd": ImageOcrClickCmd,
+        # 执行Dos命令
+        "ExecuteDosCmd": ExecuteDosCmd,
+    }
+    for name, cmd_class in command_classes.items():
+        safe_globals_manager.register_command(name, cmd_class)
+
+    custom_classes = {
+        # 图片识别工具类
+        "OCRTool": OCRTool
+    }
+    for name, custom_class in custom_classes.items():
+        safe_globals_manager.register_custom_class(name, custom_class)
+
+    custom_functions = {
+        # debug 函数
+        "print_func_time": print_func_time,
+        "print_command": print_command,
+        "drawRectangle": drawRectangle,
+        # 查找模板图片的所有匹配位置
+        "findAllPositions": findAllPositions,
+        # 模板缓存命中统计
+        "templateCacheStats": template_cache.stats,
+        # 截图耗时统计
+        "captureStats": capture_service.stats,
+        # OCR 识别结果缓存命中统计
+        "ocrCacheStats": ocr_result_cache.stats,
+        # OCR 文本框缓存复用统计
+        "ocrLayoutStats": ocr_layout_cache.stats,
+        # OCR 工作进程池统计
+        "ocrServiceStats": ocr_service.stats,
+        # 读取像素 / 小区域颜色
+        "getPixelColor": capture_service.pixel,
+        "getRegionColor": capture_service.region_color
+    }
+    for name, func in custom_functions.items():
+        safe_globals_manager.register_custom_function(name, func)
@@ -92,29 +92,77 @@ CUSTOM_APIS = {
         'methods': ['execute()'],
         'attributes': ['name', 'is_active', 'retries',
                        'error_retries', 'error_retries_time',
-                       'template_img', 'threshold']
+                       'template_img', 'threshold', 'image_mode', 'use_pyramid', 'pyramid_scale',
+                       'search_region', 'monitor', 'adaptive_search', 'adaptive_padding', 'multi_scale', 'backend']
     },
     'ImageClickCmd': {
         'type': 'class',
         'methods': ['execute()'],
         'attributes': ['name', 'is_active', 'retries',
                        'error_retries', 'error_retries_time',
-                       'template_img', 'threshold',
+                       'template_img', 'threshold', 'image_mode', 'use_pyramid', 'pyramid_scale',
+                       'search_region', 'monitor', 'adaptive_search', 'adaptive_padding', 'multi_scale', 'backend',
                        'clicks', 'interval', 'button', 'duration', 'use_pynput']
     },
+    'MultiImageMatchCmd': {
+        'type': 'class',
+        'methods': ['execute()'],
+        'attributes': ['name', 'is_active', 'retries',
+                       'error_retries', 'error_retries_time',
+                       'template_imgs', 'threshold', 'image_mode', 'use_pyramid', 'pyramid_scale',
+                       'search_region', 'monitor', 'require_all', 'backend',
+                       'scores', 'centers', 'matched', 'matched_count', 'best_index']
+    },
+    'ImageFindAllCmd': {
+        'type': 'class',
+        'methods': ['execute()'],
+        'attributes': ['name', 'is_active', 'retries',
+                       'error_retries', 'error_retries_time',
+                       'template_img', 'threshold', 'search_region', 'monitor',
+                       'max_results', 'sort_by', 'overlap_threshold',
+                       'centers', 'scores', 'match_count']
+    },
+    'ImageWaitCmd': {
+        'type': 'class',
+        'methods': ['execute()'],
+        'attributes': ['name', 'is_active', 'retries',
+                       'error_retries', 'error_retries_time',
+                       'template_img', 'threshold', 'use_pyramid', 'pyramid_scale',
+                       'search_region', 'monitor', 'timeout', 'poll_interval',
+                       'found', 'center', 'waited_time', 'checked_frames', 'skipped_frames']
+    },
+    'PixelColorCmd': {
+        'type': 'class',
+        'methods': ['execute()'],
+        'attributes': ['name', 'is_active', 'retries',
+                       'error_retries', 'error_retries_time',
+                       'points', 'region', 'target_color', 'tolerance', 'require_all',
+                       'matched', 'color', 'colors', 'max_diff']
+    },
+    'WaitPixelColorCmd': {
+        'type': 'class',
+        'methods': ['execute()'],
+        'attributes': ['name', 'is_active', 'retries',
+                       'error_retries', 'error_retries_time',
+                       'points', 'region', 'target_color', 'tolerance', 'require_all',
+                       'timeout', 'poll_interval',
+                       'matched', 'color', 'colors', 'max_diff', 'found', 'waited_time']
+    },
     'ImageOcrCmd': {
         'type': 'class',
         'methods': ['execute()'],
         'attributes': ['name', 'is_active', 'retries',
                        'error_retries', 'error_retries_time',
-                       'text', 'match_mode', 'is_ignore_case', 'use_regex', 'threshold']
+                       'text', 'match_mode', 'is_ignore_case', 'use_regex', 'threshold', 'fuzzy_distance', 'monitor',
+                       'ocr_region', 'region_anchor', 'cache_layout']
     },
     'ImageOcrClickCmd': {
         'type': 'class',
         'methods': ['execute()'],
         'attributes': ['name', 'is_active', 'retries',
                        'error_retries', 'error_retries_time',
-                       'text', 'match_mode', 'is_ignore_case', 'use_regex', 'threshold',
+                       'text', 'match_mode', 'is_ignore_case', 'use_regex', 'threshold', 'fuzzy_distance', 'monitor',
+                       'ocr_region', 'region_anchor', 'cache_layout',
                        'clicks', 'interval', 'button', 'duration', 'use_pynput']
     },
     'ExecuteDosCmd': {
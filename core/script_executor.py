@@ -17,9 +17,11 @@ from PyQt5.QtCore import QObject, pyqtSignal, QThread
 
 from core.commands.base_command import BaseCommand
 from core.commands.flow_commands import IfCommand, LoopCommand
-from core.commands.image_commands import ImageOcrCmd, ImageOcrClickCmd, ImageMatchCmd, ImageClickCmd
+from core.commands.image_commands import ImageOcrCmd, ImageOcrClickCmd, ImageMatchCmd, ImageClickCmd, \
+    link_shared_ocr_passes, contains_ocr_commands, wait_ocr_model
 from core.commands.subtask_command import SubtaskCommand
-from .command_map import COMMAND_MAP
+from .command_map import COMMAND_MAP, INPUT_COMMANDS
+from utils.capture_service import capture_service
 
 _DEBUG = False
 
@@ -131,6 +133,14 @@ class ScriptWorker(QObject):
 
                 self.commands = self._parse_commands(steps)
                 self.log.emit(f"🟢 成功加载 {len(self.commands)} 个顶层指令（含嵌套指令）")
+                shared_groups = link_shared_ocr_passes(self.commands)
+                if shared_groups:
+                    self.log.emit(f"♻ {shared_groups} 组相邻的文字识别指令将共用同一帧的识别结果")
+                if self._ocr is None and contains_ocr_commands(self.commands):
+                    try:
+                        self._ocr = wait_ocr_model(lambda: self.log.emit("⏳ 等待 OCR 模型加载完成..."))
+                    except Exception as e:
+                        self.log.emit(f"❌ OCR 模型加载失败, 文字识别指令将无法执行: {e}")
                 return True
 
         except Exception as e:
@@ -279,7 +289,17 @@ class ScriptWorker(QObject):
             elif isinstance(command, SubtaskCommand):
                 self._execute_subtask_command(command)
             else:
-                command.execute()
+                start_time = time.time()
+                try:
+                    command.execute()
+                finally:
+                    if isinstance(command, INPUT_COMMANDS):
+                        capture_service.invalidate()  # 鼠标、键盘操作或脚本执行后屏幕可能变化
+                    if isinstance(command, ImageOcrCmd) and command.shared_pass:
+                        shared = command.shared_pass
+                        action = "复用同一帧的识别结果" if command.ocr_shared else "执行识别"
+                        self.log.emit(f"♻ 步骤 {current_step} (共用识别) {action}, 耗时 {time.time() - start_time:.3f} 秒, "
+                                      f"本组累计识别 {shared.runs} 次, 复用 {shared.reuses} 次")
 
             self.results_list.append(command.model_dump())
             print(f"[INFO] - 当前指令 <{command.name}> 执行结果: {self.results_list[-1]}") if _DEBUG else None
@@ -323,8 +343,11 @@ class ScriptWorker(QObject):
             self.log.emit(f"⚠ 指令: {command.name} 未激活, 跳过执行")
             return
         self.log.emit(f"\n🔗 开始执行子任务：{Path(command.subtask_file).name}")
-        for idx, subcommand in enumerate(command.subtask_steps, start=1):
-            self._execute_one_command(subcommand, is_top_level=False, current_step=idx)
+        try:
+            for idx, subcommand in enumerate(command.subtask_steps, start=1):
+                self._execute_one_command(subcommand, is_top_level=False, current_step=idx)
+        finally:
+            capture_service.invalidate()  # 子任务可以执行任意操作，执行后屏幕可能变化
 
     def _should_stop(self):
         """ 检查停止标志 """
@@ -336,6 +359,7 @@ class ScriptWorker(QObject):
 
         condition 条件格式为: results_list['<id>']['<field>'] <operator> <value>
         eg: "results_list['12345678']['status'] == 2"
+        列表字段可以继续按下标访问，eg: "results_list['12345678']['scores'][0] > 0.9"
         """
 
         def get_command_by_id(_cmd_id):
@@ -345,11 +369,18 @@ class ScriptWorker(QObject):
                     return result
             return None
 
-        def safe_get_field(_cmd_result, _field_name):
-            """安全地获取指令结果中的字段值"""
-            if not _cmd_result:
-                return None
-            return _cmd_result.get(_field_name)
+        def safe_get_field(_cmd_result, _field_path):
+            """安全地获取指令结果中的字段值，支持继续按下标访问列表，如 ['scores', '0']"""
+            value = _cmd_result
+            for _key in _field_path:
+                if isinstance(value, dict):
+                    value = value.get(_key)
+                elif isinstance(value, (list, tuple)) and _key.lstrip("-").isdigit() \
+                        and -len(value) <= int(_key) < len(value):
+                    value = value[int(_key)]
+                else:
+                    return None
+            return value
 
         try:
             # 从条件字符串解析出指令 id 和字段
@@ -361,16 +392,16 @@ class ScriptWorker(QObject):
             # 提取 id、字段、操作符和值
             left_expr, operator_symbol, right_value = parts
             cmd_id = left_expr.split("[")[1].strip("'").strip("']")
-            field_name = left_expr.split("]")[1].strip("['").strip("']")
+            field_path = [_key.strip("[").strip("'\"") for _key in left_expr.split("]")[1:] if _key]
 
             # 根据 id 获取指令结果
             cmd_result = get_command_by_id(cmd_id)
-            field_value = safe_get_field(cmd_result, field_name)
+            field_value = safe_get_field(cmd_result, field_path)
 
             # 将右值转换为合适的类型
             if right_value in {"True", "False"}:  # 布尔值
                 right_value = right_value == "True"
-            elif right_value.isdigit():  # 整数
+            elif right_value.lstrip("-").isdigit():  # 整数
                 right_value = int(right_value)
             elif "." in right_value:  # 浮点数
                 try:
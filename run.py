@@ -9,17 +9,7 @@
 # LOGO6 = "                               /____/                          | ___ / /_____/  "
 """
 import sys
-
-from PyQt5.QtCore import QFile, QObject, Qt
-from PyQt5.QtGui import QKeyEvent
-from PyQt5.QtWidgets import QApplication
-
-from ui.main_window import CocoPyRPA_v2
-from ui.widgets.CocoSettingWidget import config_manager
-
-from utils.QSSLoader import QSSLoader as QL
-
-import resources_rc
+import multiprocessing
 
 
 MAIN_THEME = {
@@ -47,6 +37,19 @@ def load_main_theme() -> str:
 
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()  # 打包后 OCR 服务的工作进程从这里启动
+    # OCR 服务的工作进程以 spawn 方式启动时会重新导入本模块，界面相关的模块只在这里导入
+    from PyQt5.QtCore import QFile, QObject, Qt
+    from PyQt5.QtGui import QKeyEvent
+    from PyQt5.QtWidgets import QApplication
+
+    from ui.main_window import CocoPyRPA_v2
+    from ui.widgets.CocoSettingWidget import config_manager
+
+    from utils.QSSLoader import QSSLoader as QL
+
+    import resources_rc
+
     app = QApplication(sys.argv)
     mainWindow = CocoPyRPA_v2()
     # ------------------------------------------------------------------
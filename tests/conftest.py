@@ -0,0 +1,7 @@
+"""
+测试配置：把项目根目录加入模块搜索路径，与 benchmarks 中的脚本一致
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
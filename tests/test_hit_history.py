@@ -0,0 +1,41 @@
+"""
+HitHistory 命中位置记录的回归测试
+
+    用法:
+        python -m pytest tests
+"""
+import os
+import time
+from pathlib import Path
+
+import utils.hit_history as hit_history_module
+from utils.hit_history import HitHistory, HIT_HISTORY_FILE
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+
+def test_default_file_in_app_root(tmp_path, monkeypatch):
+    # 默认记录文件位于程序根目录，与启动时的工作目录无关
+    monkeypatch.chdir(tmp_path)
+    assert os.path.isabs(HIT_HISTORY_FILE)
+    assert Path(HIT_HISTORY_FILE).parent == ROOT_DIR
+    assert HitHistory().storage_path == HIT_HISTORY_FILE
+
+
+def test_record_persisted(tmp_path):
+    path = str(tmp_path / "match_history.json")
+    history = HitHistory(path)
+    history.record("a.png", (1, 2, 3, 4))
+    assert not os.path.exists(path)  # 延迟写入，不在匹配过程中写文件
+    history.flush()
+    assert HitHistory(path).get("a.png") == (1, 2, 3, 4)
+
+
+def test_save_debounced(tmp_path, monkeypatch):
+    monkeypatch.setattr(hit_history_module, "SAVE_DELAY", 0.05)
+    path = str(tmp_path / "match_history.json")
+    history = HitHistory(path)
+    history.record("a.png", (1, 2, 3, 4))
+    history.record("a.png", (5, 6, 7, 8))
+    time.sleep(0.5)
+    assert HitHistory(path).get("a.png") == (5, 6, 7, 8)
@@ -0,0 +1,19 @@
+"""
+multiScaleMatch 多尺度匹配的回归测试
+
+    用法:
+        python -m pytest tests
+"""
+import cv2
+import numpy as np
+
+from utils.opencv_funcs import multiScaleMatch
+
+
+def test_skip_scale_below_one_pixel(tmp_path):
+    # 1x1、1x2 的模板缩小一半后不足 1 像素，应跳过该比例而不是在 cv2.resize 中报错
+    for shape in ((1, 1), (1, 2)):
+        path = str(tmp_path / f"tiny_{shape[0]}x{shape[1]}.png")
+        cv2.imwrite(path, np.full((*shape, 3), 255, np.uint8))
+        image = np.zeros((20, 20, 3), np.uint8)
+        assert multiScaleMatch(image, path, 0.8, scales=(0.5,)) == (None, -1.0, 0.5)
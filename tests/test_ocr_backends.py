@@ -0,0 +1,62 @@
+"""
+OCR 后端结果格式与模型延迟加载的回归测试
+
+    用法:
+        python -m pytest tests
+"""
+import numpy as np
+import pytest
+
+import utils.ocr_tools as ocr_tools
+from utils.ocr_tools import OCRTool, PaddleBackend
+from utils.ocr_service import ocr_service
+from utils.ocr_model_manager import OcrModelManager
+
+
+class StubPaddleOCR:
+    """按 PaddleOCR 2.x 的格式返回结果，记录方向分类器和识别器每次调用的输入"""
+
+    def __init__(self):
+        self.cls_calls, self.rec_calls = [], []
+
+    def text_classifier(self, img_list):
+        self.cls_calls.append(img_list)
+        return img_list, [("0", 0.99)] * len(img_list), 0.0
+
+    def text_recognizer(self, img_list):
+        self.rec_calls.append(img_list)
+        return [(f"text{int(crop[0, 0, 0])}", 0.9) for crop in img_list], 0.0
+
+
+def _paddle_backend(use_angle_cls: bool) -> PaddleBackend:
+    backend = PaddleBackend.__new__(PaddleBackend)  # 跳过模型加载
+    backend._ocr = StubPaddleOCR()
+    backend.use_angle_cls = use_angle_cls
+    return backend
+
+
+@pytest.mark.parametrize("use_angle_cls", [False, True])
+def test_paddle_recognize_one_batch(use_angle_cls):
+    backend = _paddle_backend(use_angle_cls)
+    crops = [np.full((8, 8, 3), 1, np.uint8), np.zeros((0, 8, 3), np.uint8), np.full((8, 8, 3), 3, np.uint8)]
+    assert backend.recognize(crops) == [("text1", 0.9), ("", 0.0), ("text3", 0.9)]
+    # 所有非空文本行一次送入识别器，而不是每个文本框调用一次
+    assert [len(batch) for batch in backend._ocr.rec_calls] == [2]
+    assert [len(batch) for batch in backend._ocr.cls_calls] == ([2] if use_angle_cls else [])
+
+
+def test_lazy_model_loaded_on_first_use(monkeypatch):
+    created = []
+    monkeypatch.setattr(ocr_tools, "create_ocr_backend",
+                        lambda *args: created.append(args) or PaddleBackend.__new__(PaddleBackend))
+    ocr = OCRTool(lazy=True)
+    assert not ocr.loaded and not created
+    assert ocr.ocr is ocr.ocr
+    assert ocr.loaded and len(created) == 1
+
+
+def test_manager_skips_local_model_when_served(monkeypatch):
+    monkeypatch.setattr(ocr_tools, "create_ocr_backend", lambda *args: PaddleBackend.__new__(PaddleBackend))
+    monkeypatch.setattr(ocr_service, "serves", lambda model_kwargs: True)
+    ocr = OcrModelManager().get()
+    assert not ocr.loaded
@@ -0,0 +1,53 @@
+"""
+find_matching_texts 各匹配模式的回归测试
+
+    用法:
+        python -m pytest tests
+"""
+import pytest
+
+from utils.ocr_tools import find_matching_texts, MATCH_MODES
+
+# 只有一个文本框的 OCR 识别结果（PaddleOCR 格式）
+BOX = [[10.0, 20.0], [110.0, 20.0], [110.0, 50.0], [10.0, 50.0]]
+RESULT = [[[BOX, ("LOGIN", 0.95)]]]
+
+
+@pytest.mark.parametrize("match_mode, text", [("完全匹配", "LOGIN"), ("部分匹配", "LOG"), ("模糊匹配", "L0GIN")])
+def test_match_modes(match_mode, text):
+    assert find_matching_texts(RESULT, text, match_mode=match_mode) == [("LOGIN", (10, 20, 110, 50))]
+
+
+def test_all_match_modes_covered():
+    assert set(MATCH_MODES) == {"完全匹配", "部分匹配", "模糊匹配"}
+
+
+@pytest.mark.parametrize("match_mode", MATCH_MODES)
+def test_no_match(match_mode):
+    assert find_matching_texts(RESULT, "退出", match_mode=match_mode) == []
+
+
+def test_regex_and_ignore_case():
+    assert find_matching_texts(RESULT, "^log", ignore_case=True, use_regex=True) == [("LOGIN", (10, 20, 110, 50))]
+    assert find_matching_texts(RESULT, "(", use_regex=True) == []
+
+
+def test_confidence_threshold():
+    assert find_matching_texts(RESULT, "LOGIN", confidence_threshold=0.99) == []
+
+
+def test_invalid_match_mode():
+    with pytest.raises(ValueError):
+        find_matching_texts(RESULT, "LOGIN", match_mode="无效模式")
+
+
+def test_fuzzy_ignore_case():
+    result = [[[BOX, ("BOX 8", 0.95)]]]
+    for ignore_case in (False, True):
+        assert find_matching_texts(result, "80X 8", "模糊匹配", ignore_case) == [("BOX 8", (10, 20, 110, 50))]
+    assert find_matching_texts(result, "80x8", "模糊匹配", ignore_case=True) == [("BOX 8", (10, 20, 110, 50))]
+
+
+@pytest.mark.parametrize("text", ["", "  "])
+def test_fuzzy_empty_text(text):
+    assert find_matching_texts(RESULT, text, match_mode="模糊匹配") == []
@@ -16,7 +16,7 @@
         - 支持新建、打开、保存任务文件（JSON 格式），具备撤销/重做机制，可对任务树结构进行回退或恢复。
         - 提供右键菜单支持的任务目录管理功能，包括新建、重命名、复制、粘贴、删除等操作。
         - 任务编辑采用拖拽方式，支持多种类型的指令节点（鼠标操作、键盘操作、图片识别、脚本执行、流程控制等），并通过属性表格动态展示和修改节点参数。
-        - 内置 OCR 引擎（PaddleOCR）、图像识别、屏幕截图、鼠标及键盘录制工具，增强了自动化任务的构建能力。
+        - 内置 OCR 引擎（PaddleOCR，可选 Tesseract）、图像识别、屏幕截图、鼠标及键盘录制工具，增强了自动化任务的构建能力。
         - 支持运行当前选中节点、从指定节点开始运行、运行全部指令等多种运行模式，并提供日志输出和节点高亮功能，便于调试。
         - 实现了系统托盘图标与菜单，允许最小化运行并提供快捷入口用于触发录制操作。
         - 提供条件逻辑构建器，方便用户为 if 判断节点编写复杂的判断表达式。
@@ -62,12 +62,17 @@ from .widgets.MouseRecord import MouseRecorder
 from .widgets.KeyboardRecord import KeyboardRecorder
 from .widgets.coco_toast.toast import ToastService
 
-from utils.ocr_tools import OCRTool
+from utils.ocr_tools import OCRTool, OCR_BACKENDS
+from utils.ocr_service import ocr_service
+from utils.ocr_model_manager import ocr_model_manager
 from utils.debug import print_func_time
 from utils.check_input import validate_input
 from utils.screen_capture import CaptureScreen
 from utils.QSSLoader import QSSLoader as QL
 from utils.stop_executor import stop_running_thread
+from utils.background_capture import background_capture
+from utils.capture_service import capture_service
+from utils.screen_source import create_screen_source
 from utils.theme_manager import ThemeManager
 
 from core.script_executor import executor
@@ -106,9 +111,13 @@ about_path = 'ui/static/about.html'
 DET_MODEL_DIR = './models/det/ch/ch_PP-OCRv4_det_infer'
 REC_MODEL_DIR = './models/rec/ch/ch_PP-OCRv4_rec_infer'
 CLS_MODEL_DIR = './models/cls/ch/ch_PP-OCRv4_cls_infer'
+# OCRTool 参数，主进程和 OCR 服务的工作进程使用相同的模型
+OCR_MODEL_KWARGS = dict(lang='ch', det_model_dir=DET_MODEL_DIR, rec_model_dir=REC_MODEL_DIR,
+                        cls_model_dir=CLS_MODEL_DIR, use_angle_cls=False)
 
 # 全局配置（用于保存config.ini文件配置）
 GLOBAL_CONFIG = {}
+_SCREEN_SOURCE_SPEC = ("mss", 0.0)  # 当前截图来源配置 (Source, SourceFPS)
 
 
 def update_global_config(self, new_config):
@@ -132,6 +141,49 @@ def update_global_config(self, new_config):
     else:
         self.setStyleSheet(QL.read_qss_file('resources/theme/default/main.css'))
 
+    apply_capture_config(new_config)
+    apply_ocr_config(new_config)
+
+
+def apply_capture_config(config):
+    """根据配置切换截图来源，启动或停止后台截图"""
+    global _SCREEN_SOURCE_SPEC
+    capture_config = config.get("Capture", {})
+    source_spec = (capture_config.get("Source", "mss"), float(capture_config.get("SourceFPS", 0)))
+    if source_spec != _SCREEN_SOURCE_SPEC:
+        try:
+            capture_service.set_source(create_screen_source(*source_spec))
+            _SCREEN_SOURCE_SPEC = source_spec
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] - 截图来源 ‘{source_spec[0]}’ 无效，继续使用 {capture_service.source.name}: {e}")
+    if capture_config.get("BackgroundCapture", False):
+        background_capture.start(fps=max(1, int(capture_config.get("CaptureFPS", 10))))
+    else:
+        background_capture.stop()
+
+
+def apply_ocr_config(config):
+    """
+    根据配置设置 OCR 模型，启动或停止 OCR 工作进程池，Workers 为 0 时在执行器线程中识别；
+    工作进程池启动后模型由各工作进程加载，主进程不再加载和预热，否则在后台加载、预热
+    """
+    ocr_config = config.get("ImageOcr", {})
+    workers = int(ocr_config.get("Workers", 0))
+    backend = ocr_config.get("ModelName", "PaddleOCR")
+    if backend in OCR_BACKENDS:
+        ocr_model_manager.configure(dict(OCR_MODEL_KWARGS, backend=backend))
+    else:
+        print(f"[ERROR] - 未知的 OCR 模型 '{backend}'，应为 {OCR_BACKENDS} 之一")
+    if workers > 0 and backend in OCR_BACKENDS:
+        try:
+            ocr_service.start(workers, ocr_model_manager.default_kwargs)
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] - OCR 服务启动失败，在执行器线程中识别: {e}")
+    else:
+        ocr_service.stop()
+    if backend in OCR_BACKENDS:
+        ocr_model_manager.load_async()  # 在工作进程池启动之后，据此决定主进程是否加载模型
+
 
 class CocoPyRPA_v2(QMainWindow, Ui_MainWindow):
     """
@@ -152,6 +204,9 @@ class CocoPyRPA_v2(QMainWindow, Ui_MainWindow):
         # 加载配置管理器
         self.config_manager = config_manager
         GLOBAL_CONFIG.update(self.config_manager.config)  # 读取配置文件,初始化全局配置变量
+        apply_capture_config(GLOBAL_CONFIG)  # 按配置启动后台截图
+        apply_ocr_config(GLOBAL_CONFIG)  # 按配置启动 OCR 工作进程池
+        QApplication.instance().aboutToQuit.connect(ocr_service.stop)
         print(f"[INFO] - (CocoPyRPA_v2) - 当前配置为：{GLOBAL_CONFIG}") if _DEBUG else None
         self.config_manager.config_changed.connect(
             lambda new_config: update_global_config(self, new_config))  # 连接配置改变信号
@@ -1657,14 +1712,12 @@ class LoadOcrModel(QThread):
 
     @print_func_time(debug=_DEBUG)
     def run(self):
-        if self.model == "PaddleOCR":
-            ocr = OCRTool(
-                lang='ch',
-                det_model_dir=DET_MODEL_DIR,
-                rec_model_dir=REC_MODEL_DIR,
-                cls_model_dir=CLS_MODEL_DIR,
-                use_angle_cls=False
-            )
-            self.ocr_model_signal.emit(ocr)
-        else:
+        if self.model not in OCR_BACKENDS:
             self.ocr_model_signal.emit(None)
+            return
+        try:
+            # 等待模型管理器在后台完成加载和预热，参见 apply_ocr_config
+            ocr = ocr_model_manager.get(dict(OCR_MODEL_KWARGS, backend=self.model), timeout=None)
+        except Exception:  # 如缺少模型文件、未安装 pytesseract，错误已由模型管理器输出
+            ocr = None
+        self.ocr_model_signal.emit(ocr)
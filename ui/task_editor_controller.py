@@ -20,6 +20,7 @@
         - 主题样式适配：根据配置切换不同 UI 主题样式（默认、深色、浅色、护眼模式）。
 """
 
+import ast
 import copy
 import os
 import json
@@ -187,10 +188,34 @@ class TaskEditorCore(QWidget):
         "text_str": "文本字符串",
 
         "template_img": "模板图片",
+        "threshold": "匹配度阈值",
+        "use_pyramid": "金字塔匹配",
+        "pyramid_scale": "金字塔缩放比例",
+        "image_mode": "图片匹配模式",
+        "search_region": "搜索区域",
+        "monitor": "目标显示器",
+        "adaptive_search": "自适应搜索",
+        "adaptive_padding": "自适应搜索扩展",
+        "multi_scale": "多尺度匹配",
+        "backend": "匹配后端",
+        "template_imgs": "模板图片列表",
+        "require_all": "要求全部匹配",
+        "max_results": "最大匹配数量",
+        "sort_by": "排序方式",
+        "overlap_threshold": "重叠抑制阈值",
+        "poll_interval": "轮询间隔",
+        "points": "采样点",
+        "region": "采样区域",
+        "target_color": "目标颜色",
+        "tolerance": "颜色容差",
         "text": "匹配文字",
         "match_mode": "匹配模式",
+        "fuzzy_distance": "模糊匹配距离",
         "is_ignore_case": "忽略大小写",
         "use_regex": "使用正则",
+        "ocr_region": "识别区域",
+        "region_anchor": "识别区域锚点",
+        "cache_layout": "缓存文本框",
 
         "dos_cmd": "DOS 命令",
         "working_dir": "工作目录",
@@ -300,6 +325,11 @@ class TaskEditorCore(QWidget):
             'image': {
                 'imageMatch': ':/icons/img-match',
                 'imageClick': ':/icons/img-click',
+                'imageMultiMatch': ':/icons/img-match',
+                'imageFindAll': ':/icons/img-match',
+                'imageWait': ':/icons/img-match',
+                'pixelColor': ':/icons/img-match',
+                'waitPixelColor': ':/icons/img-match',
                 'imageOcr': ':/icons/img-ocr',
                 'imageOcrClick': ':/icons/img-ocr-click',
             },
@@ -999,6 +1029,12 @@ class TaskEditorCore(QWidget):
             elif isinstance(original_value, list) and "+" in new_value:
                 new_value = new_value.split("+")
                 pass
+            elif isinstance(original_value, list):  # 如搜索区域 [left, top, width, height]
+                try:
+                    new_value = list(ast.literal_eval(new_value)) if new_value.strip() else []
+                except (ValueError, SyntaxError, TypeError):
+                    print(f"(onAttributeChanged) - 无法解析列表值：{new_value}")
+                    return
 
         print(f"(onAttributeChanged) - 转换后的新值为：{new_value}") if _DEBUG else None
 
@@ -1555,13 +1591,44 @@ class TaskEditorCore(QWidget):
             # 文字识别匹配模式 match_mode 使用 QComboBox
             elif isinstance(value, str) and key == "match_mode":
                 combobox = QComboBox()  # 创建一个 QComboBox
-                combobox.addItems(["完全匹配", "部分匹配"])  # 添加选项
+                combobox.addItems(["完全匹配", "部分匹配", "模糊匹配"])  # 添加选项
+                combobox.setCurrentText(value)  # 设置初始选中项
+                self.attr_edit_table.setCellWidget(row, 1, combobox)
+                # 绑定匹配模式值改变信号
+                combobox.currentTextChanged.connect(
+                    lambda _value, _key=key: self.update_match_mode_attribute(item_data, _key, _value, item))
+
+            # 图片匹配模式 image_mode 使用 QComboBox
+            elif isinstance(value, str) and key == "image_mode":
+                combobox = QComboBox()  # 创建一个 QComboBox
+                combobox.addItems(["color", "gray", "edge"])  # 彩色、灰度、边缘图
                 combobox.setCurrentText(value)  # 设置初始选中项
                 self.attr_edit_table.setCellWidget(row, 1, combobox)
                 # 绑定匹配模式值改变信号
                 combobox.currentTextChanged.connect(
                     lambda _value, _key=key: self.update_match_mode_attribute(item_data, _key, _value, item))
 
+            # 图片匹配后端 backend 使用 QComboBox
+            elif isinstance(value, str) and key == "backend":
+                combobox = QComboBox()  # 创建一个 QComboBox
+                combobox.addItems(["template", "orb", "akaze"])  # 模板匹配、特征点匹配
+                combobox.setCurrentText(value)  # 设置初始选中项
+                self.attr_edit_table.setCellWidget(row, 1, combobox)
+                # 绑定匹配后端值改变信号
+                combobox.currentTextChanged.connect(
+                    lambda _value, _key=key: self.update_match_mode_attribute(item_data, _key, _value, item))
+
+            # 目标显示器 monitor 使用 QComboBox（可编辑，可输入更大的显示器序号）
+            elif isinstance(value, str) and key == "monitor":
+                combobox = QComboBox()  # 创建一个 QComboBox
+                combobox.setEditable(True)
+                combobox.addItems(["all", "cursor", "last_hit", "1", "2", "3"])  # 所有、鼠标所在、上次命中所在、序号
+                combobox.setCurrentText(value)  # 设置初始选中项
+                self.attr_edit_table.setCellWidget(row, 1, combobox)
+                # 绑定目标显示器值改变信号
+                combobox.currentTextChanged.connect(
+                    lambda _value, _key=key: self.update_match_mode_attribute(item_data, _key, _value, item))
+
             # loop_commands、then_commands、else_commands 显示指令步骤
             elif isinstance(value, list) and (key == "loop_commands" or
                                               key == "then_commands" or key == "else_commands"):
@@ -1753,7 +1820,7 @@ class TaskEditorCore(QWidget):
 
     def update_match_mode_attribute(self, item_data, key, value, item):
         """
-        更新文字识别匹配模式 match_mode 的属性值，当 QComboBox 值改变时触发
+        更新匹配模式 match_mode、image_mode、backend、monitor 的属性值，当 QComboBox 值改变时触发
         """
         params = item_data.get('params', {})  # 获取参数字典
         params[key] = value
@@ -5,7 +5,7 @@ import json
 from PyQt5 import QtCore
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem,
-    QComboBox, QLineEdit, QCheckBox, QDoubleSpinBox, QMessageBox, QHeaderView
+    QComboBox, QLineEdit, QCheckBox, QSpinBox, QDoubleSpinBox, QMessageBox, QHeaderView
 )
 from PyQt5.QtCore import Qt, QEvent, QObject, pyqtSignal
 from PyQt5.QtWidgets import QPushButton
@@ -29,10 +29,20 @@ class ConfigManager(QObject):
         },
         "ImageMatch": {
             "Threshold": 0.8,
+            "DebugDump": False,
+        },
+        "Capture": {
+            "FrameCacheTTL": 50,
+            "BackgroundCapture": False,
+            "CaptureFPS": 10,
+            "Source": "mss",
+            "SourceFPS": 0,
         },
         "ImageOcr": {
             "Threshold": 0.8,
             "ModelName": "PaddleOCR",
+            "SharedPass": True,
+            "Workers": 0,
         },
     }
 
@@ -241,7 +251,7 @@ class SettingsWindow(QDialog):
         elif key == "ModelName":
             # OCR 模型名称采用下拉框
             widget = QComboBox()
-            widget.addItems(["PaddleOCR"])
+            widget.addItems(["PaddleOCR", "Tesseract"])  # 与 ocr_tools.OCR_BACKENDS 一致
             widget.setCurrentText(value)
             self._configure_combobox(widget)
 
@@ -251,7 +261,15 @@ class SettingsWindow(QDialog):
             widget.setChecked(value)
             # 连接信号
             widget.stateChanged.connect(self.set_stays_on_top)
-        elif isinstance(value, (int, float)):
+        elif isinstance(value, bool):
+            widget = QCheckBox()
+            widget.setChecked(value)
+        elif isinstance(value, int):
+            widget = QSpinBox()
+            widget.setMinimum(0)
+            widget.setMaximum(10000)
+            widget.setValue(value)
+        elif isinstance(value, float):
             widget = QDoubleSpinBox()
             widget.setMinimum(0.00)  # 设置最小值
             widget.setMaximum(1.00)  # 设置最大值
@@ -284,8 +302,17 @@ class SettingsWindow(QDialog):
             "CloseMode": "关闭模式(CloseMode)",
             "ImageMatch": "图像匹配(ImageMatch)",
             "Threshold": "阈值(Threshold)",
+            "DebugDump": "保存调试截图(DebugDump)",
+            "Capture": "截图(Capture)",
+            "FrameCacheTTL": "帧缓存时长ms(FrameCacheTTL)",
+            "BackgroundCapture": "后台截图(BackgroundCapture)",
+            "CaptureFPS": "后台截图帧率(CaptureFPS)",
+            "Source": "截图来源(Source)",
+            "SourceFPS": "回放帧率(SourceFPS)",
             "ImageOcr": "OCR配置(ImageOcr)",
-            "ModelName": "模型名称(ModelName)"
+            "ModelName": "模型名称(ModelName)",
+            "SharedPass": "连续识别共用结果(SharedPass)",
+            "Workers": "OCR工作进程数(Workers)"
         }
         return translations.get(key, f"{key} ({key})")
 
@@ -313,6 +340,9 @@ class SettingsWindow(QDialog):
                     d[keys[-1]] = "debug" if widget.isChecked() else "normal"
                 else:
                     d[keys[-1]] = widget.isChecked()
+            # 处理整数输入框
+            elif isinstance(widget, QSpinBox):
+                d[keys[-1]] = widget.value()
             # 处理小数输入框
             elif isinstance(widget, QDoubleSpinBox):
                 # 保存为两位浮点数
@@ -26,15 +26,13 @@ from PyQt5.QtWidgets import (QApplication, QVBoxLayout, QWidget,
 from core.commands.image_commands import *
 from core.commands.keyboard_commands import *
 from core.commands.mouse_commands import *
-from core.commands.script_commands import ExecuteDosCmd
+from core.commands.script_commands import register_sandbox_globals
 from core.my_apis import CUSTOM_APIS
 from core.safe_globals import safe_globals_manager  # 安全全局变量管理器
 
 from ui.widgets.CocoTitleBar import TitleBar, set_button_color, set_button_hover_color
 from ui.widgets.code_editor_ui import Ui_CodeEditorUI
 
-from utils.debug import print_command
-from utils.opencv_funcs import drawRectangle
 
 BUTTON_STYLE = """
 QPushButton {
@@ -585,63 +583,8 @@ class CodeExecutorThread(QThread):
         self.code = code
         self.stdout = stdout
 
-        # 注册自动化指令类
-        self._register_command_classes()
-        # 注册自定义类
-        self._register_custom_classes()
-        # 注册函数
-        self._register_functions()
-
-    @staticmethod
-    def _register_command_classes():
-        """ 注册所有可用的自动化指令类 """
-        command_classes = {
-            # 鼠标操作
-            "MousePressReleaseCmd": MousePressReleaseCmd,
-            "MouseClickCmd": MouseClickCmd,
-            "MouseMoveToCmd": MouseMoveToCmd,
-            "MouseMoveRelCmd": MouseMoveRelCmd,
-            "MouseDragToCmd": MouseDragToCmd,
-            "MouseDragRelCmd": MouseDragRelCmd,
-            "MouseScrollCmd": MouseScrollCmd,
-            "MouseScrollHCmd": MouseScrollHCmd,
-            # 键盘操作
-            "KeyPressCmd": KeyPressCmd,
-            "KeyReleaseCmd": KeyReleaseCmd,
-            "KeyTapCmd": KeyTapCmd,
-            "KeyTypeTextCmd": KeyTypeTextCmd,
-            # 图像操作
-            "ImageMatchCmd": ImageMatchCmd,
-            "ImageClickCmd": ImageClickCmd,
-            "ImageOcrCmd": ImageOcrCmd,
-            "ImageOcrClickCmd": ImageOcrClickCmd,
-            # 执行Dos命令
-            "ExecuteDosCmd": ExecuteDosCmd,
-        }
-        for name, cmd_class in command_classes.items():
-            safe_globals_manager.register_command(name, cmd_class)
-
-    @staticmethod
-    def _register_custom_classes():
-        """ 注册自定义类 """
-        custom_classes = {
-            # 图片识别工具类
-            "OCRTool": OCRTool
-        }
-        for name, custom_class in custom_classes.items():
-            safe_globals_manager.register_custom_class(name, custom_class)
-
-    @staticmethod
-    def _register_functions():
-        """ 注册函数 """
-        custom_functions = {
-            # debug 函数
-            "print_func_time": print_func_time,
-            "print_command": print_command,
-            "drawRectangle": drawRectangle
-        }
-        for name, func in custom_functions.items():
-            safe_globals_manager.register_custom_function(name, func)
+        # 注册沙箱中可用的指令类、自定义类和函数（与 <执行 Python 代码> 指令共用）
+        register_sandbox_globals()
 
     def run(self, **kwargs):
         """运行代码"""
@@ -13,6 +13,15 @@ from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QLineEdit, QPushButton, QMessageBox
 )
 
+# 执行后才产生的结果字段（不在指令参数中），按指令动作补充到属性列表
+RESULT_FIELDS = {
+    "imageMultiMatch": ["matched_count", "best_index"],
+    "imageFindAll": ["match_count"],
+    "imageWait": ["found", "waited_time"],
+    "pixelColor": ["matched", "max_diff"],
+    "waitPixelColor": ["found", "matched", "max_diff", "waited_time"],
+}
+
 
 class ConditionBuilder(QDialog):
     """条件构建器"""
@@ -81,6 +90,8 @@ class ConditionBuilder(QDialog):
         self.field_selector.addItem("选择属性")
         for field, value in fields.items():
             self.field_selector.addItem(field)
+        for field in RESULT_FIELDS.get(command.get("action"), []):
+            self.field_selector.addItem(field)
 
     def update_operators_and_values(self):
         """更新判断符和结果值输入方式"""
@@ -14,6 +14,7 @@
 """
 
 import time
+import threading
 from collections import OrderedDict
 
 import keyboard
@@ -29,6 +30,8 @@ from PyQt5.QtWidgets import QApplication, QMainWindow, QLabel, QTreeWidget, QTre
 
 from core.register import registry
 
+from utils.capture_service import capture_service
+
 from utils.QSSLoader import QSSLoader
 
 import resources_rc
@@ -38,6 +41,8 @@ _DEBUG = True
 # 初始配置变量
 LABEL_WIDTH = 210
 LABEL_HEIGHT = 200
+# 鼠标移动时标签的最小刷新间隔（秒），避免每个移动事件都读取像素颜色
+MOVE_UPDATE_INTERVAL = 0.05
 LABEL_STYLE = """
 QLabel { 
     border-width: 3px;
@@ -125,9 +130,17 @@ class MouseListenerThread(QThread):
         self.is_top_left = True  # 标记标签是否在左上角
         self.listener = None  # 初始化鼠标监听器
         self.running = True  # 标记线程是否运行
+        self.last_move_update = 0.0  # 上次因鼠标移动刷新标签的时间
+        self.pending_move = None  # 因限流而未刷新的鼠标位置
+        self._flush_thread = None  # 限流后补刷最后位置的线程，整个录制期间只有一个
+        self._move_throttled = threading.Event()  # 有因限流而未刷新的鼠标位置
+        self._flush_stop = threading.Event()  # 通知补刷线程退出
 
     def run(self):
         """ 启动鼠标监听 """
+        self._flush_stop.clear()
+        self._flush_thread = threading.Thread(target=self._flush_loop, name="MouseMoveFlush", daemon=True)
+        self._flush_thread.start()
         self.listener = mouse.Listener(
             on_move=self.on_move,
             on_click=self.on_click,
@@ -139,9 +152,26 @@ class MouseListenerThread(QThread):
     def stop(self):
         """ 停止鼠标监听 """
         self.running = False
+        self._flush_stop.set()
+        self._move_throttled.set()  # 唤醒等待中的补刷线程
+        if self._flush_thread and self._flush_thread is not threading.current_thread():
+            self._flush_thread.join()
         if self.listener:
             self.listener.stop()
 
+    def _flush_loop(self):
+        """
+        补刷线程：鼠标在限流间隔内停下时不会再有移动事件，由该线程在 MOVE_UPDATE_INTERVAL 后刷新最后的位置。
+        pynput 的监听线程没有 Qt 事件循环，不能使用 QTimer；整个录制期间复用同一个线程，
+        读取像素颜色时复用该线程的截图句柄，不会每个限流间隔创建一次
+        """
+        while not self._flush_stop.is_set():
+            self._move_throttled.wait()
+            self._move_throttled.clear()
+            if self._flush_stop.wait(MOVE_UPDATE_INTERVAL):
+                break
+            self.flush_pending_move()
+
     @normalize_coordinates_decorator
     def on_move(self, x, y):
         """
@@ -150,8 +180,23 @@ class MouseListenerThread(QThread):
         :param y: 纵坐标
         """
         self.move_label(x, y)
+        current_time = time.perf_counter()
+        if current_time - self.last_move_update < MOVE_UPDATE_INTERVAL:
+            self.pending_move = (x, y)  # 限流，留到下一次刷新、补刷线程或按下 Enter 时再更新
+            self._move_throttled.set()
+            return
+        self.last_move_update = current_time
+        self.pending_move = None
         self.updateLabel('移动', (x, y))
 
+    def flush_pending_move(self):
+        """ 立即刷新因限流而未显示的鼠标位置，保证录制的是最新位置 """
+        pos = self.pending_move
+        if pos is not None:
+            self.pending_move = None
+            self.last_move_update = time.perf_counter()
+            self.updateLabel('移动', pos)
+
     def on_click(self, x, y, button, pressed):
         """
         鼠标点击事件处理
@@ -218,7 +263,7 @@ class MouseListenerThread(QThread):
         :param scroll: 滚轮方向
         :param duration: 拖动间隔
         """
-        color = pyautogui.screenshot().getpixel(pos)
+        color = capture_service.pixel(pos)  # 只截取鼠标所在的 1x1 像素
         # 根据不同的操作类型，更新标签的显示信息
         if action_type == '移动':
             text = f"操作类型: 移动\n" \
@@ -307,6 +352,7 @@ class KeyboardListenerThread(QThread):
         self.label = label  # 标签控件
         self.last_enter_time = 0  # 记录上次按下 enter 的时间
         self.cmd_list = []  # 存储指令列表
+        self.mouse_thread = None  # 鼠标监听线程，读取标签前先刷新其未显示的鼠标位置
 
     def run(self):
         """ 键盘监听线程的主循环 """
@@ -335,6 +381,8 @@ class KeyboardListenerThread(QThread):
         # 检查两次 Enter 键按下的时间间隔是否大于0.5秒
         if current_time - self.last_enter_time > 0.5:
             self.last_enter_time = current_time
+            if self.mouse_thread:
+                self.mouse_thread.flush_pending_move()
             # 打印 label 的内容
             label_text = self.label.text()
             if label_text:
@@ -480,6 +528,7 @@ class MouseRecorder(QMainWindow):
         # 初始化鼠标和键盘监听线程
         self.mouse_thread = MouseListenerThread(self.label)
         self.keyboard_thread = KeyboardListenerThread(self.label)
+        self.keyboard_thread.mouse_thread = self.mouse_thread
 
         # 绑定信号
         self.keyboard_thread.create_cmd_signal.connect(self.add_command)
@@ -0,0 +1,209 @@
+"""
+@author: 54Coconi
+@date: 2026-10-16
+@version: 1.0.0
+@path: utils/background_capture.py
+@software: PyCharm 2023.1.2
+@officialWebsite: https://github.com/54Coconi
+@description:
+    后台连续截图模块
+
+    可选的后台截图线程，按设定的帧率持续截图：
+        - 最近若干帧保存在环形缓冲区中，最新一帧同时写入截图服务的帧缓存，只读指令可直接复用
+        - 每帧把画面划分为固定大小的分块，用 numpy 向量化比较相邻两帧的采样像素，得到每个分块的变化标记，
+          并记录每个分块最近一次变化的时间
+        - 指令可以获取最新一帧，或查询 “区域 R 自时刻 t 以来是否变化”，无需在执行路径上阻塞截图
+"""
+import time
+import threading
+from collections import deque
+from typing import Optional, Tuple
+
+import numpy as np
+
+from utils.capture_service import capture_service, Frame
+from utils.screenshot_tool import intersect_region
+
+_DEBUG = False
+
+# 默认帧率
+CAPTURE_FPS = 10
+# 环形缓冲区保存的帧数
+BUFFER_SIZE = 8
+# 变化检测的分块边长（像素）
+TILE_SIZE = 32
+# 分块内的采样步长，TILE_SIZE 需为其整数倍
+SAMPLE_STEP = 4
+# 采样像素任一通道的差值超过该值时，视为所在分块发生变化
+CHANGE_TOLERANCE = 8
+
+
+class BackgroundCapture:
+    """
+    后台连续截图
+
+    Attributes:
+        fps: (float) 截图帧率
+        region: (tuple|None) 截图区域 (left, top, width, height)，为 None 时截取所有显示器
+    """
+
+    def __init__(self, tile_size: int = TILE_SIZE, sample_step: int = SAMPLE_STEP,
+                 tolerance: int = CHANGE_TOLERANCE):
+        if tile_size % sample_step:
+            raise ValueError(f"分块边长 {tile_size} 需为采样步长 {sample_step} 的整数倍")
+        self.tile_size = tile_size
+        self.sample_step = sample_step
+        self.tolerance = tolerance
+        self.fps = CAPTURE_FPS
+        self.region: Optional[Tuple[int, int, int, int]] = None
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._frames: deque[tuple[Frame, np.ndarray]] = deque(maxlen=BUFFER_SIZE)  # (帧, 分块变化标记)
+        self._sample: Optional[np.ndarray] = None  # 上一帧的采样像素
+        self._changed_at: Optional[np.ndarray] = None  # 每个分块最近一次变化的时间
+        # 统计
+        self._captured = 0
+        self._detect_time = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, fps: float = CAPTURE_FPS, region: Optional[Tuple[int, int, int, int]] = None,
+              buffer_size: int = BUFFER_SIZE) -> None:
+        """
+        启动后台截图线程，参数与当前运行的线程不同时会先停止再重新启动
+        :param fps: 截图帧率
+        :param region: 截图区域 (left, top, width, height)，为 None 时截取所有显示器
+        :param buffer_size: 环形缓冲区保存的帧数
+        """
+        if fps <= 0:
+            raise ValueError(f"帧率必须大于 0，当前为 {fps}")
+        region = tuple(region) if region else None
+        if self.running:
+            if (fps, region, buffer_size) == (self.fps, self.region, self._frames.maxlen):
+                return
+            self.stop()
+        self.fps, self.region = fps, region
+        with self._lock:
+            self._frames = deque(maxlen=max(1, buffer_size))
+            self._sample, self._changed_at = None, None
+            self._captured, self._detect_time = 0, 0.0
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="BackgroundCapture", daemon=True)
+        self._thread.start()
+        print(f"[INFO] - (BackgroundCapture) 后台截图已启动, 帧率 {fps}, 区域 {region or '全屏'}")
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """停止后台截图线程"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout)
+        self._thread = None
+        print("[INFO] - (BackgroundCapture) 后台截图已停止")
+
+    def _run(self) -> None:
+        interval = 1.0 / self.fps
+        while not self._stop_event.is_set():
+            start = time.perf_counter()
+            try:
+                generation = capture_service.generation
+                frame = capture_service.grab(self.region)
+                capture_service.publish(frame, generation)  # 同时设为只读
+                self._push(frame)
+            except Exception as e:  # 如锁屏、显示器断开，稍后重试
+                print(f"[WARN] - (BackgroundCapture) 截图失败: {e}")
+                self._stop_event.wait(1.0)
+                continue
+            self._stop_event.wait(max(0.0, interval - (time.perf_counter() - start)))
+
+    def _sample_tiles(self, image: np.ndarray) -> np.ndarray:
+        """按采样步长取像素，并补齐为整数个分块，返回形状为 (行块数 * n, 列块数 * n, 3) 的 int16 数组"""
+        sample = image[::self.sample_step, ::self.sample_step, :3]
+        n = self.tile_size // self.sample_step  # 每个分块的采样边长
+        rows, cols = -(-sample.shape[0] // n), -(-sample.shape[1] // n)
+        padded = np.zeros((rows * n, cols * n, 3), dtype=np.int16)
+        padded[:sample.shape[0], :sample.shape[1]] = sample
+        return padded
+
+    def _push(self, frame: Frame) -> None:
+        """计算分块变化标记并写入环形缓冲区"""
+        start = time.perf_counter()
+        sample = self._sample_tiles(frame.image)
+        n = self.tile_size // self.sample_step
+        rows, cols = sample.shape[0] // n, sample.shape[1] // n
+        with self._lock:
+            if self._sample is None or self._sample.shape != sample.shape:
+                # 首帧或分辨率变化，视为全部分块都发生了变化
+                changed = np.ones((rows, cols), dtype=bool)
+                self._changed_at = np.full((rows, cols), frame.timestamp)
+            else:
+                diff = np.abs(sample - self._sample).reshape(rows, n, cols, n, 3).max(axis=(1, 3, 4))
+                changed = diff > self.tolerance
+                self._changed_at[changed] = frame.timestamp
+            self._sample = sample
+            self._frames.append((frame, changed))
+            self._captured += 1
+            self._detect_time += time.perf_counter() - start
+
+    def latest(self) -> Optional[Frame]:
+        """获取最新一帧，尚未截图时返回 None"""
+        with self._lock:
+            return self._frames[-1][0] if self._frames else None
+
+    def frames(self) -> list[tuple[Frame, np.ndarray]]:
+        """获取环形缓冲区中的所有帧及其分块变化标记（由旧到新）"""
+        with self._lock:
+            return list(self._frames)
+
+    def covers(self, region: Optional[Tuple[int, int, int, int]] = None) -> Optional[Tuple[int, int, int, int]]:
+        """
+        判断后台截图是否完整覆盖指定区域
+        :param region: 全局屏幕坐标 (left, top, width, height)，为 None 时表示所有显示器
+        :return: 覆盖时返回区域本身（region 为 None 时返回所有显示器的区域），否则返回 None
+        """
+        frame = self.latest()
+        if frame is None or not self.running:
+            return None
+        if region is None:
+            return frame.region if self.region is None else None
+        region = tuple(int(v) for v in region)
+        return region if intersect_region(frame.region, region) == region else None
+
+    def changed_since(self, region: Optional[Tuple[int, int, int, int]], since: float) -> bool:
+        """
+        区域自指定时刻以来是否发生变化（按分块判断）
+        :param region: 全局屏幕坐标 (left, top, width, height)，为 None 时表示后台截图的整个区域
+        :param since: time.perf_counter() 时刻
+        :return: 区域内任一分块在 since 之后发生变化时返回 True；区域不在后台截图范围内时无法判断，同样返回 True
+        """
+        with self._lock:
+            if not self._frames:
+                return True
+            frame = self._frames[-1][0]
+            changed_at = self._changed_at
+        area = intersect_region(frame.region, tuple(int(v) for v in region)) if region else frame.region
+        if area is None:
+            return True
+        x, y = area[0] - frame.left, area[1] - frame.top
+        t = self.tile_size
+        tiles = changed_at[y // t:-(-(y + area[3]) // t), x // t:-(-(x + area[2]) // t)]
+        return bool((tiles > since).any())
+
+    def stats(self) -> dict:
+        """后台截图统计"""
+        with self._lock:
+            return {
+                "running": self.running,
+                "fps": self.fps,
+                "captured": self._captured,
+                "buffered": len(self._frames),
+                "detect_avg_ms": round(self._detect_time / self._captured * 1000, 3) if self._captured else 0.0,
+            }
+
+
+# 全局后台截图实例
+background_capture = BackgroundCapture()
@@ -0,0 +1,286 @@
+"""
+@author: 54Coconi
+@date: 2026-10-16
+@version: 1.0.0
+@path: utils/capture_service.py
+@software: PyCharm 2023.1.2
+@officialWebsite: https://github.com/54Coconi
+@description:
+    屏幕截图服务模块
+
+    常驻的截图服务，替代每条指令各自创建、销毁 ScreenshotTool（mss 句柄）的做法：
+        - 从可替换的截图来源取图（默认实时桌面，每个线程持有一个 mss 句柄；也可回放图片序列或视频），参见 screen_source
+        - grab(region) 返回 Frame，其 image 为截图原始 BGRA 缓冲区的 numpy 视图（零拷贝）
+        - pixel / region_color 只截取 1x1 或很小的区域读取颜色，供录制器、指令和 Python 沙箱使用
+        - 短时帧缓存：只读指令在 max_age 内可复用最近一帧截图（裁剪视图），鼠标、键盘操作后由执行器使缓存失效
+        - 统计截图次数和耗时，供性能分析使用
+        - 按显示器序号、鼠标所在或上次命中所在的显示器获取截图区域，多显示器时只截取一个显示器
+"""
+import time
+import threading
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from utils.screenshot_tool import intersect_region, monitor_at, monitor_key
+from utils.screen_source import ScreenSource, MssSource
+
+_DEBUG = False
+
+# 帧缓存默认有效期（毫秒）
+FRAME_CACHE_TTL = 50
+
+# 目标显示器：所有显示器、鼠标所在的显示器、上次命中所在的显示器，或显示器序号 '1'、'2'...（与 mss 一致）
+MONITOR_ALL = "all"
+MONITOR_CURSOR = "cursor"
+MONITOR_LAST_HIT = "last_hit"
+
+
+@dataclass
+class Frame:
+    """
+    一帧截图
+
+    Attributes:
+        image: (np.ndarray) 形状为 (height, width, 4) 的 BGRA 数组，可能与截图来源共享内存
+        left: (int) 截图左上角的全局屏幕 x 坐标
+        top: (int) 截图左上角的全局屏幕 y 坐标
+        timestamp: (float) 截图完成时的 time.perf_counter()
+    """
+    image: np.ndarray
+    left: int
+    top: int
+    timestamp: float
+
+    @property
+    def width(self) -> int:
+        return self.image.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.image.shape[0]
+
+    @property
+    def region(self) -> Tuple[int, int, int, int]:
+        """截图区域 (left, top, width, height)"""
+        return self.left, self.top, self.width, self.height
+
+    def crop(self, region: Tuple[int, int, int, int]) -> "Frame":
+        """
+        按全局屏幕坐标裁剪（零拷贝视图），区域需完全位于本帧内
+        :param region: (left, top, width, height)
+        """
+        x, y = region[0] - self.left, region[1] - self.top
+        return Frame(self.image[y:y + region[3], x:x + region[2]], region[0], region[1], self.timestamp)
+
+    def rgb(self) -> np.ndarray:
+        """转换为 RGB 数组（拷贝），供 OCR 等需要 RGB 输入的场景使用"""
+        return cv2.cvtColor(self.image, cv2.COLOR_BGRA2RGB)
+
+
+class CaptureService:
+    """
+    屏幕截图服务
+
+    调用方传入 max_age 时会复用缓存中足够新、且完整覆盖所需区域的最近一帧；缓存的帧被多个指令共享，因此设为只读
+    """
+
+    def __init__(self, source: Optional[ScreenSource] = None):
+        self._source = source
+        self._lock = threading.Lock()
+        # 帧缓存
+        self._cached: Optional[Frame] = None
+        self._generation = 0  # 每次失效加一，用于丢弃失效前开始的截图
+        # 截图耗时统计
+        self._grabs = 0
+        self._total_time = 0.0
+        self._max_time = 0.0
+        self._last_time = 0.0
+        self._cache_hits = 0
+
+    @property
+    def source(self) -> ScreenSource:
+        """当前的截图来源，未设置时使用实时桌面"""
+        if self._source is None:
+            with self._lock:
+                if self._source is None:
+                    self._source = MssSource()
+        return self._source
+
+    def set_source(self, source: ScreenSource) -> None:
+        """
+        替换截图来源，旧来源会被释放，帧缓存失效
+        :param source: 新的截图来源
+        """
+        with self._lock:
+            old, self._source = self._source, source
+            self._cached = None
+            self._generation += 1
+        if old is not None and old is not source:
+            old.close()
+        print(f"[INFO] - (CaptureService) 截图来源已切换为 {source.name}")
+
+    @property
+    def monitors(self) -> list[dict]:
+        """显示器列表，monitors[0] 为所有显示器的并集，monitors[1:] 为各个显示器"""
+        return self.source.monitors
+
+    @property
+    def dpi_scale(self) -> float:
+        """屏幕 DPI 缩放比例"""
+        return self.source.dpi_scale
+
+    def grab(self, region: Optional[Tuple[int, int, int, int]] = None, max_age: float = 0.0) -> Frame:
+        """
+        按全局屏幕坐标截取区域（不做 DPI 缩放），区域会被裁剪到所有显示器的范围内
+        :param region: 截图区域 (left, top, width, height)，为 None 时截取所有显示器
+        :param max_age: 可接受的缓存帧最大时长（秒），为 0 时总是重新截图且不写入缓存
+        :return: Frame，使用缓存时 image 为只读视图
+        :raises ValueError: 区域与屏幕不相交
+        """
+        source = self.source
+        monitor = source.monitors[0]
+        bounds = (monitor["left"], monitor["top"], monitor["width"], monitor["height"])
+        target = bounds
+        if region is not None:
+            target = intersect_region(tuple(int(v) for v in region), bounds)
+            if target is None:
+                raise ValueError(f"截图区域 {tuple(region)} 不在屏幕范围内")
+
+        if max_age > 0:
+            cached = self._cached
+            if cached is not None and time.perf_counter() - cached.timestamp <= max_age \
+                    and intersect_region(cached.region, target) == target:
+                with self._lock:
+                    self._cache_hits += 1
+                return cached.crop(target)
+
+        generation = self._generation
+        start = time.perf_counter()
+        image = source.grab(target)
+        now = time.perf_counter()
+        self._record(now - start)
+
+        frame = Frame(image, target[0], target[1], now)
+        if max_age > 0:
+            self.publish(frame, generation)
+        return frame
+
+    def pixel(self, pos: Tuple[int, int], max_age: float = 0.0) -> Tuple[int, int, int]:
+        """
+        读取单个像素的颜色，只截取 1x1 区域（或复用缓存帧）
+        :param pos: 全局屏幕坐标 (x, y)
+        :param max_age: 可接受的缓存帧最大时长（秒）
+        :return: (r, g, b)
+        """
+        b, g, r = self.grab((int(pos[0]), int(pos[1]), 1, 1), max_age).image[0, 0, :3]
+        return int(r), int(g), int(b)
+
+    def region_color(self, region: Tuple[int, int, int, int], max_age: float = 0.0) -> Tuple[int, int, int]:
+        """
+        读取小区域的平均颜色
+        :param region: 全局屏幕坐标 (left, top, width, height)
+        :param max_age: 可接受的缓存帧最大时长（秒）
+        :return: (r, g, b)
+        """
+        b, g, r = self.grab(region, max_age).image[:, :, :3].reshape(-1, 3).mean(axis=0)
+        return int(round(r)), int(round(g)), int(round(b))
+
+    @property
+    def generation(self) -> int:
+        """帧缓存的失效计数，截图前读取并传给 publish，可避免把失效前的截图写入缓存"""
+        return self._generation
+
+    def publish(self, frame: Frame, generation: Optional[int] = None) -> None:
+        """
+        将一帧截图写入帧缓存（设为只读），如后台截图线程的最新帧
+        :param frame: 截图
+        :param generation: 截图前读取的 generation，缓存在此之后失效过时不写入
+        """
+        frame.image.flags.writeable = False
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if self._cached is None or frame.timestamp >= self._cached.timestamp:
+                self._cached = frame
+
+    def invalidate(self) -> None:
+        """使帧缓存失效，执行器在鼠标、键盘操作后调用"""
+        with self._lock:
+            self._cached = None
+            self._generation += 1
+
+    def monitor_of(self, region: Optional[Tuple[int, int, int, int]] = None) -> dict:
+        """获取区域中心点所在的显示器，参见 screenshot_tool.monitor_at"""
+        return monitor_at(self.monitors, region)
+
+    def monitor_region(self, monitor: str | int = MONITOR_ALL,
+                       point: Optional[Tuple[int, int]] = None) -> Optional[Tuple[int, int, int, int]]:
+        """
+        获取目标显示器的区域
+        :param monitor: 'all' 所有显示器；显示器序号 1、2...；'cursor'、'last_hit' 时取 point 所在的显示器
+        :param point: 'cursor'、'last_hit' 时的全局屏幕坐标 (x, y)，为 None 时退回所有显示器
+        :return: (left, top, width, height)，所有显示器时返回 None
+        :raises ValueError: 无效的目标显示器或显示器序号超出范围
+        """
+        monitor = str(monitor).strip().lower() or MONITOR_ALL
+        if monitor == MONITOR_ALL:
+            return None
+        monitors = self.monitors
+        if monitor in (MONITOR_CURSOR, MONITOR_LAST_HIT):
+            if point is None:
+                return None
+            target = monitor_at(monitors, (int(point[0]), int(point[1]), 0, 0))
+        elif monitor.isdigit():
+            index = int(monitor)
+            if not 1 <= index < len(monitors):
+                raise ValueError(f"显示器序号 {index} 超出范围 1~{len(monitors) - 1}")
+            target = monitors[index]
+        else:
+            raise ValueError(f"无效的目标显示器 '{monitor}'，应为 'all'、'cursor'、'last_hit' 或显示器序号")
+        return target["left"], target["top"], target["width"], target["height"]
+
+    @staticmethod
+    def monitor_key(monitor: dict) -> str:
+        """显示器的唯一标识，eg: '0,0,2560x1440'"""
+        return monitor_key(monitor)
+
+    def _record(self, cost: float) -> None:
+        """记录一次截图耗时"""
+        with self._lock:
+            self._grabs += 1
+            self._total_time += cost
+            self._max_time = max(self._max_time, cost)
+            self._last_time = cost
+
+    def stats(self) -> dict:
+        """截图耗时统计"""
+        with self._lock:
+            return {
+                "grabs": self._grabs,
+                "cache_hits": self._cache_hits,
+                "avg_ms": round(self._total_time / self._grabs * 1000, 3) if self._grabs else 0.0,
+                "max_ms": round(self._max_time * 1000, 3),
+                "last_ms": round(self._last_time * 1000, 3),
+                "source": self._source.name if self._source else None,
+            }
+
+    def reset_stats(self) -> None:
+        """清空截图耗时统计"""
+        with self._lock:
+            self._grabs, self._total_time, self._max_time, self._last_time = 0, 0.0, 0.0, 0.0
+            self._cache_hits = 0
+
+    def close(self) -> None:
+        """释放截图来源"""
+        with self._lock:
+            if self._source is not None:
+                self._source.close()
+            self._cached = None
+            self._generation += 1
+
+
+# 全局截图服务实例
+capture_service = CaptureService()
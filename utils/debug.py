@@ -4,14 +4,16 @@ import os
 import time
 import inspect  # 用于获取当前堆栈帧
 from functools import wraps
+from typing import TYPE_CHECKING
 
-from core.commands.base_command import BaseCommand
+if TYPE_CHECKING:  # 只用于类型注解，运行时不导入指令模块（PyQt5、pydantic），OCR 工作进程等可直接使用本模块
+    from core.commands.base_command import BaseCommand
 
 _DEBUG = True
 
 
 # 打印指令对象属性(不包括私有属性)
-def print_command(obj: BaseCommand):
+def print_command(obj: "BaseCommand"):
     """
     自动获取对象的变量名，并以指定格式打印对象的属性信息。
     :param  obj: (BaseCommand): 需要打印的指令对象
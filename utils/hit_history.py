@@ -0,0 +1,139 @@
+"""
+@author: 54Coconi
+@date: 2026-10-16
+@version: 1.0.0
+@path: utils/hit_history.py
+@software: PyCharm 2023.1.2
+@officialWebsite: https://github.com/54Coconi
+@description:
+    图片匹配命中位置记录模块
+
+    记录每个模板图片最近一次匹配成功的位置（全局屏幕坐标），
+    并持久化到旁路 JSON 文件中，供 <图片匹配> 指令的自适应搜索在下次运行时优先搜索该位置附近；
+    同时在内存中记录最近一次命中的区域（任意模板或文字识别），供指令定位 “上次命中所在的显示器”
+    命中位置变化后不立即写文件，延迟 SAVE_DELAY 秒合并写入，程序退出时写入尚未保存的记录
+"""
+import os
+import json
+import atexit
+import threading
+from typing import Dict, Optional, Tuple
+
+_DEBUG = False
+
+# 当前文件路径
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 命中位置记录文件
+# 与 config.ini 同在程序根目录（当前文件路径的上一级目录）下，不随启动时的工作目录变化
+HIT_HISTORY_FILE = os.path.normpath(os.path.join(CURRENT_DIR, '..', 'match_history.json'))
+# 命中位置变化后延迟写文件的时间（秒），期间的多次变化只写一次，避免在图片匹配过程中写磁盘
+SAVE_DELAY = 2.0
+
+
+class HitHistory:
+    """
+    模板图片命中位置记录
+
+    记录格式: {模板图片绝对路径: [left, top, width, height]}
+    """
+
+    def __init__(self, storage_path: str = HIT_HISTORY_FILE):
+        self.storage_path = storage_path  # 存储路径
+        self._lock = threading.Lock()
+        self._records: Dict[str, Tuple[int, int, int, int]] = self._load()
+        self._last: Optional[Tuple[int, int, int, int]] = None  # 最近一次命中的区域（不持久化）
+        self._dirty = False  # 是否有尚未写入文件的变化
+        self._save_timer: Optional[threading.Timer] = None
+        self._save_lock = threading.Lock()  # 串行化文件写入
+
+    @staticmethod
+    def _key(template_path: str) -> str:
+        """统一模板路径作为记录的键"""
+        return os.path.normcase(os.path.abspath(template_path))
+
+    def _load(self) -> Dict[str, Tuple[int, int, int, int]]:
+        """从文件加载命中记录，文件不存在或损坏时返回空记录"""
+        if not os.path.exists(self.storage_path):
+            return {}
+        try:
+            with open(self.storage_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {key: tuple(int(v) for v in box) for key, box in data.items() if len(box) == 4}
+        except (OSError, ValueError, TypeError) as e:
+            print(f"[WARN] - (HitHistory) 命中记录文件读取失败，已忽略: {e}")
+            return {}
+
+    def _mark_dirty(self) -> None:
+        """标记记录已变化，SAVE_DELAY 秒后写入文件（调用方需持有 self._lock）"""
+        self._dirty = True
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True  # 不阻止程序退出，退出时由 atexit 写入
+            self._save_timer.start()
+
+    def flush(self) -> None:
+        """把尚未保存的命中记录写入文件"""
+        with self._save_lock:
+            with self._lock:
+                if self._save_timer is not None:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+                if not self._dirty:
+                    return
+                self._dirty = False
+                data = {key: list(box) for key, box in self._records.items()}
+            try:
+                with open(self.storage_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+            except OSError as e:
+                print(f"[WARN] - (HitHistory) 命中记录文件保存失败: {e}")
+
+    def get(self, template_path: str) -> Optional[Tuple[int, int, int, int]]:
+        """
+        获取模板图片最近一次的命中区域
+        :param template_path: 模板图片路径
+        :return: (left, top, width, height) 或 None
+        """
+        with self._lock:
+            return self._records.get(self._key(template_path))
+
+    def record(self, template_path: str, box: Tuple[int, int, int, int]) -> None:
+        """
+        记录模板图片的命中区域，位置变化时延迟写入文件
+        :param template_path: 模板图片路径
+        :param box: (left, top, width, height)
+        """
+        box = tuple(int(v) for v in box)
+        key = self._key(template_path)
+        with self._lock:
+            self._last = box
+            if self._records.get(key) == box:
+                return
+            self._records[key] = box
+            self._mark_dirty()
+        print(f"[DEBUG] - (HitHistory) 记录命中位置 {template_path}: {box}") if _DEBUG else None
+
+    @property
+    def last(self) -> Optional[Tuple[int, int, int, int]]:
+        """最近一次命中的区域 (left, top, width, height)，本次运行尚未命中时为 None"""
+        return self._last
+
+    def mark(self, box: Tuple[int, int, int, int]) -> None:
+        """
+        只记录最近一次命中的区域（不持久化），如文字识别的匹配框
+        :param box: (left, top, width, height)
+        """
+        with self._lock:
+            self._last = tuple(int(v) for v in box)
+
+    def forget(self, template_path: str) -> None:
+        """删除模板图片的命中记录"""
+        with self._lock:
+            if self._records.pop(self._key(template_path), None) is not None:
+                self._mark_dirty()
+
+
+# 全局命中位置记录实例
+hit_history = HitHistory()
+atexit.register(hit_history.flush)
@@ -0,0 +1,176 @@
+"""
+@author: 54Coconi
+@date: 2026-10-16
+@version: 1.0.0
+@path: utils/ocr_model_manager.py
+@software: PyCharm 2023.1.2
+@officialWebsite: https://github.com/54Coconi
+@description:
+    OCR 模型管理模块
+
+    进程内唯一的 OCR 模型管理器，代替界面加载线程和指令各自创建 OCRTool 的做法：
+        - 按模型参数（后端、语言、模型路径等）懒加载 OCRTool，同一组参数在一个进程内只加载一次，
+          并发的请求共用同一个加载任务
+        - 模型加载后用一张小图执行一次预热推理，第一条文字识别指令不再承担推理引擎的初始化开销
+        - load_async() 立即返回就绪 Future，界面启动时在后台线程中加载，执行器和指令可等待其完成
+    OCR 服务的工作进程同样通过本模块加载模型；OCR 服务已用相同参数启动时，本进程的 OCRTool 延迟加载模型，
+    只在需要在本进程中识别（如文本框缓存识别、OCR 服务停止后）时才加载
+"""
+import time
+import threading
+from concurrent.futures import Future
+from typing import Optional
+
+import numpy as np
+
+from utils.ocr_tools import OCRTool, DET_MODEL_DIR, REC_MODEL_DIR, CLS_MODEL_DIR, DEFAULT_OCR_BACKEND
+from utils.ocr_service import ocr_service
+
+_DEBUG = False
+
+# 默认的模型参数（OCRTool 的参数）
+DEFAULT_MODEL_KWARGS = dict(lang='ch', det_model_dir=DET_MODEL_DIR, rec_model_dir=REC_MODEL_DIR,
+                            cls_model_dir=CLS_MODEL_DIR, use_angle_cls=False, backend=DEFAULT_OCR_BACKEND)
+# 等待模型加载的默认超时时间（秒）
+MODEL_LOAD_TIMEOUT = 120
+# 预热推理使用的图片尺寸 (height, width)，与识别模型的输入高度一致
+WARMUP_SHAPE = (48, 320)
+
+
+class OcrModelManager:
+    """
+    OCR 模型管理器
+
+    加载失败的结果同样会被保留，之后的请求直接得到同一个异常，不会反复尝试加载
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._models: dict[tuple, Future] = {}  # 模型参数 -> 就绪 Future
+        self._default = dict(DEFAULT_MODEL_KWARGS)
+        self._load_times: dict[str, float] = {}  # 后端名称 -> 加载及预热耗时（秒）
+        self._local_loads: set[tuple] = set()  # 正在本进程中补加载的延迟加载模型
+
+    @staticmethod
+    def _key(model_kwargs: dict) -> tuple:
+        return tuple(sorted(model_kwargs.items()))
+
+    @property
+    def default_kwargs(self) -> dict:
+        """未指定模型参数时使用的参数"""
+        return dict(self._default)
+
+    def configure(self, model_kwargs: dict) -> None:
+        """
+        设置默认的模型参数，未给出的参数使用 DEFAULT_MODEL_KWARGS 中的值；已加载的模型不会被释放
+        :param model_kwargs: OCRTool 的参数
+        """
+        self._default = dict(DEFAULT_MODEL_KWARGS, **model_kwargs)
+
+    def load_async(self, model_kwargs: Optional[dict] = None, warmup: bool = True) -> Future:
+        """
+        在后台线程中加载模型，已加载或正在加载时直接返回同一个 Future
+        :param model_kwargs: OCRTool 的参数，为 None 时使用默认参数
+        :param warmup: 加载后是否执行预热推理
+        :return: 就绪 Future，结果为 OCRTool
+        """
+        kwargs = self.default_kwargs if model_kwargs is None else dict(model_kwargs)
+        key = self._key(kwargs)
+        with self._lock:
+            future = self._models.get(key)
+            if future is None:
+                future = self._models[key] = Future()
+                threading.Thread(target=self._load, args=(kwargs, future, warmup), name="OcrModelLoader",
+                                 daemon=True).start()
+                return future
+            # 延迟加载的模型不再由 OCR 服务识别时（如服务已停止），在后台补加载并预热
+            if future.done() and future.exception() is None and not future.result().loaded \
+                    and not ocr_service.serves(kwargs) and key not in self._local_loads:
+                self._local_loads.add(key)
+                threading.Thread(target=self._load_local, args=(key, future.result(), warmup),
+                                 name="OcrModelLoader", daemon=True).start()
+        return future
+
+    def _load(self, kwargs: dict, future: Future, warmup: bool) -> None:
+        """加载模型并预热（后台线程），OCR 服务已用相同参数启动时只创建延迟加载的 OCRTool"""
+        future.set_running_or_notify_cancel()
+        lazy = ocr_service.serves(kwargs)
+        start = time.perf_counter()
+        try:
+            ocr = OCRTool(**kwargs, lazy=lazy)
+            if warmup and not lazy:
+                self._warmup(ocr)
+        except Exception as e:
+            print(f"[ERROR] - (OcrModelManager) 加载 OCR 模型 {kwargs.get('backend')} 失败: {e}")
+            future.set_exception(e)
+            return
+        if lazy:
+            print(f"[INFO] - (OcrModelManager) OCR 模型 {ocr.backend_name} 由 OCR 服务的工作进程加载, 本进程延迟加载")
+        else:
+            self._record_load(ocr, time.perf_counter() - start)
+        future.set_result(ocr)
+
+    def _load_local(self, key: tuple, ocr: OCRTool, warmup: bool) -> None:
+        """在本进程中加载延迟加载的模型并预热（后台线程）"""
+        start = time.perf_counter()
+        try:
+            ocr.load()
+            if warmup:
+                self._warmup(ocr)
+        except Exception as e:  # 第一次使用时会再次尝试加载并抛出异常
+            print(f"[ERROR] - (OcrModelManager) 加载 OCR 模型 {ocr.backend_name} 失败: {e}")
+        else:
+            self._record_load(ocr, time.perf_counter() - start)
+        finally:
+            with self._lock:
+                self._local_loads.discard(key)
+
+    def _record_load(self, ocr: OCRTool, cost: float) -> None:
+        """记录模型加载及预热耗时"""
+        with self._lock:
+            self._load_times[ocr.backend_name] = cost
+        print(f"[INFO] - (OcrModelManager) OCR 模型 {ocr.backend_name} 已加载, 耗时 {cost:.2f} 秒")
+
+    @staticmethod
+    def _warmup(ocr: OCRTool) -> None:
+        """
+        用空白图片执行一次推理，完成推理引擎的初始化（内存分配、算子选择等）
+        直接调用后端，不经过识别结果缓存和 OCR 服务
+        """
+        start = time.perf_counter()
+        try:
+            ocr.ocr.ocr(np.full((*WARMUP_SHAPE, 3), 255, dtype=np.uint8), cls=ocr.use_angle_cls)
+        except Exception as e:  # 预热失败不影响使用
+            print(f"[WARN] - (OcrModelManager) OCR 模型预热失败: {e}")
+            return
+        print(f"[DEBUG] - (OcrModelManager) 预热耗时 {time.perf_counter() - start:.3f} 秒") if _DEBUG else None
+
+    def get(self, model_kwargs: Optional[dict] = None, timeout: Optional[float] = MODEL_LOAD_TIMEOUT) -> OCRTool:
+        """
+        获取模型，尚未加载时开始加载并等待完成
+        :param model_kwargs: OCRTool 的参数，为 None 时使用默认参数
+        :param timeout: 最长等待时间（秒），为 None 时一直等待
+        :return: OCRTool
+        :raises TimeoutError: 等待超时
+        :raises Exception: 模型加载失败时的异常
+        """
+        return self.load_async(model_kwargs).result(timeout)
+
+    def ready(self, model_kwargs: Optional[dict] = None) -> bool:
+        """模型是否已成功加载（不会触发加载），延迟加载的 OCRTool 创建后即视为就绪"""
+        kwargs = self.default_kwargs if model_kwargs is None else model_kwargs
+        future = self._models.get(self._key(kwargs))
+        return future is not None and future.done() and future.exception() is None
+
+    def stats(self) -> dict:
+        """已加载的模型及其加载耗时"""
+        with self._lock:
+            return {
+                "models": len(self._models),
+                "load_seconds": {name: round(cost, 3) for name, cost in self._load_times.items()},
+                "default_backend": self._default.get("backend"),
+            }
+
+
+# 全局 OCR 模型管理器实例
+ocr_model_manager = OcrModelManager()
@@ -0,0 +1,189 @@
+"""
+@author: 54Coconi
+@date: 2026-10-16
+@version: 1.0.0
+@path: utils/ocr_service.py
+@software: PyCharm 2023.1.2
+@officialWebsite: https://github.com/54Coconi
+@description:
+    OCR 工作进程池模块
+
+    PaddleOCR 推理在执行器线程中运行时会长时间占用 GIL，与 Qt 界面和键鼠监听线程争抢。
+    OCR 服务把识别放到 N 个工作进程中执行：
+        - 每个工作进程启动时通过 OCR 模型管理器加载并预热一次模型（参见 ocr_model_manager），之后一直复用
+        - 截图通过 multiprocessing.shared_memory 传递给工作进程，不做 pickle 序列化，只回传识别结果
+        - submit() 返回 concurrent.futures.Future，OCRTool.perform_ocr_async 在服务启动后自动使用，
+          <脚本执行器> 同时运行的多个脚本共用同一个进程池
+    工作进程使用 spawn 方式启动，会重新导入主模块，因此 run.py 只在 __main__ 中导入界面模块
+"""
+import time
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory, resource_tracker
+from typing import Optional
+
+import numpy as np
+
+_DEBUG = False
+
+# 工作进程中的 OCRTool 实例
+_worker_ocr = None
+
+
+def _init_worker(model_kwargs: dict) -> None:
+    """工作进程初始化：加载并预热一次模型"""
+    global _worker_ocr
+    # 工作进程中才导入，避免与 ocr_tools 循环导入；ocr_tools 不依赖截图和界面模块，工作进程不会导入 PyQt5
+    from utils.ocr_model_manager import ocr_model_manager
+    _worker_ocr = ocr_model_manager.get(model_kwargs, timeout=None)
+
+
+def _ping() -> bool:
+    """空任务，用于预先启动工作进程并加载模型"""
+    return _worker_ocr is not None
+
+
+def _attach_untracked(shm_name: str) -> shared_memory.SharedMemory:
+    """
+    附加到已有的共享内存且不登记到 resource_tracker（Python 3.13 以下的 track=False）
+    共享内存由主进程创建和释放；工作进程登记后，其 resource_tracker 会在退出时告警泄漏或再次释放。
+    附加后再取消登记也不可行：spawn 的工作进程与主进程共用同一个 resource_tracker，会把主进程的登记一并删除
+    """
+    # Python 3.8 ~ 3.12 的 SharedMemory 没有 track 参数，附加时总会调用 resource_tracker.register，
+    # 只能临时替换该函数跳过登记；Python 3.13+ 直接使用 SharedMemory(track=False)，不会走到这里
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None  # 工作进程单线程执行任务，临时替换不影响其他调用
+    try:
+        return shared_memory.SharedMemory(name=shm_name)
+    finally:
+        resource_tracker.register = register
+
+
+def _recognize(shm_name: str, shape: tuple, dtype: str):
+    """
+    在工作进程中识别共享内存中的图像
+    :param shm_name: 共享内存名称
+    :param shape: 图像形状
+    :param dtype: 图像数据类型
+    :return: OCR 识别结果
+    """
+    try:
+        shm = shared_memory.SharedMemory(name=shm_name, track=False)  # Python 3.13+，由主进程负责释放
+    except TypeError:
+        shm = _attach_untracked(shm_name)
+    image = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+    try:
+        return _worker_ocr.perform_ocr(image, use_cache=False)
+    finally:
+        del image  # 释放对共享内存的引用后才能关闭
+        shm.close()
+
+
+class OcrService:
+    """
+    OCR 工作进程池
+
+    Attributes:
+        workers: (int) 工作进程数，未启动时为 0
+        model_kwargs: (dict|None) 工作进程加载模型使用的 OCRTool 参数
+    """
+
+    def __init__(self):
+        self.workers = 0
+        self.model_kwargs: Optional[dict] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        # 统计
+        self._submitted = 0
+        self._completed = 0
+        self._total_time = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._pool is not None
+
+    def serves(self, model_kwargs: dict) -> bool:
+        """服务已启动，且工作进程加载的模型与 model_kwargs 一致"""
+        return self._pool is not None and self.model_kwargs == model_kwargs
+
+    def start(self, workers: int, model_kwargs: dict) -> None:
+        """
+        启动工作进程池，参数与当前运行的进程池不同时会先停止再重新启动
+        :param workers: 工作进程数
+        :param model_kwargs: OCRTool 的参数（模型路径等）
+        """
+        if workers <= 0:
+            raise ValueError(f"工作进程数必须大于 0，当前为 {workers}")
+        if self._pool is not None:
+            if (workers, model_kwargs) == (self.workers, self.model_kwargs):
+                return
+            self.stop()
+        with self._lock:
+            self._pool = ProcessPoolExecutor(max_workers=workers,
+                                             mp_context=multiprocessing.get_context("spawn"),
+                                             initializer=_init_worker,
+                                             initargs=(dict(model_kwargs),))
+            self.workers, self.model_kwargs = workers, dict(model_kwargs)
+            self._submitted, self._completed, self._total_time = 0, 0, 0.0
+            for _ in range(workers):  # 预先启动所有工作进程，加载模型与界面启动并行
+                self._pool.submit(_ping)
+        print(f"[INFO] - (OcrService) OCR 服务已启动, 工作进程数 {workers}")
+
+    def stop(self) -> None:
+        """停止工作进程池，未完成的识别任务会被取消"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self.workers = 0
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+            print("[INFO] - (OcrService) OCR 服务已停止")
+
+    def submit(self, image: np.ndarray) -> Future:
+        """
+        提交识别任务，图像复制到共享内存后交给空闲的工作进程
+        :param image: np.ndarray 图像（RGB）
+        :return: Future，结果为 OCR 识别结果
+        :raises RuntimeError: 服务未启动
+        """
+        pool = self._pool
+        if pool is None:
+            raise RuntimeError("OCR 服务未启动")
+        image = np.ascontiguousarray(image)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, image.nbytes))
+        try:
+            np.ndarray(image.shape, dtype=image.dtype, buffer=shm.buf)[...] = image
+            start = time.perf_counter()
+            future = pool.submit(_recognize, shm.name, image.shape, image.dtype.str)
+        except Exception:
+            shm.close()
+            shm.unlink()
+            raise
+        with self._lock:
+            self._submitted += 1
+
+        def _release(_future: Future) -> None:
+            """识别完成（或取消）后释放共享内存"""
+            shm.close()
+            shm.unlink()
+            with self._lock:
+                self._completed += 1
+                self._total_time += time.perf_counter() - start
+
+        future.add_done_callback(_release)
+        return future
+
+    def stats(self) -> dict:
+        """OCR 服务统计"""
+        with self._lock:
+            return {
+                "running": self._pool is not None,
+                "workers": self.workers,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "avg_ms": round(self._total_time / self._completed * 1000, 3) if self._completed else 0.0,
+            }
+
+
+# 全局 OCR 服务实例
+ocr_service = OcrService()
@@ -1,16 +1,34 @@
 """
 文字识别模块
 
+    - OcrBackend: OCR 后端接口（检测 detect / 识别 recognize / 完整流程 ocr），识别结果统一为 PaddleOCR 的格式
+        - PaddleBackend: PaddleOCR（PP-OCRv4 模型）
+        - TesseractBackend: Tesseract-OCR（pytesseract），不依赖深度学习框架的轻量后端
+    - OCRTool: 按配置 ImageOcr.ModelName 创建 OCR 后端并执行识别
+    - OcrResultCache: 以输入图像摘要为键的识别结果缓存（LRU），画面未变化时重复识别直接返回缓存结果
+    - OcrLayoutCache: 按识别区域缓存文本框，布局不变时只对缓存的文本框批量执行识别模型（参见 OCRTool.perform_ocr_layout）
+    - OCR 服务（参见 ocr_service）启动后，识别在工作进程中执行，perform_ocr_async 返回 Future
+    - find_matching_texts: 从识别结果中匹配指定文本（完全、部分、模糊匹配或正则表达式），按得分排序
+        - TextQuery: 预编译的待匹配文字，一次性为所有识别文本打分；模糊匹配使用向量化的编辑距离和易混淆字符归一化
 """
 import os
 import re
 import time
+import hashlib
+import threading
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
 import cv2
 import numpy as np
-import pyautogui
-from paddleocr import PaddleOCR
 
 from utils.debug import print_func_time
+from utils.ocr_service import ocr_service
 
 
 _DEBUG = True
@@ -27,6 +45,40 @@ CLS_MODEL_DIR = os.path.join(CURRENT_DIR, '..', 'models', 'cls', 'ch', 'ch_PP-OC
 # REC_MODEL_DIR = '/models/rec/ch/ch_PP-OCRv4_rec_infer'
 # CLS_MODEL_DIR = '/models/cls/ch/ch_PP-OCRv4_cls_infer'
 
+# 可选的 OCR 后端（与配置 ImageOcr.ModelName 一致）
+OCR_BACKENDS = ("PaddleOCR", "Tesseract")
+DEFAULT_OCR_BACKEND = "PaddleOCR"
+
+# OCR 识别结果缓存的最大条目数
+OCR_CACHE_MAX_ENTRIES = 32
+
+# 文字匹配模式
+MATCH_MODES = ("完全匹配", "部分匹配", "模糊匹配")
+# 模糊匹配默认允许的归一化编辑距离（编辑距离 / 待匹配文字长度）
+FUZZY_MAX_DISTANCE = 0.2
+# 模糊匹配时 OCR 易混淆字符的归一化映射（识别文本和待匹配文字都转换为同一字符）
+OCR_CONFUSIONS = str.maketrans({
+    "O": "0", "o": "0", "〇": "0", "D": "0",
+    "I": "1", "l": "1", "|": "1", "丨": "1", "!": "1",
+    "Z": "2", "z": "2",
+    "S": "5", "s": "5",
+    "b": "6", "G": "6",
+    "B": "8",
+    "g": "9", "q": "9",
+})
+
+# 文本框缓存的最大条目数（识别区域数）
+LAYOUT_CACHE_MAX_ENTRIES = 16
+# 布局变化检测：图像缩小的倍数，缩小后梯度超过阈值的点视为笔画
+LAYOUT_SCALE = 4
+LAYOUT_EDGE_THRESHOLD = 32
+# 文本框以外笔画变化的点数超过 max(最小点数, 文本框以外点数 * 比例) 时视为布局变化，重新检测文本框
+LAYOUT_CHANGE_MIN_POINTS = 16
+LAYOUT_CHANGE_RATIO = 0.002
+# 只识别时任一文本框的置信度低于该值（如文字变长超出文本框），或文本框已复用该次数，重新检测文本框
+LAYOUT_MIN_CONFIDENCE = 0.5
+LAYOUT_MAX_REUSES = 100
+
 # 颜色常量(BGR格式)
 RECTANGLE_COLOR = [
     (255, 0, 0),  # 蓝色
@@ -36,59 +88,136 @@ RECTANGLE_COLOR = [
 ]
 
 
+class TextQuery:
+    """
+    预编译的待匹配文字，对一组识别文本一次性打分
+
+    各匹配模式的得分（0~1，不匹配为 -1）:
+        - 完全匹配 / 部分匹配 / 正则表达式: 匹配为 1
+        - 模糊匹配: 归一化 OCR 易混淆字符后，待匹配文字与识别文本中最相近的一段的编辑距离除以待匹配文字长度，
+          不超过 max_distance 时得分为 1 - 该值；同分时整段文本更相近的排在前面
+    """
+
+    def __init__(self, text: str = "", match_mode: str = "完全匹配", ignore_case: bool = False,
+                 use_regex: bool = False, max_distance: float = FUZZY_MAX_DISTANCE):
+        if match_mode not in MATCH_MODES:
+            raise ValueError(f"无效的匹配模式 '{match_mode}',应为 {'、'.join(MATCH_MODES)} 之一")
+        self.match_mode = match_mode
+        self.ignore_case = ignore_case
+        self.max_distance = max_distance
+        self.pattern = None
+        self.valid = True
+        if use_regex:
+            try:
+                self.pattern = re.compile(text, re.IGNORECASE if ignore_case else 0)
+            except re.error as e:
+                print(f"正则表达式编译失败: {e}")
+                self.valid = False
+        elif match_mode == "模糊匹配":
+            text = normalize_ocr_text(text, ignore_case)
+            self.valid = bool(text)  # 空文字与任何文本的编辑距离都为 0，不匹配任何文本
+        elif ignore_case:
+            text = text.lower()
+        self.text = text
+
+    def scores(self, texts: list[str]) -> np.ndarray:
+        """
+        对识别文本打分
+        :param texts: 识别文本列表
+        :return: 与 texts 一一对应的得分数组，不匹配为 -1
+        """
+        if not self.valid or not texts:
+            return np.full(len(texts), -1.0)
+        if self.pattern is not None:
+            return np.array([1.0 if self.pattern.search(t.lower() if self.ignore_case else t) else -1.0
+                             for t in texts])
+        if self.match_mode == "模糊匹配":
+            return self._fuzzy_scores([normalize_ocr_text(t, self.ignore_case) for t in texts])
+        texts = [t.lower() for t in texts] if self.ignore_case else texts
+        if self.match_mode == "完全匹配":
+            return np.array([1.0 if t == self.text else -1.0 for t in texts])
+        return np.array([1.0 if self.text in t else -1.0 for t in texts])
+
+    def _fuzzy_scores(self, texts: list[str]) -> np.ndarray:
+        """模糊匹配得分，整段文本的相似度作为同分时的排序依据（加权 1e-3）"""
+        lengths = np.array([len(t) for t in texts])
+        partial = _edit_distances(self.text, texts, partial=True) / max(1, len(self.text))
+        whole = _edit_distances(self.text, texts, partial=False) / np.maximum(np.maximum(lengths, len(self.text)), 1)
+        return np.where(partial <= self.max_distance, (1 - partial) + (1 - whole) * 1e-3, -1.0)
+
+
+def normalize_ocr_text(text: str, ignore_case: bool = False) -> str:
+    """
+    归一化 OCR 文本：全角转半角（NFKC）、去除空白，并把易混淆字符（如 O 与 0、l 与 1）转换为同一字符
+    先转换易混淆字符再转小写，大写字母（如 B、D、G）按大写的易混淆字符转换
+    :param text: 文本
+    :param ignore_case: 是否转换为小写
+    :return: 归一化后的文本
+    """
+    text = "".join(unicodedata.normalize("NFKC", text).split()).translate(OCR_CONFUSIONS)
+    return text.lower() if ignore_case else text
+
+
+def _edit_distances(query: str, texts: list[str], partial: bool) -> np.ndarray:
+    """
+    向量化计算 query 与每个文本的编辑距离（Levenshtein），按 query 的字符逐行递推，每行同时计算所有文本
+    :param query: 待匹配文字
+    :param texts: 文本列表
+    :param partial: 为 True 时计算 query 与文本中任意一段的最小编辑距离
+    :return: 编辑距离数组
+    """
+    count = len(texts)
+    lengths = np.array([len(t) for t in texts], dtype=np.int64)
+    width = int(lengths.max(initial=0))
+    codes = np.full((count, width), -1, dtype=np.int64)
+    for k, t in enumerate(texts):
+        codes[k, :len(t)] = [ord(c) for c in t]
+    steps = np.arange(width + 1, dtype=np.float64)
+    row = np.zeros((count, width + 1)) if partial else np.tile(steps, (count, 1))
+    for i, char in enumerate(query, start=1):
+        current = np.empty_like(row)
+        current[:, 0] = i
+        # 删除 / 替换
+        current[:, 1:] = np.minimum(row[:, 1:] + 1, row[:, :-1] + (codes != ord(char)))
+        # 插入: current[j] = min(current[k] + j - k), k <= j
+        row = np.minimum.accumulate(current - steps, axis=1) + steps
+    if partial:
+        return np.where(steps <= lengths[:, None], row, np.inf).min(axis=1)
+    return row[np.arange(count), lengths]
+
+
+@lru_cache(maxsize=64)
+def compile_text_query(text: str = "", match_mode: str = "完全匹配", ignore_case: bool = False,
+                       use_regex: bool = False, max_distance: float = FUZZY_MAX_DISTANCE) -> TextQuery:
+    """预编译待匹配文字，循环中重复执行的文字识别指令只编译一次"""
+    return TextQuery(text, match_mode, ignore_case, use_regex, max_distance)
+
+
 @print_func_time(debug=_DEBUG)
 def find_matching_texts(result, text="", match_mode="完全匹配", ignore_case=False,
-                        use_regex=False, confidence_threshold=0.0) -> list[tuple[str, tuple[int, int, int, int]]]:
+                        use_regex=False, confidence_threshold=0.0,
+                        max_distance=FUZZY_MAX_DISTANCE) -> list[tuple[str, tuple[int, int, int, int]]]:
     """
-    从OCR识别结果中匹配指定文本并返回其文本和文本区域框
+    从OCR识别结果中匹配指定文本并返回其文本和文本区域框，按匹配得分从高到低排列（同分时保持识别结果中的顺序）
 
     :param result: OCR识别结果
     :param text: 待匹配的文字，默认为空
-    :param match_mode: 匹配模式 ("完全匹配" 或 "部分匹配")，默认为 "完全匹配"
+    :param match_mode: 匹配模式 ("完全匹配"、"部分匹配" 或 "模糊匹配")，默认为 "完全匹配"
     :param ignore_case: 是否忽略大小写，默认为 False
     :param use_regex: 是否使用正则表达式匹配，默认为 False
     :param confidence_threshold: 置信度阈值，默认为 0.0
+    :param max_distance: 模糊匹配允许的归一化编辑距离（0~1），默认为 FUZZY_MAX_DISTANCE
     :return: 匹配成功的结果列表，每个元素为 (recognized_text, (x1, y1, x2, y2))
     """
-    matching_results = []  # 用于存储匹配成功的结果
-    pattern = None  # 初始化为 None，避免未赋值错误
-
-    # 编译正则表达式（如果启用正则匹配）
-    if use_regex:
-        try:
-            flags = re.IGNORECASE if ignore_case else 0
-            pattern = re.compile(text, flags)
-        except re.error as e:
-            print(f"正则表达式编译失败: {e}")
-            return []  # 返回空列表
-
-    # 遍历识别结果
-    for line in result:
-        for detection in line:
-            # 获取识别到的文本、区域框和置信度
-            coords = detection[0]  # 文本块的四个顶点坐标
-            recognized_text = detection[1][0]  # 原始识别文本
-            confidence = detection[1][1]  # 置信度
-
-            # 跳过低置信度的结果
-            if confidence < confidence_threshold:
-                continue
-
-            # 处理忽略大小写的匹配（不改变原始文本，仅改变比较方式）
-            comparison_text = recognized_text.lower() if ignore_case else recognized_text
-
-            # 根据匹配模式进行匹配
-            if use_regex:
-                if pattern.search(comparison_text):  # 正则表达式匹配
-                    matching_results.append((recognized_text, _extract_bounding_box(coords)))
-            elif match_mode == "完全匹配" and comparison_text == (text.lower() if ignore_case else text):
-                matching_results.append((recognized_text, _extract_bounding_box(coords)))
-            elif match_mode == "部分匹配" and (text.lower() if ignore_case else text) in comparison_text:
-                matching_results.append((recognized_text, _extract_bounding_box(coords)))
-            elif match_mode not in ["完全匹配", "部分匹配"]:
-                raise ValueError(f"无效的匹配模式 '{match_mode}',应为 '完全匹配' 或 '部分匹配'")
-
-    return matching_results
+    query = compile_text_query(text or "", match_mode, ignore_case, use_regex, max_distance)
+    # 获取置信度不低于阈值的识别结果
+    detections = [detection for line in result or [] if line for detection in line
+                  if detection[1][1] >= confidence_threshold]
+    if not detections:
+        return []
+    scores = query.scores([detection[1][0] for detection in detections])
+    order = np.argsort(-scores, kind="stable")
+    return [(detections[k][1][0], _extract_bounding_box(detections[k][0])) for k in order if scores[k] >= 0]
 
 
 def _extract_bounding_box(coords) -> tuple:
@@ -102,6 +231,381 @@ def _extract_bounding_box(coords) -> tuple:
     return x1, y1, x2, y2
 
 
+class OcrResultCache:
+    """
+    进程级 OCR 识别结果缓存
+
+    以输入图像的完整内容摘要（blake2b，包含形状和数据类型）加模型标识作为键，使用 LRU 策略淘汰。
+    不使用感知哈希或抽样摘要：计数器、状态文字等只变化几个像素时也必须重新识别。
+    缓存的识别结果被多次返回，调用方不应修改。线程安全。
+    """
+
+    def __init__(self, max_entries: int = OCR_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, list] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0  # 命中次数
+        self.misses = 0  # 未命中次数
+        self.evictions = 0  # 淘汰次数
+
+    @staticmethod
+    def digest(image: np.ndarray, tag: str = "") -> bytes:
+        """
+        计算输入图像的摘要
+        :param image: np.ndarray 图像
+        :param tag: 模型标识，不同模型或参数的识别结果互不复用
+        :return: bytes - 摘要
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{tag}|{image.shape}|{image.dtype}".encode())
+        digest.update(np.ascontiguousarray(image).data)
+        return digest.digest()
+
+    def get(self, key: bytes):
+        """获取缓存的识别结果，未命中时返回 None"""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: bytes, result) -> None:
+        """加入缓存，超出最大条目数时淘汰最久未使用的结果"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """清空缓存和统计"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """
+        获取缓存统计信息
+        :return: {'hits', 'misses', 'evictions', 'entries', 'hit_rate'}
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+# 全局 OCR 识别结果缓存实例
+ocr_result_cache = OcrResultCache()
+
+
+def _edge_mask(image: np.ndarray) -> np.ndarray:
+    """缩小图像后计算形态学梯度，返回笔画点的布尔数组（形状为原图的 1/LAYOUT_SCALE）"""
+    gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY) if image.ndim == 3 else image
+    size = (max(1, gray.shape[1] // LAYOUT_SCALE), max(1, gray.shape[0] // LAYOUT_SCALE))
+    small = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+    gradient = cv2.morphologyEx(small, cv2.MORPH_GRADIENT, np.ones((3, 3), dtype=np.uint8))
+    return gradient > LAYOUT_EDGE_THRESHOLD
+
+
+def _outside_mask(shape: tuple, boxes: list) -> np.ndarray:
+    """笔画数组中位于所有文本框（各向外扩展 1 个点）以外的位置"""
+    outside = np.ones(shape, dtype=bool)
+    for box in boxes:
+        points = np.asarray(box, dtype=np.float32) / LAYOUT_SCALE
+        x1, y1 = np.floor(points.min(axis=0)).astype(int) - 1
+        x2, y2 = np.ceil(points.max(axis=0)).astype(int) + 1
+        outside[max(0, y1):max(0, y2), max(0, x1):max(0, x2)] = False
+    return outside
+
+
+@dataclass
+class OcrLayout:
+    """
+    一个识别区域的文本框缓存
+
+    Attributes:
+        boxes: (list) 检测到的文本框
+        shape: (tuple) 检测时的图像尺寸 (height, width)
+        edges: (np.ndarray) 检测时的笔画数组，参见 _edge_mask
+        outside: (np.ndarray) 笔画数组中位于文本框以外的位置
+        reuses: (int) 复用次数
+    """
+    boxes: list
+    shape: tuple
+    edges: np.ndarray
+    outside: np.ndarray
+    reuses: int = 0
+
+    def changed(self, image: np.ndarray, edges: np.ndarray) -> bool:
+        """
+        布局是否变化：图像尺寸不同、复用次数已达上限，或文本框以外的笔画变化过多（如出现新的文字、弹窗）
+        文本框以内的变化（计数器、状态文字）不算布局变化
+        """
+        if image.shape[:2] != self.shape or self.reuses >= LAYOUT_MAX_REUSES:
+            return True
+        changes = np.count_nonzero((edges != self.edges) & self.outside)
+        return changes > max(LAYOUT_CHANGE_MIN_POINTS, np.count_nonzero(self.outside) * LAYOUT_CHANGE_RATIO)
+
+
+class OcrLayoutCache:
+    """
+    进程级文本框缓存
+
+    以模型标识加识别区域作为键，使用 LRU 策略淘汰。轮询读取同一区域时文字位置通常不变、内容变化，
+    缓存检测到的文本框后，布局不变时只需对这些文本框执行识别模型。线程安全。
+    """
+
+    def __init__(self, max_entries: int = LAYOUT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, OcrLayout] = OrderedDict()
+        self._lock = threading.Lock()
+        self.detections = 0  # 检测文本框的次数
+        self.reuses = 0  # 复用文本框、只识别的次数
+
+    def get(self, key: tuple) -> Optional[OcrLayout]:
+        """获取识别区域的文本框缓存，不存在时返回 None"""
+        with self._lock:
+            layout = self._entries.get(key)
+            if layout is not None:
+                self._entries.move_to_end(key)
+            return layout
+
+    def put(self, key: tuple, layout: OcrLayout) -> None:
+        """加入缓存，超出最大条目数时淘汰最久未使用的识别区域"""
+        with self._lock:
+            self.detections += 1
+            if self.max_entries <= 0:
+                return
+            self._entries[key] = layout
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def reused(self, layout: OcrLayout) -> None:
+        """记录一次只识别的复用"""
+        with self._lock:
+            layout.reuses += 1
+            self.reuses += 1
+
+    def clear(self) -> None:
+        """清空缓存和统计"""
+        with self._lock:
+            self._entries.clear()
+            self.detections = self.reuses = 0
+
+    def stats(self) -> dict:
+        """
+        获取缓存统计信息
+        :return: {'detections', 'reuses', 'entries', 'reuse_rate'}
+        """
+        with self._lock:
+            total = self.detections + self.reuses
+            return {
+                "detections": self.detections,
+                "reuses": self.reuses,
+                "entries": len(self._entries),
+                "reuse_rate": self.reuses / total if total else 0.0,
+            }
+
+
+# 全局文本框缓存实例
+ocr_layout_cache = OcrLayoutCache()
+
+
+def _box_points(x1, y1, x2, y2) -> list[list[float]]:
+    """矩形框转换为按顺时针从左上角开始的四个顶点，与 PaddleOCR 的格式一致"""
+    return [[float(x1), float(y1)], [float(x2), float(y1)], [float(x2), float(y2)], [float(x1), float(y2)]]
+
+
+def crop_box(image: np.ndarray, box) -> np.ndarray:
+    """
+    按文本框的外接矩形裁剪图像（视图）
+    :param image: np.ndarray 图像
+    :param box: 文本框的四个顶点坐标
+    :return: 裁剪后的图像，文本框在图像外时为空数组
+    """
+    points = np.asarray(box, dtype=np.float32)
+    x1, y1 = np.floor(points.min(axis=0)).astype(int)
+    x2, y2 = np.ceil(points.max(axis=0)).astype(int)
+    height, width = image.shape[:2]
+    return image[max(0, y1):min(height, y2), max(0, x1):min(width, x2)]
+
+
+class OcrBackend(ABC):
+    """
+    OCR 后端接口
+
+    文本框为按顺时针从左上角开始的四个顶点 [[x1, y1], [x2, y2], [x3, y3], [x4, y4]]，
+    ocr() 的结果与 PaddleOCR 一致: [[[文本框, (文本, 置信度)], ...]]（外层列表对应一张图片）
+    """
+    name = ""
+
+    @abstractmethod
+    def detect(self, image: np.ndarray) -> list:
+        """
+        检测文本区域
+        :param image: np.ndarray 图像（RGB）
+        :return: 文本框列表
+        """
+
+    @abstractmethod
+    def recognize(self, crops: list[np.ndarray]) -> list[tuple[str, float]]:
+        """
+        批量识别已裁剪的文本行图像
+        :param crops: 文本行图像列表（RGB）
+        :return: 与 crops 一一对应的 (文本, 置信度) 列表
+        """
+
+    def ocr(self, image: np.ndarray, cls: bool = False) -> list:
+        """
+        完整的识别流程：检测后识别所有文本框
+        :param image: np.ndarray 图像（RGB）
+        :param cls: 是否启用方向分类（不支持的后端忽略）
+        :return: [[[文本框, (文本, 置信度)], ...]]
+        """
+        boxes = self.detect(image)
+        texts = self.recognize([crop_box(image, box) for box in boxes]) if boxes else []
+        return [[[box, text] for box, text in zip(boxes, texts)]]
+
+
+class PaddleBackend(OcrBackend):
+    """PaddleOCR 后端"""
+    name = "PaddleOCR"
+
+    def __init__(self, lang='ch', det_model_dir=DET_MODEL_DIR, rec_model_dir=REC_MODEL_DIR,
+                 cls_model_dir=CLS_MODEL_DIR, use_angle_cls=True):
+        if not os.path.exists(det_model_dir):
+            raise FileNotFoundError(f"检测模型路径不存在：{det_model_dir}")
+        if not os.path.exists(rec_model_dir):
+            raise FileNotFoundError(f"识别模型路径不存在：{rec_model_dir}")
+        if not os.path.exists(cls_model_dir):
+            raise FileNotFoundError(f"分类模型路径不存在：{cls_model_dir}")
+        from paddleocr import PaddleOCR  # 只有使用 PaddleOCR 后端时才需要 paddle
+        self.use_angle_cls = use_angle_cls
+        self._ocr = PaddleOCR(lang=lang,
+                              show_log=False,
+                              det_model_dir=det_model_dir,
+                              rec_model_dir=rec_model_dir,
+                              cls_model_dir=cls_model_dir,
+                              use_angle_cls=use_angle_cls)
+
+    def detect(self, image: np.ndarray) -> list:
+        result = self._ocr.ocr(image, det=True, rec=False, cls=False)
+        return [[[float(x), float(y)] for x, y in box] for box in (result[0] or [])]
+
+    def recognize(self, crops: list[np.ndarray]) -> list[tuple[str, float]]:
+        valid = [i for i, crop in enumerate(crops) if crop.size]
+        texts = [("", 0.0)] * len(crops)
+        if valid:
+            # 直接调用方向分类器和识别器，所有文本行作为一批输入（按 rec_batch_num 分批推理）；
+            # PaddleOCR.ocr() 会把列表中的每张图片单独走一遍完整流程，每个文本框一次推理
+            batch = [crops[i] for i in valid]
+            if self.use_angle_cls:
+                batch, _, _ = self._ocr.text_classifier(batch)
+            lines, _ = self._ocr.text_recognizer(batch)
+            for i, (text, confidence) in zip(valid, lines):
+                texts[i] = (text, float(confidence))
+        return texts
+
+    def ocr(self, image, cls: bool = False) -> list:
+        return self._ocr.ocr(image, cls=cls)  # 使用 PaddleOCR 自带的完整流程（含透视裁剪）
+
+
+class TesseractBackend(OcrBackend):
+    """
+    Tesseract-OCR 后端（pytesseract），按文本行输出结果
+
+    需要安装 pytesseract 和 Tesseract-OCR 程序（中文需要 chi_sim 语言包）
+    """
+    name = "Tesseract"
+    # PaddleOCR 的语言类型到 Tesseract 语言包的映射
+    LANGS = {"ch": "chi_sim+eng", "en": "eng"}
+
+    def __init__(self, lang='ch', tesseract_cmd: str = None):
+        try:
+            import pytesseract  # 可选依赖，只有使用 Tesseract 后端时才需要
+        except ImportError:
+            raise ImportError("Tesseract 后端需要安装 pytesseract 和 Tesseract-OCR 程序")
+        if tesseract_cmd:
+            pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+        self._tess = pytesseract
+        self.lang = self.LANGS.get(lang, lang)
+
+    @staticmethod
+    def _join_words(words: list[str]) -> str:
+        """拼接单词：中文等非 ASCII 字符之间不加空格（Tesseract 把每个汉字输出为一个单词）"""
+        text = ""
+        for word in words:
+            if text and text[-1].isascii() and word[0].isascii():
+                text += " "
+            text += word
+        return text
+
+    def _lines(self, image: np.ndarray, config: str = "") -> list:
+        """识别图像并按 (块, 段落, 行) 把单词合并为文本行"""
+        data = self._tess.image_to_data(image, lang=self.lang, config=config, output_type=self._tess.Output.DICT)
+        lines: dict[tuple, list] = {}
+        for i, word in enumerate(data["text"]):
+            confidence = float(data["conf"][i])
+            if not word.strip() or confidence < 0:
+                continue
+            key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            left, top = data["left"][i], data["top"][i]
+            lines.setdefault(key, []).append((word.strip(), confidence, left, top,
+                                              left + data["width"][i], top + data["height"][i]))
+        result = []
+        for words in lines.values():
+            x1, y1 = min(w[2] for w in words), min(w[3] for w in words)
+            x2, y2 = max(w[4] for w in words), max(w[5] for w in words)
+            text = self._join_words([w[0] for w in words])
+            confidence = sum(w[1] for w in words) / len(words) / 100
+            result.append([_box_points(x1, y1, x2, y2), (text, confidence)])
+        return result
+
+    def detect(self, image: np.ndarray) -> list:
+        return [box for box, _ in self._lines(image)]
+
+    def recognize(self, crops: list[np.ndarray]) -> list[tuple[str, float]]:
+        texts = []
+        for crop in crops:
+            lines = self._lines(crop, config="--psm 7") if crop.size else []  # psm 7: 单行文本
+            if lines:
+                texts.append((self._join_words([text for _, (text, _) in lines]),
+                              sum(conf for _, (_, conf) in lines) / len(lines)))
+            else:
+                texts.append(("", 0.0))
+        return texts
+
+    def ocr(self, image: np.ndarray, cls: bool = False) -> list:
+        return [self._lines(image)]  # 一次调用完成检测和识别
+
+
+def create_ocr_backend(name: str = DEFAULT_OCR_BACKEND, lang='ch', det_model_dir=DET_MODEL_DIR,
+                       rec_model_dir=REC_MODEL_DIR, cls_model_dir=CLS_MODEL_DIR, use_angle_cls=True) -> OcrBackend:
+    """
+    按名称创建 OCR 后端
+    :param name: 后端名称，参见 OCR_BACKENDS
+    :return: OcrBackend
+    :raises ValueError: 未知的后端名称
+    """
+    if name == PaddleBackend.name:
+        return PaddleBackend(lang, det_model_dir, rec_model_dir, cls_model_dir, use_angle_cls)
+    if name == TesseractBackend.name:
+        return TesseractBackend(lang)
+    raise ValueError(f"未知的 OCR 后端 '{name}'，应为 {OCR_BACKENDS} 之一")
+
+
 class OCRTool:
     """
     OCR工具类，支持截屏、OCR识别、结果显示及保存
@@ -111,7 +615,9 @@ class OCRTool:
                  det_model_dir=DET_MODEL_DIR,
                  rec_model_dir=REC_MODEL_DIR,
                  cls_model_dir=CLS_MODEL_DIR,
-                 use_angle_cls=True):
+                 use_angle_cls=True,
+                 backend=DEFAULT_OCR_BACKEND,
+                 lazy=False):
         """
         初始化OCR工具类
         :param lang: 语言类型（'ch' 或 'en' 等）
@@ -119,21 +625,47 @@ class OCRTool:
         :param rec_model_dir: 识别模型路径
         :param cls_model_dir: 分类模型路径
         :param use_angle_cls: 是否启用角度分类器,如果为 True，则可以识别旋转 180 度的文本. 如果没有文本旋转 180 度,请使用 cls=False 以获得更好的性能
+        :param backend: OCR 后端名称，参见 OCR_BACKENDS
+        :param lazy: 是否在第一次使用后端时才加载模型（OCR 服务的工作进程负责识别时，本进程不需要加载模型）
         """
         self.use_angle_cls = use_angle_cls
-        if not os.path.exists(det_model_dir):
-            raise FileNotFoundError(f"检测模型路径不存在：{det_model_dir}")
-        if not os.path.exists(rec_model_dir):
-            raise FileNotFoundError(f"识别模型路径不存在：{rec_model_dir}")
-        if not os.path.exists(cls_model_dir):
-            raise FileNotFoundError(f"分类模型路径不存在：{cls_model_dir}")
-
-        self.ocr = PaddleOCR(lang=lang,
-                             show_log=False,
-                             det_model_dir=det_model_dir,
-                             rec_model_dir=rec_model_dir,
-                             cls_model_dir=cls_model_dir,
-                             use_angle_cls=self.use_angle_cls)
+        # 模型参数，OCR 服务的工作进程使用相同参数加载模型
+        self.model_kwargs = dict(lang=lang, det_model_dir=det_model_dir, rec_model_dir=rec_model_dir,
+                                 cls_model_dir=cls_model_dir, use_angle_cls=use_angle_cls, backend=backend)
+        # 识别结果缓存的模型标识
+        self._cache_tag = f"{backend}|{lang}|{det_model_dir}|{rec_model_dir}|{cls_model_dir}|{use_angle_cls}"
+        self._backend: Optional[OcrBackend] = None
+        self._backend_lock = threading.Lock()
+        if not lazy:
+            self.load()
+
+    @property
+    def ocr(self) -> OcrBackend:
+        """OCR 后端，延迟加载时在第一次使用时加载模型"""
+        return self._backend or self.load()
+
+    @property
+    def loaded(self) -> bool:
+        """后端模型是否已加载"""
+        return self._backend is not None
+
+    def load(self) -> OcrBackend:
+        """
+        加载后端模型，已加载时直接返回
+        :return: OcrBackend
+        """
+        with self._backend_lock:
+            if self._backend is None:
+                kwargs = self.model_kwargs
+                self._backend = create_ocr_backend(kwargs["backend"], kwargs["lang"], kwargs["det_model_dir"],
+                                                   kwargs["rec_model_dir"], kwargs["cls_model_dir"],
+                                                   kwargs["use_angle_cls"])
+            return self._backend
+
+    @property
+    def backend_name(self) -> str:
+        """当前使用的 OCR 后端名称"""
+        return self.model_kwargs["backend"]
 
     @staticmethod
     @print_func_time(debug=_DEBUG)
@@ -141,29 +673,88 @@ class OCRTool:
         """
         截取屏幕并保存为图片文件
         :param image_path: 保存的图片路径
-        :param region: 截屏区域，格式为 (x1, y1, x2, y2)
+        :param region: 截屏区域，格式为 (left, top, width, height)，为空时截取全屏
         :return: None
         """
-        if region is None or region == ():
-            # 截取全屏
-            pyautogui.screenshot(image_path)
-        else:
-            # 截取指定区域
-            pyautogui.screenshot(image_path, region=region)
+        from utils.capture_service import capture_service  # 只有截图时才需要，OCR 工作进程不导入截图模块
+        frame = capture_service.grab(tuple(region) if region else None)
+        cv2.imwrite(image_path, frame.image[:, :, :3])
 
         print(f"截图成功：{image_path}, 区域：{region}")
 
     @print_func_time(debug=_DEBUG)
-    def perform_ocr(self, image):
+    def perform_ocr(self, image, use_cache: bool = True):
+        """
+        对指定图片执行OCR识别，OCR 服务已启动时在工作进程中识别并等待结果（等待期间不占用 GIL）
+        :param image: 图片,可以是np.ndarray、数组、文件路径 或 BytesIO 对象
+        :param use_cache: 是否使用识别结果缓存（仅对 np.ndarray 输入有效），相同画面直接返回缓存结果
+        :return: OCR识别结果（来自缓存时不应修改）
         """
-        对指定图片执行OCR识别
+        return self.perform_ocr_async(image, use_cache).result()
+
+    def perform_ocr_async(self, image, use_cache: bool = True) -> Future:
+        """
+        异步执行OCR识别
+        OCR 服务已启动且加载了相同模型时，np.ndarray 图片交给工作进程识别；否则在当前线程识别，返回已完成的 Future
         :param image: 图片,可以是np.ndarray、数组、文件路径 或 BytesIO 对象
-        :return: OCR识别结果
+        :param use_cache: 是否使用识别结果缓存（仅对 np.ndarray 输入有效）
+        :return: Future，结果为 OCR识别结果
         """
         assert isinstance(image, (np.ndarray, list, str, bytes))
+        future = Future()
+        key = None
+        if use_cache and isinstance(image, np.ndarray):
+            key = ocr_result_cache.digest(image, self._cache_tag)
+            result = ocr_result_cache.get(key)
+            if result is not None:
+                print("OCR识别结果命中缓存") if _DEBUG else None
+                future.set_result(result)
+                return future
+
+        if isinstance(image, np.ndarray) and ocr_service.serves(self.model_kwargs):
+            print("提交OCR识别到工作进程...") if _DEBUG else None
+            future = ocr_service.submit(image)
+            if key is not None:
+                future.add_done_callback(lambda f: ocr_result_cache.put(key, f.result())
+                                         if not f.cancelled() and f.exception() is None and f.result() is not None
+                                         else None)
+            return future
+
         print("开始OCR识别...")
-        result = self.ocr.ocr(image, cls=self.use_angle_cls)
-        return result
+        try:
+            result = self.ocr.ocr(image, cls=self.use_angle_cls)
+        except Exception as e:
+            future.set_exception(e)
+            return future
+        if key is not None and result is not None:
+            ocr_result_cache.put(key, result)
+        future.set_result(result)
+        return future
+
+    def perform_ocr_layout(self, image: np.ndarray, region_key=None):
+        """
+        使用文本框缓存执行OCR识别：布局未变化时复用该区域上次检测到的文本框，只对这些文本框批量执行识别模型；
+        首次识别或检测到布局变化时重新检测文本框（参见 OcrLayout.changed）。
+        适合轮询读取位置固定、内容变化的文字（计数器、状态文字），在当前线程中识别，不使用 OCR 服务和识别结果缓存
+        :param image: np.ndarray 图片（RGB）
+        :param region_key: 识别区域的标识，如全局屏幕坐标 (left, top, width, height)
+        :return: OCR识别结果，格式与 perform_ocr 相同
+        """
+        key = (self._cache_tag, region_key)
+        edges = _edge_mask(image)
+        layout = ocr_layout_cache.get(key)
+        if layout is not None and not layout.changed(image, edges):
+            texts = self.ocr.recognize([crop_box(image, box) for box in layout.boxes]) if layout.boxes else []
+            if all(confidence >= LAYOUT_MIN_CONFIDENCE for _, confidence in texts):
+                ocr_layout_cache.reused(layout)
+                print(f"复用 {len(layout.boxes)} 个文本框，只执行识别") if _DEBUG else None
+                return [[[box, text] for box, text in zip(layout.boxes, texts)]]
+
+        print("检测文本框...") if _DEBUG else None
+        boxes = self.ocr.detect(image)
+        texts = self.ocr.recognize([crop_box(image, box) for box in boxes]) if boxes else []
+        ocr_layout_cache.put(key, OcrLayout(boxes, image.shape[:2], edges, _outside_mask(edges.shape, boxes)))
+        return [[[box, text] for box, text in zip(boxes, texts)]]
 
     @staticmethod
     def draw_results(image_path: str, results,
@@ -7,8 +7,28 @@
 @officialWebsite: https://github.com/54Coconi
 @description:
     - Opencv 函数封装
+    - 模板图片解码缓存（LRU + 字节预算）
+    - 截图 ndarray 零拷贝送入匹配（不再写临时 PNG），调试转储在后台线程执行
+    - 金字塔（由粗到精）模板匹配
+    - 同一帧截图并发匹配多个模板
+    - 查找模板的所有匹配位置（向量化非极大值抑制）
+    - 帧摘要（判断画面是否变化，用于跳过重复匹配）
+    - 彩色 / 灰度 / 边缘图三种匹配模式，模板预处理结果缓存
+    - 多尺度匹配（适配 DPI 缩放），按模板和显示器缓存命中的缩放比例
+    - 可插拔的匹配后端：模板匹配、ORB / AKAZE 特征点匹配（模板特征缓存），共用 MatchResult 结果类型
 """
+import os
+import math
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
 import cv2
+import numpy as np
 
 # 颜色字典(BGR格式)
 COLORS = {
@@ -25,6 +45,41 @@ COLORS = {
     'orange': (0, 165, 255)
 }
 
+# 模板缓存的字节预算(默认 64MB)与最大条目数
+TEMPLATE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+TEMPLATE_CACHE_MAX_ENTRIES = 128
+
+# 调试转储截图的默认保存路径
+DEBUG_DUMP_PATH = "Temp/temp.png"
+
+# 金字塔匹配参数：粗匹配候选数量、缩小后模板的最小边长（小于该值时退化为全分辨率匹配）
+PYRAMID_TOP_K = 3
+PYRAMID_MIN_TEMPLATE_SIZE = 12
+
+# 匹配模式：彩色、灰度、Canny 边缘图
+MATCH_MODES = ("color", "gray", "edge")
+# 边缘图匹配的 Canny 阈值
+CANNY_LOW_THRESHOLD = 50
+CANNY_HIGH_THRESHOLD = 150
+
+# 多尺度匹配时尝试的模板缩放比例（模板在 100% 缩放下截取时，125% 的显示器需要将模板放大 1.25 倍）
+MATCH_SCALES = (1.0, 1.25, 1.5, 1.75, 2.0, 0.8, 0.67, 0.5)
+
+# 特征点匹配参数：截图最多提取的特征点数量、Lowe 比率测试阈值、最少内点数量、最低内点比例
+FEATURE_MAX_KEYPOINTS = 5000
+FEATURE_RATIO_TEST = 0.75
+FEATURE_MIN_INLIERS = 10
+FEATURE_MIN_INLIER_RATIO = 0.3
+
+# 多模板匹配的线程数（cv2.matchTemplate 执行时会释放 GIL）
+MATCH_WORKERS = min(4, os.cpu_count() or 1)
+
+# 查找全部匹配位置时，两个匹配框的交并比超过该值即视为同一目标
+NMS_OVERLAP_THRESHOLD = 0.3
+
+# 计算帧摘要时的抽样步长（每隔 N 行、N 列取一个像素）
+FRAME_DIGEST_STEP = 4
+
 '''
 ########################################################
 ------------------- decorator functions ----------------
@@ -80,6 +135,238 @@ def rescaleFrame(frame, scale=0.75):
     return cv2.resize(frame, dimensions, interpolation=cv2.INTER_AREA)
 
 
+'''
+########################################################
+------------------- template cache ---------------------
+########################################################
+'''
+
+
+@dataclass
+class TemplateEntry:
+    """
+    已解码的模板图片缓存项
+
+    Attributes:
+        path:(str): 模板图片的绝对路径
+        bgr:(np.ndarray): BGR 彩色图像
+        gray:(np.ndarray): 灰度图像
+        height:(int): 模板高度
+        width:(int): 模板宽度
+        mean:(tuple): 各通道均值 (B, G, R)
+        std:(tuple): 各通道标准差 (B, G, R)
+        variants:(dict): 按需生成的派生数据（如其它通道顺序、边缘图等），由 :meth:`TemplateCache.variant` 维护
+    """
+    path: str
+    bgr: np.ndarray
+    gray: np.ndarray
+    height: int
+    width: int
+    mean: tuple
+    std: tuple
+    variants: dict = field(default_factory=dict)
+
+    @property
+    def nbytes(self) -> int:
+        """缓存项占用的字节数（包括派生数据中的 ndarray）"""
+        size = self.bgr.nbytes + self.gray.nbytes
+        for value in self.variants.values():
+            if isinstance(value, np.ndarray):
+                size += value.nbytes
+            elif isinstance(value, TemplateEntry):  # 缩放后的模板
+                size += value.nbytes
+            elif isinstance(value, tuple):  # 如特征点坐标和描述子
+                size += sum(v.nbytes for v in value if isinstance(v, np.ndarray))
+        return size
+
+
+class TemplateCache:
+    """
+    进程级模板图片缓存
+
+    以 (绝对路径, 修改时间, 文件大小) 作为缓存签名，文件被修改后自动重新解码；
+    使用 LRU 策略淘汰，同时受最大条目数和字节预算约束。
+    线程安全，可在多个执行线程之间共享。
+    """
+
+    def __init__(self, max_bytes: int = TEMPLATE_CACHE_MAX_BYTES, max_entries: int = TEMPLATE_CACHE_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[tuple, TemplateEntry]] = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0  # 命中次数
+        self.misses = 0  # 未命中次数（包括文件变化导致的重新解码）
+        self.evictions = 0  # 淘汰次数
+
+    @staticmethod
+    def _signature(path: str) -> tuple:
+        """获取文件签名 (修改时间, 文件大小)"""
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+
+    def get(self, path: str) -> TemplateEntry:
+        """
+        获取模板图片的缓存项，未命中时解码并加入缓存
+        :param path: 模板图片路径
+        :return: :class:`TemplateEntry`
+        :raises FileNotFoundError: 模板图片不存在或无法解码
+        """
+        abs_path = os.path.abspath(path)
+        try:
+            signature = self._signature(abs_path)
+        except OSError:
+            raise FileNotFoundError(f"模板图片 ‘{path}’ 不存在")
+
+        with self._lock:
+            cached = self._entries.get(abs_path)
+            if cached is not None and cached[0] == signature:
+                self._entries.move_to_end(abs_path)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        entry = self._decode(abs_path)
+
+        with self._lock:
+            self._entries[abs_path] = (signature, entry)
+            self._entries.move_to_end(abs_path)
+            self._evict()
+        return entry
+
+    @staticmethod
+    def _decode(abs_path: str) -> TemplateEntry:
+        """解码模板图片并预计算灰度图、尺寸及统计信息"""
+        bgr = readImageColor(abs_path)
+        if bgr is None:
+            raise FileNotFoundError(f"无法读取模板图片 ‘{abs_path}’")
+        return TemplateCache._fromBGR(abs_path, bgr)
+
+    @staticmethod
+    def _fromBGR(abs_path: str, bgr: np.ndarray) -> TemplateEntry:
+        """由 BGR 图像构建缓存项"""
+        gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+        mean, std = cv2.meanStdDev(bgr)
+        height, width = bgr.shape[:2]
+        return TemplateEntry(path=abs_path, bgr=bgr, gray=gray, height=height, width=width,
+                             mean=tuple(float(v) for v in mean.ravel()),
+                             std=tuple(float(v) for v in std.ravel()))
+
+    def variant(self, entry: TemplateEntry, key, factory):
+        """
+        获取缓存项的派生数据，不存在时调用 factory(entry) 生成并计入字节预算
+        :param entry: 缓存项
+        :param key: 派生数据的键
+        :param factory: 生成函数
+        :return: 派生数据
+        """
+        value = entry.variants.get(key)
+        if value is None:
+            value = factory(entry)
+            with self._lock:
+                entry.variants[key] = value
+                self._evict()
+        return value
+
+    def _evict(self) -> None:
+        """按 LRU 顺序淘汰，直到满足条目数和字节预算（至少保留最近使用的一项）"""
+        total = sum(entry.nbytes for _, entry in self._entries.values())
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or total > self.max_bytes):
+            _, (_, evicted) = self._entries.popitem(last=False)
+            total -= evicted.nbytes
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """清空缓存及统计计数"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """
+        获取缓存统计信息，用于调优缓存大小
+        :return: {'hits', 'misses', 'evictions', 'entries', 'bytes', 'hit_rate'}
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": sum(entry.nbytes for _, entry in self._entries.values()),
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+# 全局模板缓存实例
+template_cache = TemplateCache()
+
+
+def scaledTemplate(template: TemplateEntry, scale: float) -> TemplateEntry:
+    """
+    获取按比例缩放后的模板，缩放结果作为派生数据保存在原模板的缓存项中
+    :param template: 模板缓存项 :class:`TemplateEntry`
+    :param scale: 缩放比例
+    :return: 缩放后的 :class:`TemplateEntry`（scale 为 1 时返回原缓存项）
+    """
+    if scale == 1.0:
+        return template
+    interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+    return template_cache.variant(
+        template, ("scale", scale),
+        lambda entry: TemplateCache._fromBGR(
+            entry.path, cv2.resize(entry.bgr, None, fx=scale, fy=scale, interpolation=interpolation)))
+
+
+class ScaleCache:
+    """
+    多尺度匹配命中的缩放比例缓存，按 (模板路径, 显示器) 记录
+    同一显示器的 DPI 缩放一般不会改变，之后只需尝试缓存的缩放比例
+    """
+
+    def __init__(self):
+        self._scales: dict[tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, templatePath: str, monitorKey: str):
+        """获取缓存的缩放比例，不存在时返回 None"""
+        with self._lock:
+            return self._scales.get((os.path.abspath(templatePath), monitorKey))
+
+    def set(self, templatePath: str, monitorKey: str, scale: float) -> None:
+        """记录命中的缩放比例"""
+        with self._lock:
+            self._scales[(os.path.abspath(templatePath), monitorKey)] = scale
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._scales.clear()
+
+
+# 全局缩放比例缓存实例
+scale_cache = ScaleCache()
+
+
+def templateForMode(template: TemplateEntry, mode="color"):
+    """
+    获取模板在指定匹配模式下的图像，边缘图只计算一次并保存在模板缓存中
+    :param template: 模板缓存项 :class:`TemplateEntry`
+    :param mode: 匹配模式，见 MATCH_MODES
+    :return: 预处理后的模板 np.ndarray
+    :raises ValueError: 不支持的匹配模式，或边缘模式下模板没有可用的边缘
+    """
+    if mode == "color":
+        return template.bgr
+    if mode == "gray":
+        return template.gray
+    if mode == "edge":
+        edges = template_cache.variant(template, ("mode", "edge"), lambda entry: edgeMap(entry.gray))
+        if not edges.any():
+            raise ValueError(f"模板图片 ‘{template.path}’ 没有明显的边缘，无法使用边缘匹配")
+        return edges
+    raise ValueError(f"不支持的匹配模式: {mode}，可选值为 {MATCH_MODES}")
+
 '''
 ########################################################
 ------------------- image functions --------------------
@@ -87,6 +374,94 @@ def rescaleFrame(frame, scale=0.75):
 '''
 
 
+# 单线程的调试转储执行器，避免阻塞匹配流程
+_dump_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="opencv-dump")
+# 多模板匹配执行器
+_match_executor = ThreadPoolExecutor(max_workers=MATCH_WORKERS, thread_name_prefix="opencv-match")
+
+
+def _writeImage(path, image):
+    """写入图片文件，必要时创建目录"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    cv2.imwrite(path, image)
+
+
+def dumpImageAsync(image, path=DEBUG_DUMP_PATH):
+    """
+    在后台线程中保存图片（用于调试），调用方立即返回
+    :param image: BGR 或 BGRA 格式的 np.ndarray，会先复制一份，避免截图缓冲区被后续修改
+    :param path: 保存路径
+    :return: concurrent.futures.Future
+    """
+    return _dump_executor.submit(_writeImage, path, np.array(image, copy=True))
+
+
+# 将待匹配图像统一为 BGR 通道顺序
+def toBGR(image):
+    """
+    将待匹配图像统一为 BGR 通道顺序，通道顺序只在这里判定一次:
+        - str: 图片路径，使用 cv2.imread 读取（BGR）
+        - 4 通道 ndarray: mss 原生 BGRA 缓冲区，直接返回去掉 alpha 的视图（零拷贝）
+        - 3 通道 ndarray: RGB 截图（如 ScreenshotTool.get_image_as_numpy_array、pyautogui），转换为 BGR
+        - 2 维 ndarray: 灰度图，转换为 BGR
+    :param image: 图片路径或 np.ndarray
+    :return: BGR 格式的 np.ndarray（可能是原缓冲区的视图）
+    """
+    if isinstance(image, str):
+        return readImageColor(image)
+    if image.ndim == 2:
+        return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    if image.shape[2] == 4:
+        return image[:, :, :3]
+    return cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+
+
+# 将待匹配图像转换为灰度图
+def toGray(image):
+    """
+    将待匹配图像转换为灰度图，通道顺序的约定与 :func:`toBGR` 相同；
+    BGRA 缓冲区直接转换为灰度，不经过 BGR 中间图
+    :param image: 图片路径或 np.ndarray
+    :return: 单通道 np.ndarray
+    """
+    if isinstance(image, str):
+        return cv2.cvtColor(readImageColor(image), cv2.COLOR_BGR2GRAY)
+    if image.ndim == 2:
+        return image
+    if image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY)
+    return cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+
+
+# 计算边缘图
+def edgeMap(gray):
+    """
+    使用 Canny 算子计算灰度图的边缘图
+    :param gray: 单通道 np.ndarray
+    :return: 单通道二值边缘图
+    """
+    return cv2.Canny(gray, CANNY_LOW_THRESHOLD, CANNY_HIGH_THRESHOLD)
+
+
+# 按匹配模式预处理待匹配图像
+def prepareImage(image, mode="color"):
+    """
+    按匹配模式预处理待匹配图像
+    :param image: 图片路径或 np.ndarray（通道顺序见 :func:`toBGR`）
+    :param mode: 匹配模式，见 MATCH_MODES
+    :return: 预处理后的 np.ndarray
+    """
+    if mode == "color":
+        return toBGR(image)
+    if mode == "gray":
+        return toGray(image)
+    if mode == "edge":
+        return edgeMap(toGray(image))
+    raise ValueError(f"不支持的匹配模式: {mode}，可选值为 {MATCH_MODES}")
+
+
 # 读取彩色图片
 def readImageColor(imagePath):
     """
@@ -120,15 +495,10 @@ def drawRectangle(imagePath, templateImgPath, threshold=0.8,
         - log[2]：这是最小值的坐标位置，即相似度最低的点在图像中的位置。
         - log[3]：这是最大值的坐标位置，即相似度最高的点在图像中的位置。
     """
-    # 读取图片
-    if isinstance(imagePath, str):
-        image = readImageColor(imagePath)
-    else:
-        # imagePath 为 np.ndarray
-        image = cv2.cvtColor(imagePath, cv2.COLOR_BGR2RGB)
-        cv2.imwrite("temp.png", image)  # 保存全屏截图为临时文件
+    # 读取图片，绘制前需要一份连续的内存，避免修改截图缓冲区
+    image = np.ascontiguousarray(toBGR(imagePath))
 
-    templateImg = readImageColor(templateImgPath)
+    templateImg = template_cache.get(templateImgPath).bgr
     # 使用模板匹配在大图中寻找小图的位置，cv2.TM_CCOEFF_NORMED 表示使用归一化相关系数匹配方法
     result = cv2.matchTemplate(image, templateImg, cv2.TM_CCOEFF_NORMED)
     # 使用cv2.minMaxLoc找出匹配结果中的最小值和最大值及它们的位置
@@ -148,35 +518,124 @@ def drawRectangle(imagePath, templateImgPath, threshold=0.8,
     return None, loc[1]
 
 
+# 全分辨率模板匹配，返回最佳位置
+def _matchFull(image, templateImg):
+    """
+    全分辨率模板匹配
+    :param image: 待匹配图像
+    :param templateImg: 模板图像
+    :return: (top_left, score) - 最佳匹配的左上角坐标和匹配度
+    """
+    result = cv2.matchTemplate(image, templateImg, cv2.TM_CCOEFF_NORMED)
+    _, max_val, _, max_loc = cv2.minMaxLoc(result)
+    return max_loc, max_val
+
+
+# 金字塔（由粗到精）模板匹配
+def pyramidMatch(image, template: TemplateEntry, scale=0.5, topK=PYRAMID_TOP_K, mode="color"):
+    """
+    金字塔（由粗到精）模板匹配：
+        1. 将截图和模板同时缩小 scale 倍，在小图上做一次完整匹配，取匹配度最高的 topK 个候选位置；
+        2. 回到全分辨率，仅在每个候选位置周围的小窗口内重新匹配，返回最佳结果。
+
+    返回的匹配度来自全分辨率精匹配，因此与普通匹配使用同一套阈值语义。
+
+    精度与耗时的取舍:
+        - 粗匹配的理论计算量约为全分辨率匹配的 scale^4，另有一次截图缩放和 topK 个小窗口的精匹配，
+          2560x1440 截图、scale=0.5 时实测总耗时约为全分辨率匹配的 1/4～1/5；
+        - 模板中的细线、小字等细节在缩小后可能丢失，若真实位置不在粗匹配的前 topK 个候选中就会漏检；
+          屏幕上存在大量相似元素时建议增大 topK，细节很少的小模板建议关闭金字塔匹配；
+        - 缩小后的模板边长小于 PYRAMID_MIN_TEMPLATE_SIZE 时自动退化为全分辨率匹配。
+
+    :param image: 已按 mode 预处理的待匹配图像（见 :func:`prepareImage`）
+    :param template: 模板缓存项 :class:`TemplateEntry`
+    :param scale: 缩小比例 (0, 1)
+    :param topK: 粗匹配保留的候选数量
+    :param mode: 匹配模式，见 MATCH_MODES
+    :return: (top_left, score) - 最佳匹配的左上角坐标和匹配度
+    """
+    templateImg = templateForMode(template, mode)
+    t_h, t_w = templateImg.shape[:2]
+    i_h, i_w = image.shape[:2]
+    if not 0 < scale < 1 or min(t_h, t_w) * scale < PYRAMID_MIN_TEMPLATE_SIZE:
+        return _matchFull(image, templateImg)
+
+    # 缩小后的模板只计算一次，保存在模板缓存中
+    smallTemplate = template_cache.variant(
+        template, ("pyramid", mode, scale),
+        lambda _: cv2.resize(templateImg, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA))
+    smallImage = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    if smallImage.shape[0] < smallTemplate.shape[0] or smallImage.shape[1] < smallTemplate.shape[1]:
+        return _matchFull(image, templateImg)
+
+    # 1. 粗匹配：取前 topK 个峰值，每取一个就抑制其邻域
+    coarse = cv2.matchTemplate(smallImage, smallTemplate, cv2.TM_CCOEFF_NORMED)
+    s_h, s_w = smallTemplate.shape[:2]
+    candidates = []
+    for _ in range(max(1, topK)):
+        _, max_val, _, (x, y) = cv2.minMaxLoc(coarse)
+        candidates.append((x, y))
+        coarse[max(0, y - s_h // 2):y + s_h // 2 + 1, max(0, x - s_w // 2):x + s_w // 2 + 1] = -1.0
+
+    # 2. 精匹配：在全分辨率下只搜索候选位置附近的窗口
+    margin = int(round(2 / scale)) + 2
+    best_loc, best_val = (0, 0), -1.0
+    for x, y in candidates:
+        fx, fy = int(round(x / scale)), int(round(y / scale))
+        left, top = max(0, fx - margin), max(0, fy - margin)
+        right, bottom = min(i_w, fx + t_w + margin), min(i_h, fy + t_h + margin)
+        if right - left < t_w or bottom - top < t_h:
+            continue
+        (lx, ly), val = _matchFull(image[top:bottom, left:right], templateImg)
+        if val > best_val:
+            best_loc, best_val = (left + lx, top + ly), val
+    return best_loc, best_val
+
+
+# 在 BGR 图像中定位模板
+def _locateTemplate(image, template: TemplateEntry, pyramid=False, pyramidScale=0.5, mode="color"):
+    """
+    在预处理后的图像中定位模板，返回最佳匹配的左上角坐标和匹配度
+    :param image: 已按 mode 预处理的待匹配图像（见 :func:`prepareImage`）
+    :param template: 模板缓存项 :class:`TemplateEntry`
+    :param pyramid: 是否使用金字塔（由粗到精）匹配
+    :param pyramidScale: 金字塔匹配时的缩小比例
+    :param mode: 匹配模式，见 MATCH_MODES
+    :return: (top_left, score)
+    :raises ValueError: 待匹配图像小于模板图片
+    """
+    if image.shape[0] < template.height or image.shape[1] < template.width:
+        raise ValueError(f"搜索区域 {image.shape[1]}x{image.shape[0]} 小于模板图片 {template.width}x{template.height}")
+    # 使用模板匹配在大图中寻找小图的位置，cv2.TM_CCOEFF_NORMED 表示使用归一化相关系数匹配方法
+    if pyramid:
+        return pyramidMatch(image, template, pyramidScale, mode=mode)
+    return _matchFull(image, templateForMode(template, mode))
+
+
 # 获取匹配到的图像的中心坐标
-def centerPosition(imagePath, templateImgPath, threshold):
+def centerPosition(imagePath, templateImgPath, threshold, debugDump=False, pyramid=False, pyramidScale=0.5,
+                   mode="color"):
     """
     获取匹配到的图像的中心坐标,使用归一化相关系数匹配方法(cv2.TM_CCOEFF_NORMED)
-    :param imagePath: 待匹配图片路径
+    :param imagePath: 待匹配图片路径或 np.ndarray（通道顺序见 :func:`toBGR`，BGRA 缓冲区不会被复制）
     :param templateImgPath: 作为匹配模板的图片路径
     :param threshold: 匹配模板图片的阈值
+    :param debugDump: 是否在后台线程中将截图保存到 DEBUG_DUMP_PATH（仅用于调试）
+    :param pyramid: 是否使用金字塔（由粗到精）匹配，精度与耗时的取舍见 :func:`pyramidMatch`
+    :param pyramidScale: 金字塔匹配时的缩小比例
+    :param mode: 匹配模式，"color" 彩色、"gray" 灰度（约 1/3 的计算量）、"edge" Canny 边缘图（对主题配色变化不敏感）
     :return: (center_x, center_y), log[1] - 返回匹配到的图像的中心坐标和最大相似度的阈值log[1];
     如果未匹配成功则返回 None 和最大相似度的阈值log[1]
     """
-    # 读取图片
-    if isinstance(imagePath, str):
-        image = readImageColor(imagePath)
-    else:
-        # imagePath 为 np.ndarray
-        image = cv2.cvtColor(imagePath, cv2.COLOR_BGR2RGB)
-        cv2.imwrite("Temp/temp.png", image)  # 保存全屏截图为临时文件
-    templateImg = readImageColor(templateImgPath)
-    # 使用模板匹配在大图中寻找小图的位置，cv2.TM_CCOEFF_NORMED 表示使用归一化相关系数匹配方法
-    result = cv2.matchTemplate(image, templateImg, cv2.TM_CCOEFF_NORMED)
-    # 使用cv2.minMaxLoc找出匹配结果中的最小值和最大值及它们的位置
-    loc = cv2.minMaxLoc(result)
-    if loc[1] >= threshold:
-        # 获取模板匹配到的左上角坐标
-        topLeft = loc[3]
+    # 读取图片并按匹配模式预处理
+    image = prepareImage(imagePath, mode)
+    if debugDump:
+        dumpImageAsync(image)
+    template = template_cache.get(templateImgPath)  # 从缓存中获取已解码的模板图片
+    topLeft, maxVal = _locateTemplate(image, template, pyramid, pyramidScale, mode)
+    if maxVal >= threshold:
         # 获取模板图片的高度和宽度
-        # templateImg.shape 返回一个包含图像维度的元组。对于彩色图像，这个返回值通常是三个元素的元组
-        # (高度, 宽度, 颜色通道数)。:2 是一个切片操作符，它获取元组中的第一个元素和第二个元素
-        templateImgHeight, templateImgWidth = templateImg.shape[:2]
+        templateImgHeight, templateImgWidth = template.height, template.width
         print(f"[INFO] - (centerPosition) 匹配成功，模板图片的高度为 {templateImgHeight},宽度为 {templateImgWidth}")
         # 计算匹配到的图片的中心横坐标
         center_x = topLeft[0] + templateImgWidth / 2
@@ -184,9 +643,366 @@ def centerPosition(imagePath, templateImgPath, threshold):
         center_y = topLeft[1] + templateImgHeight / 2
         # 返回中心坐标
         print(f"[INFO] - (centerPosition) 模板图片中心坐标为 ({center_x}, {center_y})")
-        return (center_x, center_y), loc[1]
+        return (center_x, center_y), maxVal
     # 未匹配成功
-    return None, loc[1]
+    return None, maxVal
+
+
+# 多尺度匹配的缩放比例尝试顺序
+def orderScales(scales=MATCH_SCALES, preferredScale=1.0):
+    """
+    确定多尺度匹配时缩放比例的尝试顺序：首选比例（一般为检测到的 DPI 缩放比例）、1.0，
+    其余按与首选比例的差距从小到大排列
+    :param scales: 候选缩放比例
+    :param preferredScale: 首选缩放比例，不在候选范围内时忽略
+    :return: 排好序的缩放比例列表
+    """
+    rest = sorted(set(scales), key=lambda s: (abs(math.log(s / preferredScale)), s))
+    first = [s for s in (preferredScale, 1.0) if s in rest]
+    return list(dict.fromkeys(first + rest))
+
+
+# 多尺度匹配
+def multiScaleMatch(imagePath, templateImgPath, threshold, scales=MATCH_SCALES, preferredScale=1.0,
+                    monitorKey=None, debugDump=False, pyramid=False, pyramidScale=0.5, mode="color"):
+    """
+    多尺度模板匹配：按 :func:`orderScales` 的顺序依次缩放模板进行匹配，匹配度达到阈值即停止。
+    传入 monitorKey 时，命中的缩放比例按 (模板, 显示器) 缓存，之后只尝试该比例，未命中时才重新遍历其它比例。
+    :param imagePath: 待匹配图片路径或 np.ndarray（通道顺序见 :func:`toBGR`）
+    :param templateImgPath: 作为匹配模板的图片路径
+    :param threshold: 匹配度阈值
+    :param scales: 候选缩放比例
+    :param preferredScale: 首选缩放比例（一般为检测到的 DPI 缩放比例）
+    :param monitorKey: 截图所在显示器的标识，None 表示不使用缓存
+    :param debugDump: 是否在后台线程中将截图保存到 DEBUG_DUMP_PATH（仅用于调试）
+    :param pyramid: 是否使用金字塔（由粗到精）匹配
+    :param pyramidScale: 金字塔匹配时的缩小比例
+    :param mode: 匹配模式，见 MATCH_MODES
+    :return: ((center_x, center_y) | None, maxVal, scale) - 中心坐标、最高匹配度及其对应的缩放比例
+    """
+    image = prepareImage(imagePath, mode)
+    if debugDump:
+        dumpImageAsync(image)
+    template = template_cache.get(templateImgPath)
+    order = orderScales(scales, preferredScale)
+    cached = scale_cache.get(templateImgPath, monitorKey) if monitorKey is not None else None
+    if cached is not None:
+        order = [cached] + [s for s in order if s != cached]
+
+    best_val, best_scale = -1.0, order[0]
+    for scale in order:
+        # 缩放前先按 cv2.resize 的取整方式计算尺寸，缩放后不足 1 像素的比例在 resize 中就会报错
+        height, width = round(template.height * scale), round(template.width * scale)
+        if height > image.shape[0] or width > image.shape[1] or min(height, width) < 1:
+            continue
+        scaled = scaledTemplate(template, scale)
+        topLeft, maxVal = _locateTemplate(image, scaled, pyramid, pyramidScale, mode)
+        if maxVal > best_val:
+            best_val, best_scale = maxVal, scale
+        if maxVal >= threshold:
+            if monitorKey is not None and scale != cached:
+                scale_cache.set(templateImgPath, monitorKey, scale)
+            print(f"[INFO] - (multiScaleMatch) 匹配成功，缩放比例为 {scale}，匹配度为 {maxVal:.3f}")
+            return (topLeft[0] + scaled.width / 2, topLeft[1] + scaled.height / 2), maxVal, scale
+    return None, best_val, best_scale
+
+
+# 在同一帧截图中并发匹配多个模板
+def matchTemplates(imagePath, templateImgPaths, threshold, debugDump=False, pyramid=False, pyramidScale=0.5,
+                   mode="color"):
+    """
+    在同一帧截图中匹配多个模板：截图只做一次通道转换，各模板的匹配在线程池中并发执行
+    :param imagePath: 待匹配图片路径或 np.ndarray（通道顺序见 :func:`toBGR`）
+    :param templateImgPaths: 模板图片路径列表
+    :param threshold: 匹配度阈值，对所有模板生效
+    :param debugDump: 是否在后台线程中将截图保存到 DEBUG_DUMP_PATH（仅用于调试）
+    :param pyramid: 是否使用金字塔（由粗到精）匹配
+    :param pyramidScale: 金字塔匹配时的缩小比例
+    :param mode: 匹配模式，见 MATCH_MODES
+    :return: [((center_x, center_y) | None, maxVal), ...] - 与 templateImgPaths 一一对应
+    """
+    # 预处理后转为连续内存，所有模板共享同一份图像
+    image = np.ascontiguousarray(prepareImage(imagePath, mode))
+    if debugDump:
+        dumpImageAsync(image)
+    templates = [template_cache.get(path) for path in templateImgPaths]
+
+    def match(template: TemplateEntry):
+        topLeft, maxVal = _locateTemplate(image, template, pyramid, pyramidScale, mode)
+        if maxVal < threshold:
+            return None, maxVal
+        return (topLeft[0] + template.width / 2, topLeft[1] + template.height / 2), maxVal
+
+    if len(templates) == 1:
+        return [match(templates[0])]
+    return list(_match_executor.map(match, templates))
+
+
+# 对等大小的匹配框做非极大值抑制
+def nonMaxSuppression(xs, ys, scores, width, height, overlap=NMS_OVERLAP_THRESHOLD, maxResults=None):
+    """
+    对宽高相同的候选匹配框做贪心非极大值抑制（与已保留框的交并比一次性向量化计算）
+    :param xs: 候选框左上角横坐标数组
+    :param ys: 候选框左上角纵坐标数组
+    :param scores: 候选框匹配度数组
+    :param width: 匹配框宽度
+    :param height: 匹配框高度
+    :param overlap: 交并比阈值，超过该值的低分框被抑制
+    :param maxResults: 最多保留的数量，None 表示不限制
+    :return: 保留下来的候选框下标数组（按匹配度从高到低）
+    """
+    order = np.argsort(scores)[::-1]
+    xs, ys = np.asarray(xs)[order], np.asarray(ys)[order]
+    area = float(width * height)
+    keep = []
+    alive = np.ones(len(order), dtype=bool)
+    for i in range(len(order)):
+        if not alive[i]:
+            continue
+        keep.append(order[i])
+        if maxResults is not None and len(keep) >= maxResults:
+            break
+        # 等大小框的交集面积只由坐标差决定
+        inter_w = np.clip(width - np.abs(xs[i + 1:] - xs[i]), 0, None)
+        inter_h = np.clip(height - np.abs(ys[i + 1:] - ys[i]), 0, None)
+        inter = inter_w * inter_h
+        alive[i + 1:] &= inter / (2 * area - inter) <= overlap
+    return np.array(keep, dtype=np.int64)
+
+
+# 查找模板图片的所有匹配位置
+def findAllPositions(imagePath, templateImgPath, threshold, maxResults=20, sortBy="score",
+                     overlap=NMS_OVERLAP_THRESHOLD, debugDump=False, mode="color"):
+    """
+    查找模板图片在截图中的所有匹配位置（如一排相同的图标、列表项）:
+        1. 对完整的匹配结果图用 NumPy 按阈值筛选，并只保留 3x3 邻域内的局部极大值，大幅减少候选数量；
+        2. 对候选框做向量化非极大值抑制，去掉同一目标附近的重复匹配；
+        3. 保留匹配度最高的 maxResults 个结果，再按匹配度或位置排序。
+    :param imagePath: 待匹配图片路径或 np.ndarray（通道顺序见 :func:`toBGR`）
+    :param templateImgPath: 作为匹配模板的图片路径
+    :param threshold: 匹配度阈值
+    :param maxResults: 最多返回的匹配数量
+    :param sortBy: 排序方式，"score" 按匹配度从高到低，"position" 按从上到下、从左到右
+    :param overlap: 非极大值抑制的交并比阈值
+    :param debugDump: 是否在后台线程中将截图保存到 DEBUG_DUMP_PATH（仅用于调试）
+    :param mode: 匹配模式，见 MATCH_MODES
+    :return: [((center_x, center_y), score), ...]，未匹配成功时返回空列表
+    """
+    if sortBy not in ("score", "position"):
+        raise ValueError(f"不支持的排序方式: {sortBy}，可选值为 'score'、'position'")
+    image = prepareImage(imagePath, mode)
+    if debugDump:
+        dumpImageAsync(image)
+    template = template_cache.get(templateImgPath)
+    if image.shape[0] < template.height or image.shape[1] < template.width:
+        raise ValueError(f"搜索区域 {image.shape[1]}x{image.shape[0]} 小于模板图片 {template.width}x{template.height}")
+
+    result = cv2.matchTemplate(image, templateForMode(template, mode), cv2.TM_CCOEFF_NORMED)
+    # 阈值筛选 + 局部极大值，避免同一目标周围的大量相邻像素进入非极大值抑制
+    peaks = (result >= threshold) & (result >= cv2.dilate(result, np.ones((3, 3), np.uint8)))
+    ys, xs = np.nonzero(peaks)
+    if len(xs) == 0:
+        return []
+    scores = result[ys, xs]
+    keep = nonMaxSuppression(xs, ys, scores, template.width, template.height, overlap, maxResults)
+    xs, ys, scores = xs[keep], ys[keep], scores[keep]
+    if sortBy == "position":
+        order = np.lexsort((xs, ys))  # 先按纵坐标，再按横坐标
+        xs, ys, scores = xs[order], ys[order], scores[order]
+    return [((int(x) + template.width / 2, int(y) + template.height / 2), float(score))
+            for x, y, score in zip(xs, ys, scores)]
+
+
+# 计算帧摘要
+def frameDigest(image, step=FRAME_DIGEST_STEP):
+    """
+    按步长抽样计算图像摘要，用于低成本地判断两帧画面是否发生变化（摘要相同即视为未变化）
+    抽样后的数据量约为原图的 1/step^2；宽高都小于 step 像素的局部变化可能检测不到
+    :param image: np.ndarray 图像（任意通道数）
+    :param step: 抽样步长
+    :return: bytes - 摘要
+    """
+    sample = np.ascontiguousarray(image[::step, ::step])
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(image.shape).encode())
+    digest.update(sample.data)
+    return digest.digest()
+
+
+'''
+#######################################################
+------------------ match backends ---------------------
+#######################################################
+'''
+
+
+@dataclass
+class MatchResult:
+    """
+    匹配结果，各匹配后端共用
+
+    Attributes:
+        center:(tuple | None): 匹配区域中心坐标（截图内坐标），未匹配成功时为 None
+        score:(float): 匹配度，模板匹配为归一化相关系数，特征点匹配为 RANSAC 内点比例（两者不可直接比较）
+        box:(tuple | None): 匹配区域的外接矩形 (left, top, width, height)，未匹配成功时为 None
+        scale:(float): 匹配到的模板缩放比例
+        backend:(str): 匹配后端名称
+    """
+    center: Optional[tuple]
+    score: float
+    box: Optional[tuple] = None
+    scale: float = 1.0
+    backend: str = "template"
+
+    @property
+    def matched(self) -> bool:
+        """是否匹配成功"""
+        return self.center is not None
+
+
+class MatchBackend(ABC):
+    """
+    匹配后端接口，新的后端实现 :meth:`match` 后通过 :func:`registerMatchBackend` 注册即可在指令中按名称选择
+    """
+    name: str = ""
+
+    @abstractmethod
+    def match(self, image, templateImgPath, threshold, **options) -> MatchResult:
+        """
+        在截图中匹配模板图片
+        :param image: 待匹配图片路径或 np.ndarray（通道顺序见 :func:`toBGR`）
+        :param templateImgPath: 模板图片路径
+        :param threshold: 匹配度阈值
+        :param options: 后端相关的参数，不支持的参数直接忽略
+        :return: :class:`MatchResult`
+        """
+        raise NotImplementedError
+
+
+class TemplateMatchBackend(MatchBackend):
+    """
+    模板匹配后端（cv2.TM_CCOEFF_NORMED），支持的参数:
+        mode、pyramid、pyramidScale、multiScale、preferredScale、monitorKey、debugDump
+    """
+    name = "template"
+
+    def match(self, image, templateImgPath, threshold, mode="color", pyramid=False, pyramidScale=0.5,
+              multiScale=False, preferredScale=1.0, monitorKey=None, debugDump=False, **options) -> MatchResult:
+        if multiScale:
+            center, score, scale = multiScaleMatch(image, templateImgPath, threshold,
+                                                   preferredScale=preferredScale, monitorKey=monitorKey,
+                                                   debugDump=debugDump, pyramid=pyramid,
+                                                   pyramidScale=pyramidScale, mode=mode)
+        else:
+            center, score = centerPosition(image, templateImgPath, threshold, debugDump=debugDump,
+                                           pyramid=pyramid, pyramidScale=pyramidScale, mode=mode)
+            scale = 1.0
+        if center is None:
+            return MatchResult(None, score, scale=scale, backend=self.name)
+        template = template_cache.get(templateImgPath)
+        width, height = round(template.width * scale), round(template.height * scale)
+        box = (int(center[0] - width / 2), int(center[1] - height / 2), width, height)
+        return MatchResult(center, score, box, scale, self.name)
+
+
+class FeatureMatchBackend(MatchBackend):
+    """
+    特征点匹配后端（ORB / AKAZE），适用于被部分遮挡或重新渲染（缩放、轻微变形）的模板:
+        1. 模板的特征点和描述子只计算一次，保存在模板缓存中；
+        2. 对截图提取特征点，用汉明距离 KNN 匹配并做 Lowe 比率测试；
+        3. 用 RANSAC 估计相似变换（平移 + 旋转 + 等比缩放），由变换后的模板四角得到匹配区域。
+    匹配度为 RANSAC 内点数占比率测试通过数的比例。界面中重复元素较多时该比例天然偏低，与归一化相关系数的
+    阈值语义不同，因此该后端不使用 threshold 参数，而是以内点数不少于 FEATURE_MIN_INLIERS、
+    内点比例不低于 FEATURE_MIN_INLIER_RATIO 作为匹配成功的条件。
+    细节很少（特征点很少）的模板不适合使用该后端。
+    """
+
+    def __init__(self, algorithm="orb"):
+        if algorithm not in ("orb", "akaze"):
+            raise ValueError(f"不支持的特征点算法: {algorithm}")
+        self.algorithm = algorithm
+        self.name = algorithm
+
+    def _detector(self, maxKeypoints=FEATURE_MAX_KEYPOINTS):
+        """创建特征点检测器（检测器对象不是线程安全的，每次调用单独创建）"""
+        if self.algorithm == "orb":
+            return cv2.ORB_create(nfeatures=maxKeypoints)
+        create = getattr(cv2, "AKAZE_create", None)
+        if create is None:  # OpenCV 5 将 AKAZE 移到了 contrib 模块
+            raise ValueError(f"当前 OpenCV {cv2.__version__} 不支持 AKAZE 特征点，请安装 opencv-contrib-python")
+        return create()
+
+    def templateFeatures(self, template: TemplateEntry):
+        """获取模板的特征点坐标和描述子，保存在模板缓存中"""
+        def compute(entry: TemplateEntry):
+            keypoints, descriptors = self._detector().detectAndCompute(entry.gray, None)
+            points = np.array([kp.pt for kp in keypoints], dtype=np.float32).reshape(-1, 2)
+            return points, descriptors
+        return template_cache.variant(template, ("features", self.algorithm), compute)
+
+    def match(self, image, templateImgPath, threshold, debugDump=False, **options) -> MatchResult:
+        gray = toGray(image)
+        if debugDump:
+            dumpImageAsync(gray)
+        template = template_cache.get(templateImgPath)
+        t_points, t_descriptors = self.templateFeatures(template)
+        if t_descriptors is None or len(t_points) < FEATURE_MIN_INLIERS:
+            raise ValueError(f"模板图片 ‘{template.path}’ 的特征点过少，无法使用特征点匹配")
+
+        keypoints, descriptors = self._detector().detectAndCompute(gray, None)
+        if descriptors is None or len(keypoints) < 2:
+            return MatchResult(None, 0.0, backend=self.name)
+        pairs = cv2.BFMatcher(cv2.NORM_HAMMING).knnMatch(t_descriptors, descriptors, k=2)
+        good = [p[0] for p in pairs if len(p) == 2 and p[0].distance < FEATURE_RATIO_TEST * p[1].distance]
+        if len(good) < FEATURE_MIN_INLIERS:
+            return MatchResult(None, 0.0, backend=self.name)
+
+        src = t_points[[m.queryIdx for m in good]]
+        dst = np.array([keypoints[m.trainIdx].pt for m in good], dtype=np.float32)
+        transform, inliers = cv2.estimateAffinePartial2D(src, dst, method=cv2.RANSAC, ransacReprojThreshold=5.0)
+        if transform is None:
+            return MatchResult(None, 0.0, backend=self.name)
+        inlier_count = int(inliers.sum())
+        score = inlier_count / len(good)
+        scale = float(np.hypot(transform[0, 0], transform[1, 0]))
+        if inlier_count < FEATURE_MIN_INLIERS or score < FEATURE_MIN_INLIER_RATIO or not 0.25 <= scale <= 4:
+            return MatchResult(None, score, scale=scale, backend=self.name)
+
+        # 变换模板的四个角和中心，得到匹配区域
+        h, w = template.height, template.width
+        corners = np.array([[0, 0], [w, 0], [w, h], [0, h], [w / 2, h / 2]], dtype=np.float32)
+        mapped = corners @ transform[:, :2].T + transform[:, 2]
+        left, top = np.floor(mapped[:4].min(axis=0)).astype(int)
+        right, bottom = np.ceil(mapped[:4].max(axis=0)).astype(int)
+        center = (float(mapped[4, 0]), float(mapped[4, 1]))
+        print(f"[INFO] - (FeatureMatchBackend) {self.algorithm} 匹配成功，内点 {inlier_count}/{len(good)}，"
+              f"缩放比例 {scale:.2f}，中心坐标 {center}")
+        return MatchResult(center, score, (int(left), int(top), int(right - left), int(bottom - top)), scale, self.name)
+
+
+# 已注册的匹配后端
+_match_backends: dict[str, MatchBackend] = {}
+
+
+def registerMatchBackend(backend: MatchBackend) -> None:
+    """注册匹配后端，同名后端会被替换"""
+    _match_backends[backend.name] = backend
+
+
+def getMatchBackend(name: str) -> MatchBackend:
+    """
+    按名称获取匹配后端
+    :raises ValueError: 后端不存在
+    """
+    backend = _match_backends.get(name)
+    if backend is None:
+        raise ValueError(f"不支持的匹配后端: {name}，可选值为 {list(_match_backends)}")
+    return backend
+
+
+registerMatchBackend(TemplateMatchBackend())
+registerMatchBackend(FeatureMatchBackend("orb"))
+registerMatchBackend(FeatureMatchBackend("akaze"))
 
 
 '''
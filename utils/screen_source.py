@@ -0,0 +1,292 @@
+"""
+@author: 54Coconi
+@date: 2026-10-16
+@version: 1.0.0
+@path: utils/screen_source.py
+@software: PyCharm 2023.1.2
+@officialWebsite: https://github.com/54Coconi
+@description:
+    截图来源模块
+
+    截图服务从可替换的截图来源中取图：
+        - MssSource: 实时桌面（mss），每个线程持有一个 mss 句柄
+        - ImageSequenceSource: 回放图片序列（目录、通配符或单个文件）
+        - VideoSource: 回放录屏视频（cv2.VideoCapture）
+    回放来源不依赖显示器，可在无桌面环境（CI、基准测试）中复现图片和文字识别指令的执行过程
+"""
+import os
+import glob
+import time
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from utils.screenshot_tool import get_dpi_scale
+
+_DEBUG = False
+
+# 图片序列支持的图片格式
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+# 视频来源支持的视频格式
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mkv", ".mov", ".webm")
+
+
+class ScreenSource(ABC):
+    """
+    截图来源接口
+
+    monitors 与 mss 的约定一致：monitors[0] 为所有显示器的并集，monitors[1:] 为各个显示器
+    """
+    name = ""
+
+    @property
+    @abstractmethod
+    def monitors(self) -> list[dict]:
+        """显示器列表 [{left, top, width, height}, ...]"""
+
+    @property
+    def dpi_scale(self) -> float:
+        """DPI 缩放比例"""
+        return 1.0
+
+    @abstractmethod
+    def grab(self, region: Tuple[int, int, int, int]) -> np.ndarray:
+        """
+        截取区域
+        :param region: 已裁剪到 monitors[0] 范围内的全局坐标 (left, top, width, height)
+        :return: 形状为 (height, width, 4) 的 BGRA 数组
+        """
+
+    def close(self) -> None:
+        """释放资源"""
+
+
+class MssSource(ScreenSource):
+    """实时桌面截图，每个线程首次截图时创建自己的 mss 句柄并一直复用，线程结束后由下一次创建句柄时顺带释放"""
+    name = "mss"
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._handles: dict[threading.Thread, object] = {}  # 线程 -> mss 句柄
+        self._dpi_scale: Optional[float] = None
+
+    def _sct(self):
+        """获取当前线程的 mss 句柄，不存在时创建"""
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            import mss  # 只有实时桌面截图才需要 mss，回放来源可在没有显示器的环境中使用
+            sct = mss.mss()
+            self._local.sct = sct
+            with self._lock:
+                self._release_dead_handles()
+                self._handles[threading.current_thread()] = sct
+            print(f"[DEBUG] - (MssSource) 线程 {threading.current_thread().name} 创建 mss 句柄") if _DEBUG else None
+        return sct
+
+    def _release_dead_handles(self) -> None:
+        """释放已结束线程的 mss 句柄（调用方需持有锁）"""
+        for thread in [t for t in self._handles if not t.is_alive()]:
+            try:
+                self._handles.pop(thread).close()
+            except Exception as e:
+                print(f"[WARN] - (MssSource) 释放 mss 句柄失败: {e}")
+
+    @property
+    def monitors(self) -> list[dict]:
+        return self._sct().monitors
+
+    @property
+    def dpi_scale(self) -> float:
+        if self._dpi_scale is None:
+            self._dpi_scale = get_dpi_scale()
+        return self._dpi_scale
+
+    def grab(self, region: Tuple[int, int, int, int]) -> np.ndarray:
+        shot = self._sct().grab({"left": region[0], "top": region[1], "width": region[2], "height": region[3]})
+        width, height = shot.size
+        return np.frombuffer(shot.raw, dtype=np.uint8).reshape((height, width, 4))
+
+    def close(self) -> None:
+        """释放所有线程的 mss 句柄"""
+        with self._lock:
+            for sct in self._handles.values():
+                try:
+                    sct.close()
+                except Exception as e:
+                    print(f"[WARN] - (MssSource) 释放 mss 句柄失败: {e}")
+            self._handles.clear()
+        self._local = threading.local()
+
+
+class _ReplaySource(ScreenSource, ABC):
+    """
+    回放来源基类，屏幕为单个显示器，左上角为 (0, 0)
+
+    帧的切换方式:
+        - fps 为 0 时，画面停留在当前帧，调用 advance() 切换到下一帧，便于基准测试逐帧复现
+        - fps 大于 0 时，按首次截图以来经过的时间实时回放
+    """
+
+    def __init__(self, fps: float = 0.0, loop: bool = True):
+        self.fps = fps
+        self.loop = loop
+        self._lock = threading.Lock()
+        self._index = 0  # 手动切换时的当前帧序号
+        self._start_time: Optional[float] = None
+        self._frame_index = -1  # 已解码的帧序号
+        self._frame: Optional[np.ndarray] = None  # 已解码的帧（BGRA）
+        self._monitors: Optional[list[dict]] = None
+
+    @property
+    @abstractmethod
+    def frame_count(self) -> int:
+        """总帧数"""
+
+    @abstractmethod
+    def _decode(self, index: int) -> np.ndarray:
+        """解码指定序号的帧，返回 BGR 或 BGRA 数组"""
+
+    @property
+    def monitors(self) -> list[dict]:
+        if self._monitors is None:
+            with self._lock:
+                frame = self._current()
+            monitor = {"left": 0, "top": 0, "width": frame.shape[1], "height": frame.shape[0]}
+            self._monitors = [monitor, dict(monitor)]
+        return self._monitors
+
+    def advance(self, steps: int = 1) -> int:
+        """
+        手动切换帧（fps 为 0 时有效）
+        :return: 切换后的帧序号
+        """
+        with self._lock:
+            self._index = self._wrap(self._index + steps)
+            return self._index
+
+    def _wrap(self, index: int) -> int:
+        """按是否循环播放，把帧序号限制在有效范围内"""
+        count = self.frame_count
+        return index % count if self.loop else min(index, count - 1)
+
+    def _current(self) -> np.ndarray:
+        """获取当前帧（调用方需持有锁）"""
+        if self.fps > 0:
+            if self._start_time is None:
+                self._start_time = time.perf_counter()
+            index = self._wrap(int((time.perf_counter() - self._start_time) * self.fps))
+        else:
+            index = self._index
+        if index != self._frame_index:
+            frame = self._decode(index)
+            self._frame = frame if frame.shape[2] == 4 else cv2.cvtColor(frame, cv2.COLOR_BGR2BGRA)
+            self._frame_index = index
+        return self._frame
+
+    def grab(self, region: Tuple[int, int, int, int]) -> np.ndarray:
+        with self._lock:
+            frame = self._current()
+        left, top, width, height = region
+        # 各帧尺寸不同时，超出当前帧的部分为黑色
+        if top + height > frame.shape[0] or left + width > frame.shape[1]:
+            canvas = np.zeros((top + height, left + width, 4), dtype=np.uint8)
+            h, w = min(frame.shape[0], top + height), min(frame.shape[1], left + width)
+            canvas[:h, :w] = frame[:h, :w]
+            frame = canvas
+        return frame[top:top + height, left:left + width]
+
+
+class ImageSequenceSource(_ReplaySource):
+    """
+    回放图片序列
+
+    Attributes:
+        paths: (list[str]) 按播放顺序排列的图片路径
+    """
+    name = "images"
+
+    def __init__(self, source: str | Sequence[str], fps: float = 0.0, loop: bool = True):
+        """
+        :param source: 图片目录（按文件名排序）、通配符、单个图片路径或图片路径列表
+        :param fps: 回放帧率，为 0 时手动切换
+        :param loop: 播放到最后一帧后是否从头开始
+        """
+        super().__init__(fps, loop)
+        if isinstance(source, str):
+            if os.path.isdir(source):
+                paths = [os.path.join(source, f) for f in sorted(os.listdir(source))]
+            elif os.path.isfile(source):
+                paths = [source]
+            else:
+                paths = sorted(glob.glob(source))
+        else:
+            paths = list(source)
+        self.paths = [p for p in paths if p.lower().endswith(IMAGE_EXTENSIONS)]
+        if not self.paths:
+            raise FileNotFoundError(f"截图来源 ‘{source}’ 中没有图片")
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.paths)
+
+    def _decode(self, index: int) -> np.ndarray:
+        # 使用 imdecode 读取，兼容中文路径
+        image = cv2.imdecode(np.fromfile(self.paths[index], dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+        if image is None:
+            raise ValueError(f"无法读取图片 ‘{self.paths[index]}’")
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        return image
+
+
+class VideoSource(_ReplaySource):
+    """回放录屏视频"""
+    name = "video"
+
+    def __init__(self, video_path: str, fps: float = 0.0, loop: bool = True):
+        """
+        :param video_path: 视频文件路径
+        :param fps: 回放帧率，为 0 时手动切换
+        :param loop: 播放到最后一帧后是否从头开始
+        """
+        super().__init__(fps, loop)
+        self.video_path = video_path
+        self._cap = cv2.VideoCapture(video_path)
+        if not self._cap.isOpened():
+            raise FileNotFoundError(f"无法打开视频 ‘{video_path}’")
+        self._frame_count = max(1, int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+        self._next_index = 0  # VideoCapture 下一次 read() 读到的帧序号
+
+    @property
+    def frame_count(self) -> int:
+        return self._frame_count
+
+    def _decode(self, index: int) -> np.ndarray:
+        if index != self._next_index:  # 非顺序读取时才跳转，顺序回放直接读下一帧
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+        ret, frame = self._cap.read()
+        if not ret:
+            raise ValueError(f"无法读取视频 ‘{self.video_path}’ 的第 {index} 帧")
+        self._next_index = index + 1
+        return frame
+
+    def close(self) -> None:
+        self._cap.release()
+
+
+def create_screen_source(spec: Optional[str] = None, fps: float = 0.0) -> ScreenSource:
+    """
+    根据配置创建截图来源
+    :param spec: 为空或 'mss' 时使用实时桌面；视频文件路径使用 VideoSource；其余视为图片目录、通配符或图片路径
+    :param fps: 回放来源的帧率，为 0 时手动切换
+    :return: ScreenSource
+    """
+    if not spec or spec.lower() == MssSource.name:
+        return MssSource()
+    if spec.lower().endswith(VIDEO_EXTENSIONS):
+        return VideoSource(spec, fps=fps)
+    return ImageSequenceSource(spec, fps=fps)
@@ -11,7 +11,6 @@ import mss
 import ctypes
 import mss.tools
 import numpy as np
-import pygetwindow as gw
 from typing import Tuple, Optional
 
 from mss.screenshot import ScreenShot
@@ -22,6 +21,81 @@ from utils.debug import print_func_time
 _DEBUG = False
 
 
+def pad_region(region: Tuple[int, int, int, int], padding: int) -> Tuple[int, int, int, int]:
+    """
+    向四周扩展区域
+    :param region: (left, top, width, height)
+    :param padding: 扩展的像素数
+    :return: 扩展后的 (left, top, width, height)
+    """
+    left, top, width, height = region
+    return left - padding, top - padding, width + 2 * padding, height + 2 * padding
+
+
+def intersect_region(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> Optional[Tuple[int, int, int, int]]:
+    """
+    计算两个区域的交集
+    :param a: (left, top, width, height)
+    :param b: (left, top, width, height)
+    :return: 交集区域 (left, top, width, height)，不相交时返回 None
+    """
+    left, top = max(a[0], b[0]), max(a[1], b[1])
+    right, bottom = min(a[0] + a[2], b[0] + b[2]), min(a[1] + a[3], b[1] + b[3])
+    if right <= left or bottom <= top:
+        return None
+    return left, top, right - left, bottom - top
+
+
+def union_region(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+    """
+    计算同时包含两个区域的最小外接矩形
+    :param a: (left, top, width, height)
+    :param b: (left, top, width, height)
+    :return: 外接矩形 (left, top, width, height)
+    """
+    left, top = min(a[0], b[0]), min(a[1], b[1])
+    right, bottom = max(a[0] + a[2], b[0] + b[2]), max(a[1] + a[3], b[1] + b[3])
+    return left, top, right - left, bottom - top
+
+
+def monitor_at(monitors: list[dict], region: Optional[Tuple[int, int, int, int]] = None) -> dict:
+    """
+    获取区域中心点所在的显示器
+    :param monitors: mss 显示器列表（monitors[0] 为所有显示器的并集）
+    :param region: (left, top, width, height)，为 None 时返回主显示器
+    :return: mss 显示器字典 {left, top, width, height}，中心点不在任何显示器内时返回主显示器
+    """
+    monitors = monitors[1:] or monitors
+    if region is not None:
+        cx, cy = region[0] + region[2] / 2, region[1] + region[3] / 2
+        for monitor in monitors:
+            if monitor["left"] <= cx < monitor["left"] + monitor["width"] and \
+                    monitor["top"] <= cy < monitor["top"] + monitor["height"]:
+                return monitor
+    return monitors[0]
+
+
+def monitor_key(monitor: dict) -> str:
+    """显示器的唯一标识，由位置和分辨率组成，eg: '0,0,2560x1440'"""
+    return f"{monitor['left']},{monitor['top']},{monitor['width']}x{monitor['height']}"
+
+
+def get_dpi_scale() -> float:
+    """
+    获取当前屏幕的 DPI 缩放比例
+    :return: DPI 缩放比例
+    """
+    try:
+        # 使用 ctypes 调用 Windows API 获取 DPI 信息
+        hdc = ctypes.windll.user32.GetDC(0)
+        dpi = ctypes.windll.gdi32.GetDeviceCaps(hdc, 88)  # LOGPIXELSX
+        ctypes.windll.user32.ReleaseDC(0, hdc)
+        return dpi / 96.0  # 96 DPI 是标准比例
+    except Exception as e:
+        print(f"无法获取 DPI 缩放比例，默认使用 1.0: {e}")
+        return 1.0
+
+
 class ScreenshotTool:
     """
     截图工具类
@@ -34,14 +108,18 @@ class ScreenshotTool:
         print(f"DPI 缩放比例: {self.dpi_scale}\n" if _DEBUG else "", end="")
 
     @print_func_time(_DEBUG)
-    def full_screen(self, output_file: Optional[str] = None, file_format: str = "png") -> ScreenShot | None:
+    def full_screen(self, output_file: Optional[str] = None, file_format: str = "png",
+                    monitor_index: int = 0) -> ScreenShot | None:
         """
         截取全屏截图，适配多个显示器
         :param output_file: 输出文件路径
         :param file_format: 保存格式，支持 png, jpeg, bmp
+        :param monitor_index: 显示器序号，0 为所有显示器，1、2... 为单个显示器
         """
-        monitor = self.sct.monitors[0]  # 捕获所有显示器内容
-        screenshot = self.sct.grab(monitor)  # 捕获所有显示器内容
+        if not 0 <= monitor_index < len(self.sct.monitors):
+            raise ValueError(f"显示器序号 {monitor_index} 超出范围 0~{len(self.sct.monitors) - 1}")
+        monitor = self.sct.monitors[monitor_index]  # 默认捕获所有显示器内容
+        screenshot = self.sct.grab(monitor)
         if output_file:
             self._save_screenshot(screenshot, output_file, file_format)
             print(f"全屏截图已保存至: {output_file}\n" if _DEBUG else "", end="")
@@ -50,6 +128,37 @@ class ScreenshotTool:
             print("全屏截图已保存到内存中\n" if _DEBUG else "", end="")
             return screenshot
 
+    @print_func_time(_DEBUG)
+    def grab(self, region: Optional[Tuple[int, int, int, int]] = None) -> ScreenShot:
+        """
+        按全局屏幕坐标截取区域（不做 DPI 缩放，与 full_screen 的像素坐标一致），区域会被裁剪到所有显示器的范围内
+        :param region: 截图区域 (left, top, width, height)，为 None 时截取所有显示器
+        :return: 截图对象，其 left、top 属性为截图左上角的全局坐标
+        :raises ValueError: 区域与屏幕不相交
+        """
+        monitor = self.sct.monitors[0]
+        if region is not None:
+            bounds = (monitor["left"], monitor["top"], monitor["width"], monitor["height"])
+            clipped = intersect_region(tuple(int(v) for v in region), bounds)
+            if clipped is None:
+                raise ValueError(f"截图区域 {tuple(region)} 不在屏幕范围内")
+            monitor = {"left": clipped[0], "top": clipped[1], "width": clipped[2], "height": clipped[3]}
+        self.image = self.sct.grab(monitor)
+        return self.image
+
+    def monitor_of(self, region: Optional[Tuple[int, int, int, int]] = None) -> dict:
+        """
+        获取区域中心点所在的显示器
+        :param region: (left, top, width, height)，为 None 时返回主显示器
+        :return: mss 显示器字典 {left, top, width, height}，中心点不在任何显示器内时返回主显示器
+        """
+        return monitor_at(self.sct.monitors, region)
+
+    @staticmethod
+    def monitor_key(monitor: dict) -> str:
+        """显示器的唯一标识，由位置和分辨率组成，eg: '0,0,2560x1440'"""
+        return monitor_key(monitor)
+
     @print_func_time(_DEBUG)
     def region_screenshot(self, region: Tuple[int, int, int, int], output_file: Optional[str] = None, file_format: str = "png") -> ScreenShot | None:
         """
@@ -87,6 +196,7 @@ class ScreenshotTool:
         :return: 输出文件路径或 None
         """
         try:
+            import pygetwindow as gw  # pygetwindow 不支持 Linux，只在截取活动窗口时导入
             active_window = gw.getActiveWindow()
             if not active_window:
                 print("未找到活动窗口，无法截图")
@@ -142,6 +252,17 @@ class ScreenshotTool:
 
         return img_array
 
+    def get_image_as_bgra_view(self) -> np.ndarray:
+        """
+        将截图的原始 BGRA 缓冲区包装为 numpy 数组视图（零拷贝）
+        :return: 形状为 (height, width, 4) 的 BGRA 数组，与截图共享内存
+        """
+        if self.image is None:
+            raise ValueError("没有截图数据，请先截取图像。")
+
+        width, height = self.image.size
+        return np.frombuffer(self.image.raw, dtype=np.uint8).reshape((height, width, 4))
+
     def _save_screenshot(self, screenshot, output_file: str, file_format: str) -> None:
         """保存截图到指定文件，支持多种格式。"""
         file_format = file_format.lower()
@@ -179,15 +300,7 @@ class ScreenshotTool:
         获取当前屏幕的 DPI 缩放比例
         :return: DPI 缩放比例
         """
-        try:
-            # 使用 ctypes 调用 Windows API 获取 DPI 信息
-            hdc = ctypes.windll.user32.GetDC(0)
-            dpi = ctypes.windll.gdi32.GetDeviceCaps(hdc, 88)  # LOGPIXELSX
-            ctypes.windll.user32.ReleaseDC(0, hdc)
-            return dpi / 96.0  # 96 DPI 是标准比例
-        except Exception as e:
-            print(f"无法获取 DPI 缩放比例，默认使用 1.0: {e}")
-            return 1.0
+        return get_dpi_scale()
 
     def close(self):
         """释放资源。"""